@@ -0,0 +1,82 @@
+from __future__ import annotations
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import typer
+from core.schemas import Asset
+
+THEMES = ["awareness", "education", "social proof", "teaser", "behind the scenes", "CTA", "comparison"]
+
+
+def _asset(i: int) -> Asset:
+    # what the providers produce: random-ish id, a URL, a "<brand> | <theme> | <audience>" prompt
+    aid = f"asset_{i:012x}"
+    return Asset(id=aid, url=f"https://placehold.co/1200x675?text={aid}",
+                 prompt=f"Brand{i // 365} | {THEMES[i % len(THEMES)]} | creators and marketers")
+
+
+def bench_catalog(assets: int = 200_000, memory: int = 4096, lookups: int = 20_000) -> dict:
+    """Python heap held after recording `assets` assets: the old module dict vs the catalog, plus lookup latency."""
+    out = {"assets": assets, "memory": memory}
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    legacy = {}
+    t0 = time.perf_counter()
+    for i in range(assets):
+        a = _asset(i)
+        legacy[a.id] = a
+    out["dict_s"] = round(time.perf_counter() - t0, 3)
+    out["dict_mb"] = round((tracemalloc.get_traced_memory()[0] - base) / 2**20, 1)
+    del legacy
+
+    from features.asset_catalog import AssetCatalog
+    with tempfile.TemporaryDirectory() as tmp:
+        base = tracemalloc.get_traced_memory()[0]
+        cat = AssetCatalog(Path(tmp) / "assets.sqlite", memory)
+        t0 = time.perf_counter()
+        for i in range(assets):
+            cat.add(_asset(i), "placeholder")
+        cat.flush()
+        out["catalog_s"] = round(time.perf_counter() - t0, 3)
+        out["catalog_mb"] = round((tracemalloc.get_traced_memory()[0] - base) / 2**20, 1)
+        tracemalloc.stop()
+        out["db_mb"] = round(sum(f.stat().st_size for f in Path(tmp).iterdir()) / 2**20, 1)
+
+        rng = random.Random(7)
+        hot = [f"asset_{i:012x}" for i in range(assets - memory // 2, assets)]
+        for label, ids in (("hot", [rng.choice(hot) for _ in range(lookups)]),
+                           ("cold", [f"asset_{rng.randrange(assets):012x}" for _ in range(lookups)])):
+            t0 = time.perf_counter()
+            found = sum(cat.get(i) is not None for i in ids)
+            out[f"get_{label}_us"] = round((time.perf_counter() - t0) / lookups * 1e6, 1)
+            assert found == lookups, "lost assets"
+        t0 = time.perf_counter()
+        found = sum(cat.find_by_prompt(_asset(rng.randrange(assets)).prompt) is not None for _ in range(lookups))
+        out["by_prompt_us"] = round((time.perf_counter() - t0) / lookups * 1e6, 1)
+        assert found == lookups, "lost prompts"
+        out["in_memory"] = cat.stats()["in_memory"]
+    return out
+
+
+def main(assets: int = 200_000, memory: int = 4096, lookups: int = 20_000):
+    r = bench_catalog(assets, memory, lookups)
+    print(f"[bench] asset catalog: {r['assets']} assets, {r['memory']} records in memory")
+    print(f"[bench]   dict of Asset models  {r['dict_mb']:>7.1f} MB heap  ({r['dict_s']:.2f}s to fill)")
+    print(f"[bench]   catalog               {r['catalog_mb']:>7.1f} MB heap  ({r['catalog_s']:.2f}s to fill, "
+          f"{r['db_mb']} MB on disk, {r['in_memory']} in memory)")
+    print(f"[bench]   get(id) hot {r['get_hot_us']}µs  cold {r['get_cold_us']}µs  "
+          f"find_by_prompt {r['by_prompt_us']}µs")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: memory of the asset catalog against the unbounded module-level dict it replaced, and its lookup cost.
+#
+# Usage: PYTHONPATH=src python -m bench.asset_catalog --assets 200000 --memory 4096
+#
+# Heap is measured with tracemalloc (Python allocations only; SQLite's page cache is outside it and bounded
+# by its own cache_size). "hot" ids are in the LRU front, "cold" ones come from the SQLite index.
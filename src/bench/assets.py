@@ -0,0 +1,58 @@
+from __future__ import annotations
+import secrets
+import time
+from typing import Callable, List
+import typer
+from core.schemas import Asset
+from features.assets import CreateAssetInput, create_images
+
+
+def fake_provider(latency_s: float) -> Callable[[CreateAssetInput], Asset]:
+    # stands in for a remote image API: sleeps, then returns a local asset
+    def _create(inp: CreateAssetInput) -> Asset:
+        time.sleep(latency_s)
+        aid = "asset_" + secrets.token_hex(6)
+        return Asset(id=aid, url=f"https://example.invalid/{aid}.png", prompt=inp.prompt)
+    return _create
+
+
+def bench_assets(days: int = 30, latency_s: float = 0.2, workers: int = 8) -> dict:
+    inputs = [CreateAssetInput(prompt=f"Bench campaign | day {i} | creators") for i in range(days)]
+    create = fake_provider(latency_s)
+
+    t0 = time.perf_counter()
+    serial = create_images(inputs, max_workers=1, create=create)
+    serial_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pooled = create_images(inputs, max_workers=workers, create=create)
+    pooled_s = time.perf_counter() - t0
+
+    assert [a.prompt for a in pooled] == [a.prompt for a in serial], "plan order not preserved"
+    return {
+        "days": days,
+        "latency_s": latency_s,
+        "workers": workers,
+        "serial_s": round(serial_s, 3),
+        "concurrent_s": round(pooled_s, 3),
+        "speedup": round(serial_s / pooled_s, 2),
+    }
+
+
+def main(days: int = 30, latency: float = 0.2, workers: int = 8):
+    r = bench_assets(days, latency, workers)
+    print(f"[bench] assets: {r['days']} images @ {r['latency_s']}s, {r['workers']} workers")
+    print(f"[bench]   serial     {r['serial_s']:.3f}s")
+    print(f"[bench]   concurrent {r['concurrent_s']:.3f}s  (x{r['speedup']})")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: measure the concurrent create_assets stage against a fake, fixed-latency provider.
+#
+# Usage: PYTHONPATH=src python -m bench.assets --days 30 --latency 0.2 --workers 8
+#
+# fake_provider(latency_s): an image "provider" that just sleeps, so no network or API key is needed.
+#
+# bench_assets(...): runs the same inputs serially and through create_images, checks order, returns timings + speedup.
@@ -0,0 +1,62 @@
+from __future__ import annotations
+import asyncio
+import os
+import time
+import typer
+from bench.stub_server import StubState, running_stub
+
+PROMPT = "Run a {days}-day product launch campaign for Brand{i}. Tone playful. Start 2025-08-11 in Europe/Berlin."
+
+
+def bench_async(campaigns: int = 20, days: int = 7, latency_s: float = 0.1) -> dict:
+    state = StubState(latency_s=latency_s)
+    with running_stub(state) as srv:
+        os.environ.update({
+            "IMAGE_PROVIDER": "openai",
+            "OPENAI_API_KEY": "stub",
+            "OPENAI_BASE_URL": srv.base_url,
+            "IMAGE_CACHE_ENABLED": "false",
+        })
+        os.environ["CHECKPOINT_ENABLED"] = "false"  # measure the pipeline, not SQLite
+        from core.graph import get_graph, to_schedule
+        g = get_graph()
+        prompts = [PROMPT.format(days=days, i=i) for i in range(campaigns)]
+
+        async def one(p: str) -> int:
+            return len(to_schedule(await g.ainvoke({"prompt": p})))
+
+        async def sequential():
+            return [await one(p) for p in prompts]
+
+        async def interleaved():
+            return await asyncio.gather(*(one(p) for p in prompts))
+
+        t0 = time.perf_counter()
+        asyncio.run(sequential())
+        seq_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        posts = asyncio.run(interleaved())
+        con_s = time.perf_counter() - t0
+        return {
+            "campaigns": campaigns,
+            "days": days,
+            "image_latency_s": latency_s,
+            "sequential_s": round(seq_s, 3),
+            "interleaved_s": round(con_s, 3),
+            "speedup": round(seq_s / con_s, 2),
+            "posts": sum(posts),
+        }
+
+
+def main(campaigns: int = 20, days: int = 7, latency: float = 0.1):
+    print(f"[bench] async: {bench_async(campaigns, days, latency)}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: show one event loop interleaving many campaigns through get_graph().ainvoke.
+#
+# Usage: PYTHONPATH=src python -m bench.async_campaigns --campaigns 20 --days 7 --latency 0.1
+#
+# Images come from the local stub server (fixed latency); compares awaiting campaigns one by one vs asyncio.gather.
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import time
+from typing import List
+import pendulum
+import typer
+from core.schemas import CampaignBrief, PlanItem
+from features.planning import DAYPARTS, PLATFORM_ROTATION, THEMES, generate_calendar
+from features.schedule import _TIME_BY_DAYPART, timestamps
+
+ZONES = ["Asia/Karachi", "Europe/Berlin", "America/New_York", "UTC", "Australia/Lord_Howe",
+         "America/St_Johns", "Africa/Casablanca", "Europe/London"]
+
+
+def legacy_calendar(brief: CampaignBrief) -> List[PlanItem]:
+    # the original per-day pendulum path
+    start = pendulum.parse(brief.startDate).in_timezone(brief.timezone)
+    return [
+        PlanItem(dayIndex=i, dateISO=start.add(days=i).format("YYYY-MM-DD"), theme=THEMES[i % len(THEMES)],
+                 platforms=PLATFORM_ROTATION[i % len(PLATFORM_ROTATION)], daypart=DAYPARTS[i % len(DAYPARTS)])
+        for i in range(brief.days)
+    ]
+
+
+def legacy_timestamps(plan: List[PlanItem], tz: str) -> List[str]:
+    return [pendulum.parse(f"{p.dateISO} {_TIME_BY_DAYPART[p.daypart]}", tz=tz).to_iso8601_string() for p in plan]
+
+
+def bench_calendar(days: int = 365, runs: int = 20) -> dict:
+    briefs = [CampaignBrief(name="Bench", goal="campaign", audience="creators", tone="playful",
+                            startDate="2025-01-01", days=days, timezone=tz) for tz in ZONES]
+
+    for b in briefs:
+        plan = generate_calendar(b)
+        assert legacy_timestamps(plan, b.timezone) == timestamps(
+            [p.dateISO for p in plan], [p.daypart for p in plan], b.timezone), f"timestamps differ in {b.timezone}"
+        if pendulum.parse(b.startDate).in_timezone(b.timezone).utcoffset().total_seconds() >= 0:
+            # west of UTC the old path started a day early (UTC midnight converted to local time)
+            assert [p.model_dump() for p in plan] == [p.model_dump() for p in legacy_calendar(b)]
+
+    def per_campaign(fn) -> float:
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            for b in briefs:
+                fn(b)
+        return (time.perf_counter() - t0) / (runs * len(briefs))
+
+    def legacy(b):
+        legacy_timestamps(legacy_calendar(b), b.timezone)
+
+    def vectorized(b):
+        plan = generate_calendar(b)
+        timestamps([p.dateISO for p in plan], [p.daypart for p in plan], b.timezone)
+
+    old, new = per_campaign(legacy), per_campaign(vectorized)
+    return {
+        "days": days,
+        "zones": len(ZONES),
+        "legacy_ms": round(old * 1000, 3),
+        "vectorized_ms": round(new * 1000, 3),
+        "speedup": round(old / new, 1),
+    }
+
+
+def main(days: int = 365, runs: int = 20):
+    r = bench_calendar(days, runs)
+    print(f"[bench] calendar + timestamps: {r['days']} days x {r['zones']} timezones (outputs match)")
+    print(f"[bench]   pendulum per item  {r['legacy_ms']:.3f} ms/campaign")
+    print(f"[bench]   vectorized         {r['vectorized_ms']:.3f} ms/campaign  (x{r['speedup']})")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: generate_calendar + schedule timestamps vs the original per-item pendulum path.
+#
+# Usage: PYTHONPATH=src python -m bench.calendar --days 365
+#
+# Checks timestamps match pendulum exactly across DST / half-hour / Ramadan-DST zones before timing.
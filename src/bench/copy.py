@@ -0,0 +1,57 @@
+from __future__ import annotations
+import os
+import tempfile
+import typer
+from bench.stub_server import StubState, running_stub
+
+
+def bench_copy(days: int = 30, batch_days: int = 7, token_budget: int = 50_000) -> dict:
+    """Chat requests/tokens for one campaign's copy against the local stub: cold cache, warm cache, tiny budget."""
+    from features.config import get_settings
+    from features.intake import ParseInput, parse_brief
+    from features.llm_copy import LLMCopyProvider, get_copy_cache
+    from features.planning import generate_calendar
+
+    brief = parse_brief(ParseInput(prompt=f"Create a {days}-day campaign for Acme Notes in a friendly tone"))
+    plan = generate_calendar(brief)
+    slots = sum(len(i.platforms) for i in plan)
+    out = {"days": days, "posts": slots}
+    with running_stub(StubState()) as srv, tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(OPENAI_BASE_URL=srv.base_url, OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY") or "stub",
+                          COPY_CACHE_PATH=os.path.join(tmp, "copy.sqlite"))
+        get_settings.cache_clear()
+        get_copy_cache.cache_clear()
+        for label, budget in (("cold", token_budget), ("warm", token_budget)):
+            p = LLMCopyProvider("stub-model", batch_days, budget)
+            drafts = p.generate(brief, plan)
+            out[label] = {"requests": p.requests, "tokens": p.tokens_used,
+                          "llm_posts": sum(d.text.startswith("[stub]") for d in drafts)}
+        os.environ["COPY_CACHE_PATH"] = os.path.join(tmp, "copy2.sqlite")
+        get_settings.cache_clear()
+        get_copy_cache.cache_clear()
+        p = LLMCopyProvider("stub-model", batch_days, 600)
+        drafts = p.generate(brief, plan)
+        out["tiny_budget"] = {"requests": p.requests, "tokens": p.tokens_used,
+                              "llm_posts": sum(d.text.startswith("[stub]") for d in drafts)}
+        out["stub_requests"] = srv.state.requests
+    get_copy_cache.cache_clear()
+    return out
+
+
+def main(days: int = 30, batch_days: int = 7, token_budget: int = 50_000):
+    r = bench_copy(days, batch_days, token_budget)
+    print(f"[bench] copy: {r['days']} days, {r['posts']} posts (one call per post would be {r['posts']} requests)")
+    for label in ("cold", "warm", "tiny_budget"):
+        x = r[label]
+        print(f"[bench]   {label:<11} requests={x['requests']:<3} tokens={x['tokens']:<6} llm posts={x['llm_posts']}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: shows what batching, the response cache and the token budget do to chat traffic, using the local stub.
+#
+# Usage: PYTHONPATH=src python -m bench.copy --days 30 --batch-days 7
+#
+# cold: empty cache, one request per window; warm: same brief again, served from the cache (0 requests);
+# tiny_budget: a budget too small for a single window, so every post falls back to templates.
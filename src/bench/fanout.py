@@ -0,0 +1,81 @@
+from __future__ import annotations
+import os
+import tempfile
+import time
+import typer
+from bench.stub_server import StubState, running_stub
+
+PROMPT = "Run a {days}-day product launch campaign for {name}. Tone playful. Start 2025-08-11 in Europe/Berlin."
+
+
+def bench_fanout(days: int = 7, latency_s: float = 0.2, runs: int = 3) -> dict:
+    """One campaign with remote images and LLM copy (both `latency_s` per request): old serial chain vs the graph."""
+    state = StubState(latency_s=latency_s)
+    with running_stub(state) as srv, tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            "IMAGE_PROVIDER": "openai",
+            "COPY_PROVIDER": "openai",
+            "OPENAI_API_KEY": "stub",
+            "OPENAI_BASE_URL": srv.base_url,
+            "IMAGE_CACHE_ENABLED": "false",
+            "COPY_CACHE_PATH": os.path.join(tmp, "copy.sqlite"),
+            "CHECKPOINT_ENABLED": "false",
+            "SCHEDULE_STORE_ENABLED": "false",
+        })
+        from features.config import get_settings
+        get_settings.cache_clear()
+        from core.graph import get_graph, invoke_campaign, to_schedule
+        from features.assets import CreateAssetInput, create_images
+        from features.formatting import apply_platform_rules
+        from features.intake import ParseInput, parse_brief
+        from features.llm_copy import generate_campaign_copy
+        from features.planning import generate_calendar
+        from features.schedule import mock_schedule
+
+        def chain(prompt: str) -> int:
+            # the previous wiring: every image, then every day's copy, then format + schedule
+            brief = parse_brief(ParseInput(prompt=prompt))
+            plan = generate_calendar(brief)
+            assets = create_images([CreateAssetInput(prompt=f"{brief.name} | {i.theme} | {brief.audience}")
+                                    for i in plan])
+            drafts = iter(generate_campaign_copy(brief, plan))
+            posts = [apply_platform_rules(next(drafts), assets[d]) for d, i in enumerate(plan) for _ in i.platforms]
+            return len(mock_schedule(brief.name, plan, posts, brief.timezone))
+
+        g = get_graph()
+
+        def fanout(prompt: str) -> int:
+            return len(to_schedule(invoke_campaign(g, prompt)))
+
+        out = {"days": days, "latency_s": latency_s, "asset_concurrency": get_settings().asset_concurrency}
+        for label, fn in (("chain", chain), ("fanout", fanout)):
+            best = float("inf")
+            for r in range(runs):
+                # fresh brand per run: nothing comes from the copy cache
+                t0 = time.perf_counter()
+                fn(PROMPT.format(days=days, name=f"{label.title()}Brand{r}"))
+                best = min(best, time.perf_counter() - t0)
+            out[f"{label}_s"] = round(best, 3)
+        out["speedup"] = round(out["chain_s"] / out["fanout_s"], 2)
+        out["requests"] = state.requests
+    return out
+
+
+def main(days: int = 7, latency: float = 0.2, runs: int = 3):
+    r = bench_fanout(days, latency, runs)
+    print(f"[bench] fan-out: {r['days']} days, {r['latency_s']}s per image / copy request, "
+          f"asset_concurrency={r['asset_concurrency']}")
+    print(f"[bench]   chain   {r['chain_s']:.3f}s  (images, then copy)")
+    print(f"[bench]   fan-out {r['fanout_s']:.3f}s  (x{r['speedup']})")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: critical-path latency of one campaign before and after the per-day fan-out.
+#
+# Usage: PYTHONPATH=src python -m bench.fanout --days 7 --latency 0.2
+#
+# Both images and LLM copy go to the local stub with the same latency. "chain" replays the old wiring
+# (create_images → generate_campaign_copy → format → schedule); "fan-out" is the compiled graph, where the copy
+# branch runs alongside the per-day image branches.
@@ -0,0 +1,104 @@
+from __future__ import annotations
+import random
+import time
+import typer
+
+_SAMPLES = [
+    "Ship faster with Acme Notes. Built for creators and marketers.",
+    "👩‍💻 Dev tip of the day 🇯🇵 — pair the editor with your team 👨‍👩‍👧‍👦",
+    "新しいリリース：チームで書く、もっと速く。今すぐ試してください！",
+    "Ünïcödé àccents, ligatures ﬁ and combining é marks",
+    "Read more → https://example.com/launch/notes?utm_source=x&utm_campaign=launch",
+    "Line one\n\n\n\nLine two after too many breaks\r\nand CRLF",
+]
+
+
+def legacy_apply(platform: str, text: str, hashtags: list) -> str:
+    tags = ("\n\n" + " ".join(hashtags)) if hashtags else ""
+    if platform == "x":
+        full = text + tags
+        if len(full) > 280:
+            full = full[:279] + "…"
+        return full
+    return text + tags
+
+
+def corpus(n: int, seed: int = 7):
+    from core.schemas import PostDraft
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        body = " ".join(rnd.choice(_SAMPLES) for _ in range(rnd.choice((1, 1, 2, 5, 12))))
+        tags = rnd.sample(["#AI", "#Writing", "#Creators", "#ai", "Launch", "#Tools", "#Notes"], rnd.randint(0, 6))
+        out.append(PostDraft(platform=rnd.choice(("x", "linkedin", "instagram")), text=body, hashtags=tags))
+    return out
+
+
+def bench_formatting(n: int = 50000) -> dict:
+    from features.formatting import _TOKEN_RE, format_text, get_platform_rules
+    drafts = corpus(n)
+    rules = {p: get_platform_rules(p) for p in ("x", "linkedin", "instagram")}
+
+    t0 = time.perf_counter()
+    legacy = [legacy_apply(d.platform, d.text, d.hashtags) for d in drafts]
+    t_legacy = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = [format_text(d.text, d.hashtags, rules[d.platform]) for d in drafts]
+    t_new = time.perf_counter() - t0
+
+    def split_clusters(s: str) -> bool:
+        # a cut inside a cluster leaves a dangling ZWJ / lone regional indicator / half flag at the end
+        body = s[:-1] if s.endswith("…") else s
+        last = [m.group() for m in _TOKEN_RE.finditer(body)][-1:] or [""]
+        return last[0].endswith("‍") or (len(last[0]) == 1 and 0x1F1E6 <= ord(last[0]) <= 0x1F1FF)
+
+    # what the pipeline actually feeds it: template copy for a year-long campaign
+    from features.copygen import render_posts
+    from features.intake import ParseInput, parse_brief
+    from features.planning import generate_calendar
+    brief = parse_brief(ParseInput(prompt="Create a 365-day campaign for Acme Notes"))
+    real = render_posts(brief, generate_calendar(brief))
+    reps = max(1, n // len(real))
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        for d in real:
+            format_text(d.text, d.hashtags, rules[d.platform])
+    t_real = time.perf_counter() - t0
+
+    # decomposed input (e + U+0301) must weigh what its NFC form does: 140 "é" fit X's 280 either way
+    composed = "é" * 140
+    decomposed = "e\u0301" * 140
+    nfc_ok = format_text(decomposed, [], rules["x"]) == format_text(composed, [], rules["x"]) == composed
+
+    return {
+        "posts": n,
+        "template_per_s": round(reps * len(real) / t_real),
+        "legacy_per_s": round(n / t_legacy),
+        "rules_per_s": round(n / t_new),
+        "legacy_split_clusters": sum(split_clusters(s) for s in legacy if s.endswith("…")),
+        "rules_split_clusters": sum(split_clusters(s) for s in new if s.endswith("…")),
+        "rules_truncated": sum(s.endswith("…") for s in new),
+        "nfc_ok": nfc_ok,
+    }
+
+
+def main(n: int = 50000):
+    r = bench_formatting(n)
+    print(f"[bench] formatting: {r['posts']} drafts (mixed emoji/ZWJ/CJK/URLs, 1-12 sentences)")
+    print(f"[bench]   legacy len()-slice {r['legacy_per_s']:>9}/s  clusters cut in half: {r['legacy_split_clusters']}")
+    print(f"[bench]   rule table         {r['rules_per_s']:>9}/s  clusters cut in half: {r['rules_split_clusters']}"
+          f"  (truncated {r['rules_truncated']})")
+    print(f"[bench]   rule table on template copy {r['template_per_s']:>9}/s")
+    print(f"[bench]   decomposed input weighs as NFC: {'ok' if r['nfc_ok'] else 'FAILED'}")
+    if not r["nfc_ok"]:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: throughput of the rule-table formatter vs the original len()-slicing one on a large, messy batch,
+# plus how often each cuts a grapheme cluster in half, and throughput on real template copy (mostly fast path).
+# Also checks that decomposed accents are NFC-normalized before weighing (exit 1 if not).
+#
+# Usage: PYTHONPATH=src python -m bench.formatting --n 50000
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import random
+import re
+import time
+import typer
+from core.schemas import CampaignBrief
+from features.intake import TONE_MAP, ParseInput, parse_brief, _parse_prompt
+
+
+def legacy_parse_brief(p: str) -> CampaignBrief:
+    # the original multi-pass parser, kept here as the reference for output equality
+    name_match = re.search(r"for (?:a|an|the)?\s*(new\s+)?(?P<name>[^.]+?)(?:\.|,|$)", p, re.IGNORECASE)
+    name = name_match.group("name").strip() if name_match else None
+    if not name:
+        name = "Unnamed Campaign"
+    tone = "professional"
+    for t in TONE_MAP:
+        if re.search(rf"\b{t}\b", p, re.IGNORECASE):
+            tone = TONE_MAP[t]
+            break
+    days = 7
+    m = re.search(r"(\d+)[- ]?day", p, re.IGNORECASE)
+    if m:
+        days = int(m.group(1))
+    tz = "Asia/Karachi"
+    m = re.search(r"in\s+([A-Za-z_\/]+)", p)
+    if m and "/" in m.group(1):
+        tz = m.group(1)
+    start = None
+    m = re.search(r"(\d{4}-\d{2}-\d{2})", p)
+    if m:
+        start = m.group(1)
+    audience = "general audience"
+    if re.search(r"creators?", p, re.IGNORECASE) and re.search(r"marketers?", p, re.IGNORECASE):
+        audience = "creators & marketers"
+    elif re.search(r"creators?", p, re.IGNORECASE):
+        audience = "creators"
+    elif re.search(r"marketers?", p, re.IGNORECASE):
+        audience = "marketers"
+    goal = "campaign"
+    if re.search(r"launch", p, re.IGNORECASE):
+        goal = "product launch campaign"
+    if name and "campaign" in name.lower():
+        name = name.replace("campaign", "").strip(" -—:\t")
+    return CampaignBrief(name=name, goal=goal, audience=audience, tone=tone, startDate=start, days=days, timezone=tz)
+
+
+def corpus(n: int, seed: int = 7) -> list[str]:
+    rnd = random.Random(seed)
+    products = ["AI writing tool", "CRM", "coffee brand", "fitness app", "B2B analytics suite", "Playful Pets"]
+    audiences = ["creators and marketers", "marketers", "Creators", "founders", "small teams"]
+    tones = list(TONE_MAP) + ["PLAYFUL", "calm", "Inspiring and professional"]
+    tzs = ["Asia/Karachi", "Europe/Berlin", "America/New_York", "UTC", "London"]
+    out = []
+    for _ in range(n):
+        parts = [
+            f"Run a {rnd.randint(1, 30)}-day {rnd.choice(['product launch', 'awareness', 'relaunch', ''])} campaign",
+            f"for {rnd.choice(['a new ', 'an ', 'the ', ''])}{rnd.choice(products)}",
+            f"focused on {rnd.choice(audiences)}." if rnd.random() < 0.8 else ".",
+            f"Tone {rnd.choice(tones)}." if rnd.random() < 0.8 else "",
+            f"Start 2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}" if rnd.random() < 0.7 else "",
+            f"in {rnd.choice(tzs)}." if rnd.random() < 0.7 else "",
+        ]
+        out.append(" ".join(x for x in parts if x))
+    return out
+
+
+def bench_intake(n: int = 20000, unique: int = 2000) -> dict:
+    prompts = corpus(unique)
+    workload = [prompts[i % unique] for i in range(n)]
+
+    mismatches = [p for p in prompts if parse_brief(ParseInput(prompt=p)) != legacy_parse_brief(p)]
+    assert not mismatches, f"output differs for: {mismatches[:3]}"
+
+    def rate(fn) -> float:
+        t0 = time.perf_counter()
+        for p in workload:
+            fn(p)
+        return n / (time.perf_counter() - t0)
+
+    legacy = rate(legacy_parse_brief)
+    compiled = rate(_parse_prompt.__wrapped__)  # single scan, no memo
+    _parse_prompt.cache_clear()
+    memo = rate(lambda p: parse_brief(ParseInput(prompt=p)))
+    return {
+        "prompts": n,
+        "unique": unique,
+        "legacy_per_s": round(legacy),
+        "compiled_per_s": round(compiled),
+        "memoized_per_s": round(memo),
+        "compiled_speedup": round(compiled / legacy, 2),
+        "memoized_speedup": round(memo / legacy, 2),
+    }
+
+
+def main(n: int = 20000, unique: int = 2000):
+    r = bench_intake(n, unique)
+    print(f"[bench] intake: {r['prompts']} prompts ({r['unique']} unique), same CampaignBrief output as legacy")
+    print(f"[bench]   legacy   {r['legacy_per_s']:>9}/s")
+    print(f"[bench]   compiled {r['compiled_per_s']:>9}/s  (x{r['compiled_speedup']})")
+    print(f"[bench]   memoized {r['memoized_per_s']:>9}/s  (x{r['memoized_speedup']})")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: throughput of parse_brief vs the original multi-pass parser, with an output-equality check.
+#
+# Usage: PYTHONPATH=src python -m bench.intake --n 20000 --unique 2000
+#
+# corpus(n): deterministic, varied prompts (tones in odd cases, missing fields, non-IANA "in" phrases).
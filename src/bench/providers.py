@@ -0,0 +1,58 @@
+from __future__ import annotations
+import os
+import time
+import typer
+from bench.stub_server import StubState, running_stub
+
+
+def bench_providers(days: int = 30, latency_s: float = 0.05, fail_first: int = 0) -> dict:
+    from features.config import get_settings
+    from features.image_cache import get_image_cache
+    from core.providers.images import get_provider, get_image_provider
+    from features.assets import CreateAssetInput, create_images
+
+    state = StubState(latency_s=latency_s, fail_first=fail_first)
+    with running_stub(state) as srv:
+        os.environ.update({
+            "IMAGE_PROVIDER": "openai",
+            "OPENAI_API_KEY": "stub",
+            "OPENAI_BASE_URL": srv.base_url,
+            "IMAGE_CACHE_ENABLED": "false",
+            "IMAGE_RETRY_BASE_DELAY_S": "0.01",
+        })
+        get_settings.cache_clear()
+        get_image_cache.cache_clear()
+        get_provider.cache_clear()
+        get_image_provider.cache_clear()
+
+        inputs = [CreateAssetInput(prompt=f"Bench | day {i}") for i in range(days)]
+        t0 = time.perf_counter()
+        assets = create_images(inputs)
+        elapsed = time.perf_counter() - t0
+        provider = get_image_provider()
+        return {
+            "days": days,
+            "elapsed_s": round(elapsed, 3),
+            "requests": state.requests,
+            "connections": state.connections,
+            "generated": sum(1 for a in assets if a.url.scheme == "file"),
+            "placeholders": sum(1 for a in assets if a.url.scheme != "file"),
+            "breaker": provider.breaker.state,
+            "breaker_trips": provider.breaker.trips,
+        }
+
+
+def main(days: int = 30, latency: float = 0.05, fail_first: int = 0):
+    r = bench_providers(days, latency, fail_first)
+    print(f"[bench] providers: {r}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: drive the image provider registry against the local stub server.
+#
+# Usage: PYTHONPATH=src python -m bench.providers --days 30 --fail-first 0
+#
+# Shows requests vs TCP connections (pooling: connections stay <= asset_concurrency),
+# and with --fail-first >= retries * breaker threshold, the breaker tripping and days failing over to placeholders.
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+import typer
+
+PLATFORMS = ["x", "linkedin", "instagram"]
+
+
+def _sources(folder: Path, n: int, size=(1024, 576)) -> List[Path]:
+    # noisy PNGs, so decode/encode cost looks like a generated image rather than a flat fill
+    from PIL import Image
+    out = []
+    for i in range(n):
+        p = folder / f"src_{i}.png"
+        Image.effect_noise(size, 40 + i).convert("RGB").save(p)
+        out.append(p)
+    return out
+
+
+def bench_renditions(images: int = 30, workers: int = 0) -> dict:
+    """Every platform rendition of `images` sources: naive (decode per rendition, in-process) vs render_renditions."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        os.environ.update({"RENDITIONS_ENABLED": "true", "RENDITIONS_PATH": str(root / "out"),
+                           "RENDITION_WORKERS": str(workers)})
+        from features.config import get_settings
+        get_settings.cache_clear()
+        import urllib.parse
+        from PIL import Image
+        from core.schemas import Asset
+        from features.imaging import render
+        from features.renditions import RENDITIONS, _pool, _target, _worker_count, render_renditions
+
+        sources = _sources(root, images)
+        assets = [Asset(id=f"a{i}", url=p.resolve().as_uri(), prompt=f"day {i}") for i, p in enumerate(sources)]
+
+        # naive: one decode per (image, platform), all on the calling thread
+        naive_dir = root / "naive"
+        naive_dir.mkdir()
+        t0 = time.perf_counter()
+        for i, p in enumerate(sources):
+            for plat in PLATFORMS:
+                w, h, fmt, q, out = _target(f"naive:{i}", RENDITIONS[plat])
+                render(str(p), None, [(w, h, fmt, q, str(naive_dir / Path(out).name))])
+        naive_s = time.perf_counter() - t0
+
+        if _worker_count() > 0:
+            _pool().submit(int).result()  # workers up before timing
+        t0 = time.perf_counter()
+        out = render_renditions(assets, [PLATFORMS] * images)
+        pooled_s = time.perf_counter() - t0
+        assert all(len(r) == len(PLATFORMS) for r in out), "missing renditions"
+
+        t0 = time.perf_counter()
+        render_renditions(assets, [PLATFORMS] * images)  # everything on disk: no pool round-trips
+        cached_s = time.perf_counter() - t0
+
+        # placeholders are drawn locally at each platform's size instead of linking to placehold.co
+        ph = [Asset(id="ph", url="https://placehold.co/1200x675?text=Brand+launch", prompt="Brand launch")]
+        t0 = time.perf_counter()
+        ph_out = render_renditions(ph, [PLATFORMS])[0]
+        placeholder_s = time.perf_counter() - t0
+        assert set(ph_out) == set(PLATFORMS), "missing placeholder renditions"
+        for plat, a in ph_out.items():
+            assert str(a.url).startswith("file://"), f"{plat} placeholder still remote"
+            with Image.open(Path(urllib.parse.unquote(urllib.parse.urlsplit(str(a.url)).path))) as im:
+                assert im.size == (RENDITIONS[plat].width, RENDITIONS[plat].height), f"{plat} placeholder size"
+        return {
+            "images": images,
+            "renditions": images * len(PLATFORMS),
+            "workers": _worker_count(),
+            "naive_s": round(naive_s, 3),
+            "pooled_s": round(pooled_s, 3),
+            "cached_s": round(cached_s, 4),
+            "placeholder_s": round(placeholder_s, 3),
+            "speedup": round(naive_s / pooled_s, 2),
+        }
+
+
+def main(images: int = 30, workers: int = 0):
+    r = bench_renditions(images, workers)
+    print(f"[bench] renditions: {r['images']} images x {len(PLATFORMS)} platforms = {r['renditions']} files, "
+          f"{r['workers']} workers")
+    print(f"[bench]   naive   {r['naive_s']:.3f}s  (decode per rendition, in-process)")
+    print(f"[bench]   pooled  {r['pooled_s']:.3f}s  (decode once per image, process pool; x{r['speedup']})")
+    print(f"[bench]   rerun   {r['cached_s']:.4f}s  (all renditions already on disk)")
+    print(f"[bench]   placeholder {r['placeholder_s']:.3f}s  (one card drawn locally per platform)")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: cost of the per-platform rendition stage, and what decode-once + the process pool buy.
+#
+# Usage: PYTHONPATH=src python -m bench.renditions --images 30 --workers 0   (0 = CPU count, -1 = inline)
+#
+# Sources are 1024x576 noise PNGs in a temp folder (same size as the OpenAI images); outputs never touch artifacts/.
+# A placehold.co asset is rendered too, checking that every platform gets a local card at its exact size.
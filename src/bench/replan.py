@@ -0,0 +1,69 @@
+from __future__ import annotations
+import os
+import tempfile
+import time
+import typer
+from bench.stub_server import StubState, running_stub
+
+PROMPT = ("Run a {days}-day product launch campaign for a new AI writing tool focused on creators and marketers. "
+          "Tone {tone}. Start 2025-08-11 in Europe/Berlin.")
+
+
+def bench_replan(days: int = 14, latency_s: float = 0.2) -> dict:
+    """A tone edit and a date shift: full rerun of the edited prompt vs replan_thread on the finished run."""
+    state = StubState(latency_s=latency_s)
+    with running_stub(state) as srv, tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            "IMAGE_PROVIDER": "openai",
+            "OPENAI_API_KEY": "stub",
+            "OPENAI_BASE_URL": srv.base_url,
+            "IMAGE_CACHE_ENABLED": "false",  # a full rerun really regenerates, as it would for a new prompt
+            "CHECKPOINT_ENABLED": "true",
+            "CHECKPOINT_PATH": os.path.join(tmp, "checkpoints.sqlite"),
+            "SCHEDULE_STORE_ENABLED": "false",
+            "RENDITIONS_PATH": os.path.join(tmp, "renditions"),
+        })
+        from features.config import get_settings
+        get_settings.cache_clear()
+        from core.graph import get_graph, invoke_campaign
+        from core.incremental import replan_thread
+        g = get_graph()
+        base = PROMPT.format(days=days, tone="inspiring")
+        invoke_campaign(g, base)
+
+        out = {"days": days, "latency_s": latency_s}
+        for label, changes, prompt in (
+            ("tone", {"tone": "playful"}, PROMPT.format(days=days, tone="playful")),
+            ("date", {"startDate": "2025-09-01"}, PROMPT.format(days=days, tone="playful").replace("2025-08-11", "2025-09-01")),
+        ):
+            r0 = state.requests
+            t0 = time.perf_counter()
+            invoke_campaign(g, prompt)
+            out[f"{label}_full_s"] = round(time.perf_counter() - t0, 3)
+            out[f"{label}_full_requests"] = state.requests - r0
+            r0 = state.requests
+            t0 = time.perf_counter()
+            _, report = replan_thread(g, base, changes)
+            out[f"{label}_replan_s"] = round(time.perf_counter() - t0, 3)
+            out[f"{label}_replan_requests"] = state.requests - r0
+            out[f"{label}_report"] = report
+    return out
+
+
+def main(days: int = 14, latency: float = 0.2):
+    r = bench_replan(days, latency)
+    print(f"[bench] replan: {r['days']} days, {r['latency_s']}s per image request")
+    for label in ("tone", "date"):
+        print(f"[bench]   {label:<4} full rerun {r[f'{label}_full_s']:.3f}s ({r[f'{label}_full_requests']} requests)  "
+              f"replan {r[f'{label}_replan_s']:.3f}s ({r[f'{label}_replan_requests']} requests)")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: what incremental re-planning saves on a brief edit.
+#
+# Usage: PYTHONPATH=src python -m bench.replan --days 14 --latency 0.2
+#
+# Images go to the local stub (fixed latency, image cache off). "full rerun" runs the graph on the edited prompt;
+# "replan" applies the same edit to the finished run through core.incremental.replan_thread.
@@ -0,0 +1,49 @@
+from __future__ import annotations
+import time
+import typer
+
+
+def bench_scheduler(campaigns: int = 200, days: int = 30, shared_account: bool = True) -> dict:
+    from core.schemas import Asset, FormattedPost
+    from features.intake import ParseInput, parse_brief
+    from features.planning import generate_calendar
+    from features.schedule import Scheduler, mock_schedule
+
+    asset = Asset(id="bench", url="https://placehold.co/1024x1024/png", prompt="bench")
+    runs = []
+    for c in range(campaigns):
+        brief = parse_brief(ParseInput(prompt=f"Create a {days}-day campaign for Brand {c} in UTC"))
+        plan = generate_calendar(brief)
+        posts = [FormattedPost(platform=p, text=f"{brief.name} {i.theme}", media=asset) for i in plan for p in i.platforms]
+        runs.append((brief, plan, posts))
+
+    sched = Scheduler()
+    t0 = time.perf_counter()
+    total = 0
+    for c, (brief, plan, posts) in enumerate(runs):
+        account = "default" if shared_account else f"acct-{c}"
+        total += len(mock_schedule(brief.name, plan, posts, brief.timezone, scheduler=sched, account=account))
+    dt = time.perf_counter() - t0
+    return {
+        "campaigns": campaigns,
+        "posts": total,
+        "posts_per_s": round(total / dt),
+        "collisions": sched.collisions,
+        "deferred": sched.deferred,
+    }
+
+
+def main(campaigns: int = 200, days: int = 30, shared_account: bool = True):
+    for n in sorted({max(1, campaigns // 10), campaigns}):
+        r = bench_scheduler(n, days, shared_account)
+        print(f"[bench] scheduler: {r['campaigns']:>5} campaigns x {days} days → {r['posts']:>7} posts "
+              f"{r['posts_per_s']:>8}/s  collisions={r['collisions']} deferred={r['deferred']}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: scheduling throughput when many campaigns share one account (worst case: every slot collides and
+# daily quotas overflow) vs separate accounts. Posts/s should stay flat as the campaign count grows.
+#
+# Usage: PYTHONPATH=src python -m bench.scheduler --campaigns 1000 --days 30 [--no-shared-account]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Dict, List
+import httpx
+import typer
+
+PROMPT = "Run a {days}-day product launch campaign for {name}. Tone playful. Start 2025-08-11 in Europe/Berlin."
+
+
+def bench_service(jobs: int = 200, clients: int = 16, days: int = 7, workers: int = 2, queue_size: int = 32) -> dict:
+    """A burst of `jobs` submissions from `clients` threads; 429s are retried after Retry-After."""
+    os.environ.update({"IMAGE_PROVIDER": "placeholder", "CHECKPOINT_ENABLED": "false",
+                       "SCHEDULE_STORE_ENABLED": "false", "RENDITIONS_ENABLED": "false", "METRICS_PATH": ""})
+    from features.config import get_settings
+    get_settings.cache_clear()
+    from core.instrumentation import percentile
+    from runner.service import JobService, running_service
+
+    svc = JobService(workers=workers, queue_size=queue_size)
+    latencies: List[float] = []
+    counts: Dict[str, int] = {"rejected": 0, "done": 0, "failed": 0}
+    lock = threading.Lock()
+    todo = iter(range(jobs))
+
+    with running_service(svc) as srv:
+        def client():
+            with httpx.Client(base_url=srv.base_url, timeout=60) as http:
+                for i in todo:
+                    t0 = time.perf_counter()
+                    # alternate priorities so the heap ordering is exercised
+                    body = {"prompt": PROMPT.format(days=days, name=f"Brand{i}"), "priority": i % 3}
+                    while True:
+                        r = http.post("/jobs", json=body)
+                        if r.status_code != 429:
+                            break
+                        with lock:
+                            counts["rejected"] += 1
+                        time.sleep(float(r.headers["Retry-After"]) / 10)  # scaled down: keep the bench short
+                    jid = r.json()["id"]
+                    while True:
+                        st = http.get(f"/jobs/{jid}").json()["status"]
+                        if st in ("done", "failed"):
+                            break
+                        time.sleep(0.01)
+                    with lock:
+                        counts[st] += 1
+                        latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+        m = svc.metrics()
+    lat = sorted(latencies)
+    return {
+        "jobs": jobs, "clients": clients, "workers": workers, "queue_size": queue_size, **counts,
+        "wall_s": round(wall, 3), "jobs_per_s": round(jobs / wall, 2),
+        "latency_p50_s": round(percentile(lat, 0.50), 3), "latency_p95_s": round(percentile(lat, 0.95), 3),
+        "worker_utilization": m["worker_utilization"],
+    }
+
+
+def check_resume(days: int = 7) -> dict:
+    """Submit → fail in the last node → resubmit the same id: the job must finish without rerunning earlier nodes."""
+    import tempfile
+    tmp = tempfile.mkdtemp()
+    os.environ.update({"IMAGE_PROVIDER": "placeholder", "CHECKPOINT_ENABLED": "true",
+                       "CHECKPOINT_PATH": os.path.join(tmp, "checkpoints.sqlite"),
+                       "SCHEDULE_STORE_ENABLED": "false", "RENDITIONS_ENABLED": "false", "METRICS_PATH": ""})
+    from features.config import get_settings
+    get_settings.cache_clear()
+    import core.graph
+    from core.instrumentation import snapshot
+    from runner.service import JobService
+
+    calls = {"schedule": 0}
+    real = core.graph.mock_schedule
+
+    def flaky_schedule(*args, **kwargs):
+        calls["schedule"] += 1
+        if calls["schedule"] == 1:
+            raise RuntimeError("injected failure")
+        return real(*args, **kwargs)
+
+    def wait(job_id: str) -> str:
+        while svc.get(job_id).status not in ("done", "failed"):
+            time.sleep(0.01)
+        return svc.get(job_id).status
+
+    def node_calls(name: str) -> int:
+        return snapshot().get(("node", name), {}).get("calls", 0)
+
+    core.graph.mock_schedule = flaky_schedule
+    svc = JobService(workers=1).start()
+    try:
+        prompt = PROMPT.format(days=days, name="ResumeBrand")
+        _, created = svc.submit(prompt, job_id="resume-1")
+        first = wait("resume-1")
+        planned = node_calls("plan_calendar")
+        job, requeued = svc.submit(prompt, job_id="resume-1")
+        second = wait("resume-1")
+        out = {"first": first, "requeued": requeued, "second": second, "posts": len(job.result or []),
+               "plan_reruns": node_calls("plan_calendar") - planned}
+    finally:
+        svc.stop()
+        core.graph.mock_schedule = real
+    out["ok"] = (created and first == "failed" and requeued and second == "done" and out["plan_reruns"] == 0)
+    return out
+
+
+def main(jobs: int = 200, clients: int = 16, days: int = 7, workers: int = 2, queue_size: int = 32,
+         resume: bool = typer.Option(False, help="only check that a failed job resumes when resubmitted")):
+    if resume:
+        r = check_resume(days)
+        print(f"[bench] service resume: first run {r['first']}, resubmit queued={r['requeued']}, then "
+              f"{r['second']} with {r['posts']} posts, plan_calendar reruns={r['plan_reruns']}")
+        if not r["ok"]:
+            raise typer.Exit(1)
+        return
+    r = bench_service(jobs, clients, days, workers, queue_size)
+    print(f"[bench] service: {r['jobs']} jobs from {r['clients']} clients, {r['workers']} workers, "
+          f"queue {r['queue_size']}")
+    print(f"[bench]   done={r['done']} failed={r['failed']} 429s={r['rejected']} in {r['wall_s']}s "
+          f"({r['jobs_per_s']} jobs/s)")
+    print(f"[bench]   end-to-end p50={r['latency_p50_s']}s p95={r['latency_p95_s']}s, "
+          f"worker utilization {r['worker_utilization']:.0%}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: the job service under a burst: throughput, end-to-end latency (submit → done, including 429 retries)
+# and how busy the worker pool stays.
+#
+# Usage: PYTHONPATH=src:. python -m bench.service --jobs 200 --clients 16 --workers 2 --queue-size 32
+#
+# --resume: a job whose schedule node fails once is resubmitted under its id; it must be queued again and finish
+# from its checkpoint (plan_calendar not rerun). Exits 1 otherwise.
+#
+# Runs offline (placeholder images, no checkpoints / store / renditions) on an ephemeral port.
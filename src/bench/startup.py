@@ -0,0 +1,104 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import os
+import statistics
+import subprocess
+import sys
+import time
+import typer
+
+_SRC = Path(__file__).resolve().parents[1]
+
+# cumulative import time (ms, best of N fresh interpreters) each entry point may take
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "runner.cli": 300.0,   # `--help` and argument parsing: typer only, nothing from the pipeline
+    "runner.main": 1500.0,  # everything a campaign run needs (langgraph dominates)
+}
+
+
+def _parse_importtime(stderr: str) -> Dict[str, Dict[str, int]]:
+    # "import time: <self us> | <cumulative us> | <indent><module>"; a module appears once per process
+    rows: Dict[str, Dict[str, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header
+        rows[parts[2].strip()] = {"self_us": int(parts[0]), "cumulative_us": int(parts[1])}
+    return rows
+
+
+def measure_import(module: str, repeat: int = 5, top: int = 10) -> Dict[str, Any]:
+    """Imports `module` in `repeat` fresh interpreters under -X importtime; best/median ms plus the heaviest imports."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(_SRC), str(_SRC.parent)])}
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    imports: List[float] = []
+    process: List[float] = []
+    best_rows: Dict[str, Dict[str, int]] = {}
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        r = subprocess.run(cmd, capture_output=True, text=True, env=env, cwd=_SRC)
+        process.append(time.perf_counter() - t0)
+        if r.returncode != 0:
+            raise RuntimeError(f"import {module} failed: {r.stderr.strip().splitlines()[-1]}")
+        rows = _parse_importtime(r.stderr)
+        imports.append(rows[module]["cumulative_us"] / 1000)
+        if imports[-1] == min(imports):
+            best_rows = rows
+    heaviest = sorted(best_rows.items(), key=lambda kv: kv[1]["self_us"], reverse=True)[:top]
+    return {
+        "module": module,
+        "import_ms": round(min(imports), 1),
+        "median_ms": round(statistics.median(imports), 1),
+        "process_ms": round(min(process) * 1000, 1),  # interpreter start + import + exit
+        "modules_loaded": len(best_rows),
+        "heaviest": [{"module": m, "self_ms": round(v["self_us"] / 1000, 1)} for m, v in heaviest],
+    }
+
+
+def check_budgets(budgets: Dict[str, float], repeat: int = 5, top: int = 10) -> List[Dict[str, Any]]:
+    results = []
+    for module, budget in budgets.items():
+        res = measure_import(module, repeat, top)
+        res["budget_ms"] = budget
+        res["ok"] = res["import_ms"] <= budget
+        results.append(res)
+    return results
+
+
+def main(
+    module: Optional[List[str]] = typer.Option(None, help="module to measure (repeatable; default: every budgeted one)"),
+    budget_ms: Optional[float] = typer.Option(None, help="budget for --module (default: IMPORT_BUDGETS_MS)"),
+    repeat: int = typer.Option(5, help="fresh interpreters per module"),
+    top: int = typer.Option(8, help="heaviest imports to list"),
+):
+    budgets = ({m: budget_ms or IMPORT_BUDGETS_MS.get(m, float("inf")) for m in module} if module
+               else IMPORT_BUDGETS_MS)
+    over = 0
+    for r in check_budgets(budgets, repeat, top):
+        print(f"[bench] import {r['module']}: {r['import_ms']} ms (median {r['median_ms']}, process {r['process_ms']} ms, "
+              f"{r['modules_loaded']} modules), budget {r['budget_ms']} ms → {'ok' if r['ok'] else 'OVER BUDGET'}")
+        for h in r["heaviest"]:
+            print(f"[bench]     {h['self_ms']:>8} ms  {h['module']}")
+        over += not r["ok"]
+    if over:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: keep CLI / serverless cold starts cheap and catch heavy imports creeping back in.
+#
+# measure_import(module, repeat, top): runs `python -X importtime -c "import <module>"` in fresh interpreters and
+# reports the best and median cumulative import time, the whole process time and the modules with the largest
+# self time (what to make lazy next).
+#
+# IMPORT_BUDGETS_MS: runner.cli must stay typer-only (no pydantic, langgraph, pandas, openai); runner.main is the
+# full pipeline. main() exits 1 when a module is over its budget, so CI can gate on it.
+#
+# Usage:
+#   PYTHONPATH=src python -m bench.startup
+#   PYTHONPATH=src python -m bench.startup --module core.graph --budget-ms 3000
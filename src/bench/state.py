@@ -0,0 +1,55 @@
+from __future__ import annotations
+import os
+import time
+import typer
+
+PROMPT = ("Run a {days}-day product launch campaign for a new AI writing tool focused on creators and marketers. "
+          "Tone inspiring. Start 2025-08-11 in Asia/Karachi.")
+
+
+def _cpu_per_campaign(g, prompt: str, runs: int) -> float:
+    t0 = time.process_time()
+    for _ in range(runs):
+        g.invoke({"prompt": prompt})
+    return (time.process_time() - t0) / runs
+
+
+def bench_state(days: int = 30, runs: int = 50, rounds: int = 5) -> dict:
+    os.environ.setdefault("IMAGE_PROVIDER", "placeholder")
+    os.environ.setdefault("ASSET_CONCURRENCY", "1")  # keep thread-pool noise out of CPU time
+    from core.graph import build_graph
+
+    prompt = PROMPT.format(days=days)
+    graphs = {"untrusted": build_graph(trusted=False), "trusted": build_graph(trusted=True)}
+    best = {}
+    for g in graphs.values():
+        g.invoke({"prompt": prompt})  # warm-up
+    # interleave rounds and keep the best one per mode to damp scheduler noise
+    for _ in range(rounds):
+        for name, g in graphs.items():
+            best[name] = min(best.get(name, float("inf")), _cpu_per_campaign(g, prompt, runs))
+    untrusted, trusted = best["untrusted"], best["trusted"]
+    return {
+        "days": days,
+        "runs": runs,
+        "untrusted_cpu_ms": round(untrusted * 1000, 2),
+        "trusted_cpu_ms": round(trusted * 1000, 2),
+        "reduction_pct": round(100 * (1 - trusted / untrusted), 1),
+    }
+
+
+def main(days: int = 30, runs: int = 50):
+    r = bench_state(days, runs)
+    print(f"[bench] state: {r['days']}-day campaign, {r['runs']} runs, CPU time per campaign")
+    print(f"[bench]   untrusted (dicts, re-validated per node) {r['untrusted_cpu_ms']:.2f} ms")
+    print(f"[bench]   trusted   (models between nodes)         {r['trusted_cpu_ms']:.2f} ms  (-{r['reduction_pct']}%)")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: CPU cost of graph state handling, trusted (models between nodes) vs untrusted (dicts re-validated per node).
+#
+# Usage: PYTHONPATH=src python -m bench.state --days 30 --runs 50
+#
+# Uses the placeholder image provider (serially) so only pipeline CPU is measured.
@@ -0,0 +1,136 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+import base64
+import threading
+import time
+import orjson
+import typer
+
+# 1x1 transparent PNG
+PNG_1X1 = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+
+class StubState:
+    def __init__(self, latency_s: float = 0.0, fail_first: int = 0, fail_status: int = 500):
+        self.latency_s = latency_s
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client pooling is observable
+    server: "StubServer"
+
+    def setup(self):
+        super().setup()
+        with self.server.state.lock:
+            self.server.state.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, payload: dict):
+        body = orjson.dumps(payload)
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        st = self.server.state
+        length = int(self.headers.get("Content-Length") or 0)
+        req = orjson.loads(self.rfile.read(length) or b"{}")
+        with st.lock:
+            st.requests += 1
+            failing = st.requests <= st.fail_first
+        time.sleep(st.latency_s)
+        if failing:
+            self._send(st.fail_status, {"error": {"message": "stub failure", "type": "server_error"}})
+            return
+        if self.path.endswith("/images/generations"):
+            n = int(req.get("n") or 1)
+            b64 = base64.b64encode(PNG_1X1).decode()
+            self._send(200, {"created": int(time.time()), "data": [{"b64_json": b64}] * n})
+            return
+        if self.path.endswith("/chat/completions"):
+            # answers the JSON-mode batch format used by features.llm_copy
+            user = orjson.loads(req["messages"][-1]["content"])
+            name = user.get("brief", {}).get("name", "campaign")
+            posts = [{"id": it["id"], "text": f"[stub] {name}: {it['theme']} on {it['platform']}",
+                      "hashtags": ["#Stub"]} for it in user.get("items", [])]
+            content = orjson.dumps({"posts": posts}).decode()
+            prompt_tokens = sum(len(m["content"]) for m in req["messages"]) // 4
+            completion_tokens = len(content) // 4
+            self._send(200, {
+                "id": f"chatcmpl-{st.requests}", "object": "chat.completion", "created": int(time.time()),
+                "model": req.get("model", "stub"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            })
+            return
+        if self.path.endswith("/posts"):
+            # publishing gateway used by core.providers.schedular.HttpPublishAdapter
+            self._send(200, {"id": req.get("id"), "status": "published", "at": time.time()})
+            return
+        self._send(404, {"error": {"message": f"no stub for {self.path}", "type": "not_found"}})
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, state: StubState, port: int = 0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.state = state
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+@contextmanager
+def running_stub(state: StubState | None = None, port: int = 0) -> Iterator[StubServer]:
+    srv = StubServer(state or StubState(), port)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def main(port: int = 8089, latency: float = 0.0, fail_first: int = 0):
+    with running_stub(StubState(latency, fail_first), port) as srv:
+        print(f"[stub] OpenAI-compatible stub on {srv.base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: a local, OpenAI-compatible HTTP stub so providers can be exercised without network or a key.
+#
+# StubState(latency_s, fail_first, fail_status): knobs plus counters (requests, TCP connections accepted).
+#
+# running_stub(state) -> StubServer: context manager serving on 127.0.0.1 in a background thread;
+# point OPENAI_BASE_URL at srv.base_url.
+#
+# Endpoints: POST /v1/images/generations -> b64 PNG; POST /v1/chat/completions -> a JSON-mode answer to the
+# llm_copy batch format (one post per item) with usage numbers; POST /v1/<platform>/posts -> a publish receipt.
+# The first `fail_first` requests return `fail_status` (a 429 carries Retry-After: 1).
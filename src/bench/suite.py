@@ -0,0 +1,208 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import orjson
+import typer
+
+# offline and side-effect free: placeholder images, no renditions / asset catalog / checkpoints / schedule store / LLM
+_ENV = {
+    "IMAGE_PROVIDER": "placeholder",
+    "RENDITIONS_ENABLED": "false",
+    "ASSET_CATALOG_ENABLED": "false",
+    "CHECKPOINT_ENABLED": "false",
+    "SCHEDULE_STORE_ENABLED": "false",
+    "COPY_PROVIDER": "template",
+    "METRICS_PATH": "",
+    "PROFILE_DIR": "",
+}
+
+PROMPT = ("Run a {days}-day product launch campaign for {name}, an AI writing tool focused on creators and "
+          "marketers. Tone inspiring. Start 2025-08-11 in Asia/Karachi.")
+DAYS = (1, 7, 30, 90, 365)
+BATCHES = (1, 100, 1000, 10000)
+_OUT = "bench_suite"  # scratch folder under artifacts/ for the export stages
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, round_s: float = 0.02) -> Dict[str, float]:
+    """Best/median time per call over `repeat` rounds; each round loops fn() long enough (round_s) to be stable."""
+    fn()  # warm-up (imports, lru caches that a long-running process would have)
+    calls = 1
+    while True:  # calibrate like timeit.autorange
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        if time.perf_counter() - t0 >= round_s or calls >= 10000:
+            break
+        calls *= 2
+    rounds: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        rounds.append((time.perf_counter() - t0) / calls)
+    best, median = min(rounds), statistics.median(rounds)
+    return {
+        "per_call_ms": round(best * 1000, 4),
+        "median_ms": round(median * 1000, 4),
+        "per_s": round(1 / best, 1) if best else 0.0,
+        "rounds": repeat,
+        "calls_per_round": calls,
+    }
+
+
+def _meta() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(days: tuple = DAYS, batches: tuple = BATCHES, repeat: int = 5) -> Dict[str, Any]:
+    for k, v in _ENV.items():
+        os.environ[k] = v
+    from features.config import get_settings
+    get_settings.cache_clear()
+
+    from core.graph import build_graph
+    from core.schemas import Asset
+    from features.copygen import CopyInput, generate_post, render_posts
+    from features.export import ARTIFACTS, save_csv, save_json
+    from features.formatting import apply_platform_rules
+    from features.intake import ParseInput, _parse_prompt, parse_brief
+    from features.planning import generate_calendar
+    from features.schedule import mock_schedule
+
+    g = build_graph()
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def add(stage: str, param: str, n_items: int, m: Dict[str, float]) -> None:
+        results[f"{stage}[{param}]"] = {"stage": stage, "param": param, "items": n_items, **m}
+        print(f"[bench] {stage:<22} {param:<12} {m['per_call_ms']:>11.4f} ms/call  ({m['per_s']:>10}/s)")
+
+    for d in days:
+        prompt = PROMPT.format(days=d, name="Acme Notes")
+        brief = parse_brief(ParseInput(prompt=prompt))
+        plan = generate_calendar(brief)
+        asset = Asset(id="asset_bench", url="https://placehold.co/1200x675?text=bench", prompt="bench")
+        drafts = render_posts(brief, plan)
+        posts = [apply_platform_rules(dr, asset) for dr in drafts]
+        schedule = mock_schedule(brief.name, plan, posts, brief.timezone)
+        n_posts = len(posts)
+        p = f"days={d}"
+
+        # parse_brief is memoized; time the uncached parse so the number doesn't depend on the cache
+        add("parse_brief", p, 1, measure(lambda: _parse_prompt.__wrapped__(prompt), repeat=repeat))
+        add("generate_calendar", p, d, measure(lambda: generate_calendar(brief), repeat=repeat))
+        inputs = [CopyInput(brief=brief, theme=i.theme, platform=pf, dateISO=i.dateISO)
+                  for i in plan for pf in i.platforms]
+        add("generate_post", p, n_posts, measure(lambda: [generate_post(x) for x in inputs], repeat=repeat))
+        add("render_posts", p, n_posts, measure(lambda: render_posts(brief, plan), repeat=repeat))
+        add("apply_platform_rules", p, n_posts,
+            measure(lambda: [apply_platform_rules(dr, asset) for dr in drafts], repeat=repeat))
+        add("mock_schedule", p, n_posts,
+            measure(lambda: mock_schedule(brief.name, plan, posts, brief.timezone), repeat=repeat))
+        add("save_json", p, n_posts, measure(lambda: save_json(schedule, f"{_OUT}/schedule.json"), repeat=repeat))
+        add("save_csv", p, n_posts, measure(lambda: save_csv(schedule, f"{_OUT}/schedule.csv"), repeat=repeat))
+        add("graph_invoke", p, n_posts, measure(lambda: g.invoke({"prompt": prompt}), repeat=repeat))
+
+    for n in batches:
+        # distinct prompts, so the intake memo doesn't flatter the numbers
+        prompts = [PROMPT.format(days=7, name=f"Brand {i}") for i in range(n)]
+        _parse_prompt.cache_clear()
+        t0 = time.perf_counter()
+        for pr in prompts:
+            parse_brief(ParseInput(prompt=pr))
+        dt = time.perf_counter() - t0
+        add("batch_parse_brief", f"n={n}", n, {"per_call_ms": round(dt / n * 1000, 4), "median_ms": None,
+                                                "per_s": round(n / dt, 1), "rounds": 1, "total_s": round(dt, 3)})
+        t0 = time.perf_counter()
+        for pr in prompts:
+            g.invoke({"prompt": pr})
+        dt = time.perf_counter() - t0
+        add("batch_graph_invoke", f"n={n}", n, {"per_call_ms": round(dt / n * 1000, 4), "median_ms": None,
+                                                 "per_s": round(n / dt, 1), "rounds": 1, "total_s": round(dt, 3)})
+
+    shutil.rmtree(ARTIFACTS / _OUT, ignore_errors=True)
+    return {"meta": _meta(), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            thresholds: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """Entries slower than baseline by more than their threshold (per-stage override, else the global one)."""
+    thresholds = thresholds or {}
+    regressions = []
+    for key, cur in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if not base or not base.get("per_call_ms"):
+            continue
+        limit = thresholds.get(key, thresholds.get(cur["stage"], threshold))
+        ratio = cur["per_call_ms"] / base["per_call_ms"]
+        if ratio > 1 + limit:
+            regressions.append({"key": key, "baseline_ms": base["per_call_ms"], "current_ms": cur["per_call_ms"],
+                                "ratio": round(ratio, 2), "threshold": limit})
+    return regressions
+
+
+def main(
+    out: Optional[Path] = typer.Option(None, help="results JSON (default: artifacts/bench/suite-<time>.json)"),
+    baseline: Optional[Path] = typer.Option(None, help="earlier results JSON to compare against"),
+    threshold: float = typer.Option(0.25, help="allowed slowdown vs baseline (0.25 = +25%)"),
+    thresholds: Optional[Path] = typer.Option(None, help='JSON of per-stage/key overrides, e.g. {"graph_invoke": 0.5}'),
+    quick: bool = typer.Option(False, help="days 1/7/30, batches up to 100"),
+    max_batch: int = typer.Option(10000, help="largest batch size"),
+    repeat: int = typer.Option(5, help="timing rounds per stage"),
+):
+    days = (1, 7, 30) if quick else DAYS
+    batches = tuple(b for b in BATCHES if b <= (100 if quick else max_batch))
+    res = run_suite(days, batches, repeat)
+
+    from features.export import ARTIFACTS
+    out = out or ARTIFACTS / "bench" / f"suite-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_bytes(orjson.dumps(res, option=orjson.OPT_INDENT_2))
+    print(f"[bench] results saved to {out}")
+
+    if baseline:
+        base = orjson.loads(baseline.read_bytes())
+        overrides = orjson.loads(thresholds.read_bytes()) if thresholds else None
+        regressions = compare(res, base, threshold, overrides)
+        for r in regressions:
+            print(f"[bench] REGRESSION {r['key']}: {r['baseline_ms']} → {r['current_ms']} ms "
+                  f"(x{r['ratio']}, allowed +{r['threshold']:.0%})")
+        if regressions:
+            raise typer.Exit(code=1)
+        print(f"[bench] no regressions vs {baseline} (threshold +{threshold:.0%})")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: one reproducible, offline benchmark over every pipeline stage, with JSON results to diff and gate on.
+#
+# Usage:
+#   PYTHONPATH=src python -m bench.suite --quick                          # a minute or less
+#   PYTHONPATH=src python -m bench.suite --out artifacts/bench/base.json  # full: 1..365 days, batches to 10k
+#   PYTHONPATH=src python -m bench.suite --baseline artifacts/bench/base.json --threshold 0.25
+#
+# Stages per campaign size (days=1/7/30/90/365): parse_brief (uncached), generate_calendar, generate_post (per
+# post), render_posts (batched), apply_platform_rules, mock_schedule, save_json, save_csv and a full
+# graph invoke. Batches (n=1..10000 distinct prompts): parse_brief and graph invoke throughput in one process.
+#
+# Each entry stores the best and median time per call over several rounds (best is what regressions are judged
+# on — it's the least noisy). compare() flags entries slower than baseline × (1 + threshold); a thresholds JSON
+# can loosen/tighten single stages or keys. Exit code 1 on regression, so CI can gate on it.
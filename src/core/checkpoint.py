@@ -0,0 +1,132 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+import asyncio
+import hashlib
+import sqlite3
+from pydantic import BaseModel
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.types import Overwrite, Send
+from features.config import get_settings
+from .schemas import CampaignBrief, PlanItem, Asset, PostDraft, FormattedPost, ScheduledPost
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except Exception:
+    SqliteSaver = None  # type: ignore
+
+_MODELS: Dict[str, type[BaseModel]] = {
+    m.__name__: m for m in (CampaignBrief, PlanItem, Asset, PostDraft, FormattedPost, ScheduledPost)
+}
+_TAG = "__model__"
+_OVERWRITE = "__overwrite__"
+
+
+def _pack(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return {_TAG: type(obj).__name__, "v": obj.model_dump(mode="json")}
+    if isinstance(obj, list):
+        return [_pack(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_pack(v) for v in obj)
+    if isinstance(obj, dict):
+        return {k: _pack(v) for k, v in obj.items()}
+    if isinstance(obj, Send):  # per-day fan-out payloads are checkpointed as pending sends
+        return Send(obj.node, _pack(obj.arg))
+    if isinstance(obj, Overwrite):  # reducer bypass written by incremental re-plans
+        return {_OVERWRITE: _pack(obj.value)}
+    return obj
+
+
+def _unpack(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        if _TAG in obj and obj[_TAG] in _MODELS:
+            return _MODELS[obj[_TAG]].model_validate(obj["v"])
+        if _OVERWRITE in obj and len(obj) == 1:
+            return Overwrite(_unpack(obj[_OVERWRITE]))
+        return {k: _unpack(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_unpack(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_unpack(v) for v in obj)
+    if isinstance(obj, Send):
+        return Send(obj.node, _unpack(obj.arg))
+    return obj
+
+
+class ModelSerde(JsonPlusSerializer):
+    # trusted state holds our Pydantic models (with AnyUrl fields msgpack can't encode);
+    # store them as tagged JSON dicts and revive them on load
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        return super().dumps_typed(_pack(obj))
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        return _unpack(super().loads_typed(data))
+
+
+if SqliteSaver is not None:
+    class FileCheckpointer(SqliteSaver):
+        # SqliteSaver is sync-only; run its calls on a thread so ainvoke works with the same file
+        async def aget_tuple(self, config) -> Optional[CheckpointTuple]:
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def alist(self, config, *, filter=None, before=None, limit=None) -> AsyncIterator[CheckpointTuple]:
+            items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+            for item in items:
+                yield item
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+        async def aput_writes(self, config, writes: Sequence[tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+            await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+        async def adelete_thread(self, thread_id: str) -> None:
+            await asyncio.to_thread(self.delete_thread, thread_id)
+else:
+    FileCheckpointer = None  # type: ignore
+
+
+def make_checkpointer(path: Optional[str] = None) -> Optional[BaseCheckpointSaver]:
+    s = get_settings()
+    if not s.checkpoint_enabled:
+        return None
+    if FileCheckpointer is None:
+        print("[checkpoint] langgraph-checkpoint-sqlite not installed; runs won't survive a restart")
+        return MemorySaver(serde=ModelSerde())
+    p = Path(path or s.checkpoint_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p), check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")  # batch workers share the file
+    return FileCheckpointer(conn, serde=ModelSerde())
+
+
+def campaign_thread_id(prompt: str, thread_id: Optional[str] = None) -> str:
+    # same prompt → same thread, so a rerun finds the interrupted run; also the campaign's key in the schedule store
+    return thread_id or "campaign-" + hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def campaign_config(prompt: str, thread_id: Optional[str] = None) -> dict:
+    # bounds the per-day branches running at once: asset_concurrency images plus the copy branch
+    return {"configurable": {"thread_id": campaign_thread_id(prompt, thread_id)},
+            "max_concurrency": get_settings().asset_concurrency + 1}
+
+# Purpose: make campaign runs durable so a crash doesn't throw away finished work.
+#
+# ModelSerde: JsonPlusSerializer that stores our Pydantic models as tagged JSON dicts (msgpack can't encode
+# AnyUrl) and turns them back into models on load, so trusted state round-trips through a checkpoint. Send payloads
+# (the graph's per-day fan-out) and Overwrite writes (core/incremental.py) are packed the same way.
+#
+# FileCheckpointer: SqliteSaver (langgraph-checkpoint-sqlite) plus thread-offloaded async methods.
+#
+# make_checkpointer(path) -> checkpointer | None
+#
+# What it does: opens settings.checkpoint_path (default artifacts/checkpoints.sqlite, WAL mode). Returns None
+# when CHECKPOINT_ENABLED=false; falls back to an in-memory saver if the sqlite package is missing.
+#
+# campaign_thread_id(prompt, thread_id) -> str / campaign_config(prompt, thread_id) -> RunnableConfig
+#
+# Why: every checkpointed run needs a thread id; by default it is derived from the prompt. The same id keys the
+# campaign's rows in the schedule store, so it holds with checkpoints off too.
@@ -1,86 +1,193 @@
 from __future__ import annotations
-from typing import Any, List, TypedDict
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+from functools import lru_cache
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableLambda
+from langgraph.config import get_stream_writer
+from langgraph.types import Send
+from .checkpoint import make_checkpointer, campaign_config
+from .instrumentation import instrument_node, start_memory_tracing
 from .schemas import (
     CampaignBrief, PlanItem, Asset, PostDraft, FormattedPost, ScheduledPost, State
 )
+from .providers.images import get_image_provider
+from features.config import get_settings
 from features.intake import parse_brief, ParseInput
 from features.planning import generate_calendar
-from features.assets import create_image, CreateAssetInput
-from features.copygen import generate_post, CopyInput
+from features.assets import create_image_or_placeholder, acreate_images, asset_input, CreateAssetInput
+from features.llm_copy import generate_campaign_copy
 from features.formatting import apply_platform_rules
+from features.renditions import render_renditions, arender_renditions
 from features.schedule import mock_schedule
 
-memory = MemorySaver()
+def as_model(model, value):
+    # trusted state already holds models; plain dicts (untrusted / from a checkpoint) get validated
+    return value if isinstance(value, model) else model.model_validate(value)
 
-def build_graph():
+def as_models(model, values):
+    return [as_model(model, v) for v in values]
+
+def to_schedule(final_state: State) -> List[ScheduledPost]:
+    return as_models(ScheduledPost, final_state["schedule"])
+
+def build_graph(trusted: Optional[bool] = None, checkpointer=None):
     g = StateGraph(State)
+    if trusted is None:
+        trusted = get_settings().trusted_state
+
+    def out(m):
+        return m if trusted else m.model_dump(mode="json")
 
     # Nodes
     def node_parse(state: State) -> State:
         brief = parse_brief(ParseInput(prompt=state["prompt"]))
-        return {"brief": brief.model_dump(mode="json")}
+        return {"brief": out(brief)}
 
     def node_plan(state: State) -> State:
-        brief = CampaignBrief.model_validate(state["brief"])
+        brief = as_model(CampaignBrief, state["brief"])
         plan = generate_calendar(brief)
-        return {"plan": [p.model_dump(mode="json") for p in plan]}
-
-    def node_assets(state: State) -> State:
-        brief = CampaignBrief.model_validate(state["brief"])
-        plan = [PlanItem.model_validate(p) for p in state["plan"]]
-        assets = []
-        for item in plan:
-            asset = create_image(CreateAssetInput(prompt=f"{brief.name} | {item.theme} | {brief.audience}"))
-            assets.append(asset.model_dump(mode="json"))
-        return {"assets": assets}
-
-    def node_copy_and_format(state: State) -> State:
-        brief = CampaignBrief.model_validate(state["brief"])
-        plan = [PlanItem.model_validate(p) for p in state["plan"]]
-        assets = [Asset.model_validate(a) for a in state["assets"]]
+        # day_assets=None clears a previous run's days on the same thread before the new fan-out
+        return {"plan": [out(p) for p in plan], "day_assets": None}
+
+    def fan_out_days(state: State) -> List[Send]:
+        # one branch per day when images do I/O, all in the same superstep as draft_copy; a local provider has
+        # nothing to overlap, so its days share one branch instead of paying LangGraph's per-task overhead
+        plan = state["plan"]
+        size = 1 if get_image_provider().blocking else max(len(plan), 1)
+        return [Send("create_assets", {"brief": state["brief"], "first": i, "items": plan[i:i + size]})
+                for i in range(0, len(plan), size)]
+
+    def node_draft_copy(state: State) -> State:
+        # the whole plan in one generate_campaign_copy call, so LLM windows stay batched; runs while images render
+        brief = as_model(CampaignBrief, state["brief"])
+        plan = as_models(PlanItem, state["plan"])
+        return {"drafts": [out(d) for d in generate_campaign_copy(brief, plan)]}
+
+    def _day_inputs(task: dict) -> List[Tuple[int, PlanItem, CreateAssetInput]]:
+        # (day index, plan item, CreateAssetInput) for every day of the branch
+        brief = as_model(CampaignBrief, task["brief"])
+        return [(day, item, asset_input(brief, item))
+                for day, item in enumerate(as_models(PlanItem, task["items"]), task["first"])]
+
+    def _days_done(days, assets: List[Asset], renditions: List[Dict[str, Asset]]) -> State:
+        writer = get_stream_writer()
+        done = []
+        for (day, _, _), asset, rend in zip(days, assets, renditions):
+            # with stream_mode="custom" each finished day is announced; a no-op otherwise
+            writer({"day": day, "asset": asset, "renditions": rend})
+            done.append({"day": day, "asset": out(asset), "renditions": {p: out(r) for p, r in rend.items()}})
+        return {"day_assets": done}
+
+    def node_assets(task: dict) -> State:
+        days = _day_inputs(task)
+        assets = [create_image_or_placeholder(inp) for _, _, inp in days]
+        # per-platform crops/encodings, on the rendition process pool
+        return _days_done(days, assets, render_renditions(assets, [item.platforms for _, item, _ in days]))
+
+    async def anode_assets(task: dict) -> State:
+        days = _day_inputs(task)
+        # a branch holding several days (local provider) awaits them together, up to asset_concurrency at once
+        assets = await acreate_images([inp for _, _, inp in days])
+        return _days_done(days, assets, await arender_renditions(assets, [item.platforms for _, item, _ in days]))
+
+    def node_format(state: State) -> State:
+        # join: each day's asset (in plan order) with that day's drafts, per platform its rendition if there is one
+        brief = as_model(CampaignBrief, state["brief"])
+        plan = as_models(PlanItem, state["plan"])
+        assets: List[Optional[Asset]] = [None] * len(plan)
+        renditions: List[Dict[str, Asset]] = [{} for _ in plan]
+        for d in state["day_assets"]:
+            assets[d["day"]] = as_model(Asset, d["asset"])
+            renditions[d["day"]] = {p: as_model(Asset, r) for p, r in (d.get("renditions") or {}).items()}
+        drafts = iter(as_models(PostDraft, state["drafts"]))
         posts: List[FormattedPost] = []
         for day, item in enumerate(plan):
-            asset = assets[day]
-            for p in item.platforms:
-                draft: PostDraft = generate_post(
-                    CopyInput(brief=brief, theme=item.theme, platform=p, dateISO=item.dateISO))
-                fp = apply_platform_rules(draft, asset)
-                posts.append(fp)
-        return {"posts": [p.model_dump(mode="json") for p in posts]}
+            for _ in item.platforms:
+                draft = next(drafts)
+                posts.append(apply_platform_rules(draft, renditions[day].get(draft.platform, assets[day])))
+        return {"assets": [out(a) for a in assets], "posts": [out(p) for p in posts]}
 
     def node_schedule(state: State) -> State:
-        brief = CampaignBrief.model_validate(state["brief"])
-        plan = [PlanItem.model_validate(p) for p in state["plan"]]
-        posts = [FormattedPost.model_validate(p) for p in state["posts"]]
+        brief = as_model(CampaignBrief, state["brief"])
+        plan = as_models(PlanItem, state["plan"])
+        posts = as_models(FormattedPost, state["posts"])
         schedule = mock_schedule(brief.name, plan, posts, brief.timezone)
-        return {"schedule": [s.model_dump(mode="json") for s in schedule]}
+        return {"schedule": [out(s) for s in schedule]}
 
     # Wire nodes (START/END pattern for latest SDK)
-    g.add_node("parse_brief", node_parse)
-    g.add_node("plan_calendar", node_plan)
-    g.add_node("create_assets", node_assets)
-    g.add_node("copy_and_format", node_copy_and_format)
-    g.add_node("schedule", node_schedule)
+    g.add_node("parse_brief", instrument_node("parse_brief", node_parse))
+    g.add_node("plan_calendar", instrument_node("plan_calendar", node_plan))
+    g.add_node("draft_copy", instrument_node("draft_copy", node_draft_copy))
+    # sync for invoke, async for ainvoke, from the same compiled graph
+    g.add_node("create_assets", RunnableLambda(instrument_node("create_assets", node_assets),
+                                               afunc=instrument_node("create_assets", anode_assets),
+                                               name="create_assets"))
+    g.add_node("format_posts", instrument_node("format_posts", node_format))
+    g.add_node("schedule", instrument_node("schedule", node_schedule))
 
     g.add_edge(START, "parse_brief")
     g.add_edge("parse_brief", "plan_calendar")
-    g.add_edge("plan_calendar", "create_assets")
-    g.add_edge("create_assets", "copy_and_format")
-    g.add_edge("copy_and_format", "schedule")
+    # map: copy for the whole plan ∥ image branches (Send); reduce: format_posts runs once all are in
+    g.add_edge("plan_calendar", "draft_copy")
+    g.add_conditional_edges("plan_calendar", fan_out_days, ["create_assets"])
+    g.add_edge("draft_copy", "format_posts")
+    g.add_edge("create_assets", "format_posts")
+    g.add_edge("format_posts", "schedule")
     g.add_edge("schedule", END)
 
-    return g.compile()
+    return g.compile(checkpointer=checkpointer)
+
+
+@lru_cache(maxsize=1)
+def get_graph():
+    # compiling is not free; reuse one compiled graph per process
+    start_memory_tracing()
+    return build_graph(checkpointer=make_checkpointer())
+
+
+def campaign_input(g, prompt: str, config: dict) -> Optional[State]:
+    # None tells LangGraph to resume the thread from its last completed node
+    if g.checkpointer is not None and g.get_state(config).next:
+        return None
+    return {"prompt": prompt}
+
+
+def invoke_campaign(g, prompt: str, thread_id: Optional[str] = None) -> State:
+    config = campaign_config(prompt, thread_id)
+    return g.invoke(campaign_input(g, prompt, config), config)
+
+
+async def ainvoke_campaign(g, prompt: str, thread_id: Optional[str] = None) -> State:
+    config = campaign_config(prompt, thread_id)
+    if g.checkpointer is not None and (await g.aget_state(config)).next:
+        return await g.ainvoke(None, config)
+    return await g.ainvoke({"prompt": prompt}, config)
+
+
+def discard_thread(g, thread_id: str) -> None:
+    # one-off runs (service jobs, batch ids) are never resumed or re-planned once finished: drop their checkpoints
+    # instead of leaving a thread per run in the database
+    if g.checkpointer is not None:
+        g.checkpointer.delete_thread(thread_id)
 
 # Purpose: orchestrate the multi‑step pipeline using LangGraph.
 #
 # Key ideas:
 #
-# State: a typed dictionary of the running pipeline’s data (prompt → brief → plan → assets → posts → schedule).
-# In the latest LangGraph SDK, it’s safest to store plain dicts/lists in state (msgpack‑safe) and only convert to/from Pydantic models at node boundaries.
+# State: a typed dictionary of the running pipeline’s data (prompt → brief → plan → drafts + day_assets → assets/posts
+# → schedule). day_assets has a reducer (add_days): the image branches append {"day", "asset"} as they finish.
+# Trusted mode (settings.trusted_state, default on): nodes pass the Pydantic models themselves between each other.
+# Data is validated once where it enters (ParseInput / model construction), not re-validated and re-dumped per node.
+# build_graph(trusted=False) keeps the old behaviour: plain msgpack‑safe dicts, validated at every node boundary.
+# as_model/as_models accept either form, so dicts coming back from a checkpoint still work.
+#
+# to_schedule(final_state): the graph's output boundary → List[ScheduledPost].
 #
-# MemorySaver: the checkpointer (in‑memory here) so LangGraph can keep a thread state if you later stream/iterate.
+# Checkpointer: get_graph() compiles with make_checkpointer() (SQLite file, see core/checkpoint.py); one thread per
+# campaign (thread id from the prompt unless given). invoke_campaign / ainvoke_campaign resume an interrupted
+# thread from its last completed node instead of starting over; a finished thread just runs again.
+# discard_thread(g, thread_id) deletes a finished run's checkpoints (the job service and batch runner do this).
+# Each finished image branch is saved as a pending write, so a resume only reruns the days that didn't finish.
 #
 # Nodes (pure functions that take/return State fragments):
 #
@@ -88,13 +195,27 @@ def build_graph():
 #
 # node_plan: calls generate_calendar → {"plan": [planItemDicts]}
 #
-# node_assets: loops plan; for each day calls create_image → {"assets": [assetDicts]}
+# fan_out_days: after plan_calendar, Send()s the image branches. Remote providers (ImageProvider.blocking) get
+# one branch per day; a local provider gets a single branch, since extra branches would only add per-task overhead.
+# campaign_config caps the branches in flight at asset_concurrency + 1 (max_concurrency).
 #
-# node_copy_and_format: for each day/platform generates a PostDraft, applies formatting, collects FormattedPosts → {"posts": [formattedDicts]}
+# node_draft_copy: every day/platform PostDraft in one generate_campaign_copy call (templates, or batched LLM
+# windows) → {"drafts": [...]}; runs in the same superstep as the image branches, so copy overlaps images.
+#
+# node_assets / anode_assets (node "create_assets", one per branch): create_image_or_placeholder per day (timeout →
+# placeholder), then render_renditions for the branch's images (per-platform crops/encodings on a process pool);
+# the async variant, used when the graph runs via ainvoke, awaits the branch's days together with acreate_images. Each day is written to the LangGraph stream writer
+# ({"day": i, "asset": Asset, "renditions": {platform: Asset}}) → {"day_assets": [{"day", "asset", "renditions"}]}.
+#
+# node_format (join, "format_posts"): runs once all branches are in; orders assets by day and attaches each
+# platform's rendition (else the original) to its draft via apply_platform_rules → {"assets": [...], "posts": [...]}.
 #
 # node_schedule: calls mock_schedule with plan+posts → {"schedule": [scheduledDicts]}
 #
-# Edges: START → parse_brief → plan_calendar → create_assets → copy_and_format → schedule → END
+# get_graph(): cached build_graph() so callers (runner, batch workers) compile once per process.
+#
+# Edges: START → parse_brief → plan_calendar → {draft_copy ∥ create_assets × branches} → format_posts → schedule
+# → END. Critical path: max(images, copy) instead of images + copy (bench.fanout).
 # (Latest SDK uses START/END instead of set_entry_point.)
 #
 # Why we need it:
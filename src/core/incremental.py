@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Set, Tuple
+from langgraph.types import Overwrite
+from .checkpoint import campaign_config
+from .graph import as_model, as_models
+from .instrumentation import timed
+from .schemas import CampaignBrief, PlanItem, Asset, PostDraft, FormattedPost, State
+from features.assets import asset_input, create_images
+from features.config import get_settings
+from features.formatting import apply_platform_rules
+from features.llm_copy import generate_campaign_copy
+from features.planning import generate_calendar
+from features.renditions import render_renditions
+from features.schedule import mock_schedule
+
+# brief fields each output reads; anything else in a day's output comes from its PlanItem
+PLAN_FIELDS = frozenset({"startDate", "days", "timezone"})
+ASSET_FIELDS = frozenset({"name", "audience"})                # asset_input: name | theme | audience
+COPY_FIELDS = frozenset({"name", "goal", "audience", "tone"})  # compile_templates / copy_key
+
+
+def diff_briefs(old: CampaignBrief, new: CampaignBrief) -> Set[str]:
+    return {f for f in CampaignBrief.model_fields if getattr(old, f) != getattr(new, f)}
+
+
+def _copy_key(item: PlanItem) -> Tuple[str, str, Tuple[str, ...]]:
+    # a day's drafts, for an unchanged set of COPY_FIELDS, depend on these (templates print the date)
+    return item.theme, item.dateISO, tuple(item.platforms)
+
+
+def replan(previous: State, brief: CampaignBrief, trusted: Optional[bool] = None) -> Tuple[State, Dict[str, Any]]:
+    """The state a full run on `brief` would produce, rebuilding only the days the edit invalidates."""
+    if trusted is None:
+        trusted = get_settings().trusted_state
+
+    def out(m):
+        return m if trusted else m.model_dump(mode="json")
+
+    old_brief = as_model(CampaignBrief, previous["brief"])
+    old_plan = as_models(PlanItem, previous["plan"])
+    old_assets = as_models(Asset, previous["assets"])
+    old_drafts = iter(as_models(PostDraft, previous["drafts"]))
+    changed = diff_briefs(old_brief, brief)
+
+    with timed("node", "replan") as span:
+        plan = generate_calendar(brief) if changed & PLAN_FIELDS else old_plan
+
+        # what each previous output was built from → the output
+        assets_by_input: Dict[str, Asset] = {}
+        if not changed & ASSET_FIELDS:
+            assets_by_input = {asset_input(old_brief, i).prompt: a for i, a in zip(old_plan, old_assets)}
+        drafts_by_input: Dict[Tuple[str, str, Tuple[str, ...]], List[PostDraft]] = {}
+        for item in old_plan:
+            day_drafts = [next(old_drafts) for _ in item.platforms]
+            if not changed & COPY_FIELDS:
+                drafts_by_input[_copy_key(item)] = day_drafts
+
+        assets: List[Optional[Asset]] = [None] * len(plan)
+        drafts: List[Optional[List[PostDraft]]] = [None] * len(plan)
+        for day, item in enumerate(plan):
+            assets[day] = assets_by_input.get(asset_input(brief, item).prompt)
+            hit = drafts_by_input.get(_copy_key(item))
+            drafts[day] = [d.model_copy(deep=True) for d in hit] if hit is not None else None
+
+        stale_assets = [day for day, a in enumerate(assets) if a is None]
+        for day, asset in zip(stale_assets, create_images([asset_input(brief, plan[d]) for d in stale_assets])):
+            assets[day] = asset
+        stale_copy = [day for day, d in enumerate(drafts) if d is None]
+        fresh = iter(generate_campaign_copy(brief, [plan[d] for d in stale_copy]))
+        for day in stale_copy:
+            drafts[day] = [next(fresh) for _ in plan[day].platforms]
+
+        # renditions are content-addressed files: reused days only check they exist
+        renditions = render_renditions(assets, [item.platforms for item in plan])
+        posts: List[FormattedPost] = [
+            apply_platform_rules(d, renditions[day].get(d.platform, assets[day]))
+            for day in range(len(plan)) for d in drafts[day]
+        ]
+        schedule = mock_schedule(brief.name, plan, posts, brief.timezone)
+        span.items = len(plan)
+
+    state: State = {
+        "brief": out(brief),
+        "plan": [out(p) for p in plan],
+        "drafts": [out(d) for day in drafts for d in day],
+        "day_assets": Overwrite([{"day": day, "asset": out(a), "renditions": {p: out(r) for p, r in rend.items()}}
+                                 for day, (a, rend) in enumerate(zip(assets, renditions))]),
+        "assets": [out(a) for a in assets],
+        "posts": [out(p) for p in posts],
+        "schedule": [out(s) for s in schedule],
+    }
+    report = {
+        "changed": sorted(changed),
+        "plan": "regenerated" if changed & PLAN_FIELDS else "reused",
+        "days": len(plan),
+        "assets_reused": len(plan) - len(stale_assets),
+        "assets_created": len(stale_assets),
+        "copy_reused": len(plan) - len(stale_copy),
+        "copy_regenerated": len(stale_copy),
+    }
+    return state, report
+
+
+def replan_thread(g, prompt: str, changes: Dict[str, Any],
+                  thread_id: Optional[str] = None) -> Tuple[State, Dict[str, Any]]:
+    """Applies `changes` to the brief of the campaign's last finished run and saves the result on its thread."""
+    if g.checkpointer is None:
+        raise RuntimeError("incremental re-planning needs checkpoints (CHECKPOINT_ENABLED=true)")
+    unknown = set(changes) - set(CampaignBrief.model_fields)
+    if unknown:
+        raise ValueError(f"unknown brief fields: {', '.join(sorted(unknown))}")
+    config = campaign_config(prompt, thread_id)
+    snap = g.get_state(config)
+    if snap.next or not snap.values.get("schedule"):
+        raise ValueError(f"no finished run on thread {config['configurable']['thread_id']} to re-plan from")
+    old = as_model(CampaignBrief, snap.values["brief"])
+    brief = CampaignBrief.model_validate({**old.model_dump(), **changes})
+    state, report = replan(snap.values, brief)
+    # recorded as the schedule node's output: the next edit diffs against this one, and get_state shows it
+    g.update_state(config, state, as_node="schedule")
+    state["day_assets"] = state["day_assets"].value
+    return state, report
+
+# Purpose: a brief edit (tone, start date, audience, ...) without rerunning the whole graph.
+#
+# Dependencies (per day; the schedule is always rebuilt, it is cheap and packs slots across days):
+#
+# PLAN_FIELDS (startDate, days, timezone) → the plan; otherwise the previous plan is kept as is.
+# ASSET_FIELDS (name, audience) + the day's theme → its image (asset_input). A previous image is reused for any
+# day whose input matches one from the last run, so a date shift or a longer campaign keeps every image.
+# COPY_FIELDS (name, goal, audience, tone) + the day's theme, date and platforms → its drafts. Template copy prints
+# the date, so a date shift re-renders it (cheap); LLM copy comes back from its cache (copy_key has no date).
+#
+# replan(previous_state, brief) -> (state, report): reuses what still matches, creates only the stale images
+# (create_images, concurrent) and copy, then renditions (existing files are reused), posts and the schedule.
+# report: changed fields, plan reused/regenerated, assets and copy reused vs rebuilt.
+#
+# replan_thread(g, prompt, changes, thread_id): loads the last finished run from the checkpointer, validates the
+# edited brief, re-plans and writes the new state back to the same thread (update_state as "schedule";
+# day_assets via Overwrite), so edits chain.
@@ -0,0 +1,329 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import cProfile
+import math
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import orjson
+from features.config import get_settings
+
+# wall-time histogram buckets (seconds), Prometheus-style cumulative
+BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0)
+
+Key = Tuple[str, str]  # (kind, name): ("node", "create_assets"), ("provider", "image:openai"), ...
+
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss() -> int:
+    # resident set size in bytes; 0 where /proc isn't available
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except OSError:
+        return 0
+
+
+class Span:
+    __slots__ = ("kind", "name", "items", "wall_s", "cpu_s", "mem_delta_bytes")
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.items: Optional[int] = None
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.mem_delta_bytes = 0
+
+
+class _Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Key, Dict[str, Any]] = {}
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            st = self._stats.get((span.kind, span.name))
+            if st is None:
+                st = self._stats[(span.kind, span.name)] = _empty()
+            st["calls"] += 1
+            st["wall_s"] += span.wall_s
+            st["cpu_s"] += span.cpu_s
+            st["items"] += span.items or 0
+            st["mem_delta_bytes"] += span.mem_delta_bytes
+            st["wall_max_s"] = max(st["wall_max_s"], span.wall_s)
+            for i, b in enumerate(BUCKETS):
+                if span.wall_s <= b:
+                    st["buckets"][i] += 1
+
+    def snapshot(self) -> Dict[Key, Dict[str, Any]]:
+        with self._lock:
+            return {k: {**v, "buckets": list(v["buckets"])} for k, v in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def _empty() -> Dict[str, Any]:
+    return {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "items": 0, "mem_delta_bytes": 0, "wall_max_s": 0.0,
+            "buckets": [0] * len(BUCKETS)}
+
+
+REGISTRY = _Registry()
+
+
+@contextmanager
+def timed(kind: str, name: str, items: Optional[int] = None) -> Iterator[Span]:
+    """Times the block (wall, CPU, memory delta) and records it; set span.items inside the block if known late."""
+    s = get_settings()
+    span = Span(kind, name)
+    span.items = items
+    if not s.metrics_enabled:
+        with _thread_profiled():
+            yield span
+        return
+    # node spans: process CPU (their work fans out to pools); provider calls: the calling thread's CPU
+    cpu = time.process_time if kind == "node" else time.thread_time
+    mem = (lambda: tracemalloc.get_traced_memory()[0]) if tracemalloc.is_tracing() else _rss
+    m0, c0, t0 = mem(), cpu(), time.perf_counter()
+    try:
+        with _thread_profiled():
+            yield span
+    finally:
+        span.wall_s = time.perf_counter() - t0
+        span.cpu_s = cpu() - c0
+        span.mem_delta_bytes = mem() - m0
+        REGISTRY.record(span)
+        if s.metrics_log:
+            sys.stderr.write(orjson.dumps({
+                "event": "span", "kind": kind, "name": name, "wall_s": round(span.wall_s, 6),
+                "cpu_s": round(span.cpu_s, 6), "items": span.items, "mem_delta_bytes": span.mem_delta_bytes,
+            }).decode() + "\n")
+
+
+def _count_items(update: Any) -> Optional[int]:
+    # a node's output size: the length of the list it returns ({"plan": [...]} → days)
+    if isinstance(update, dict):
+        for v in update.values():
+            if isinstance(v, list):
+                return len(v)
+    return None
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    if asyncio.iscoroutinefunction(fn):
+        @wraps(fn)
+        async def anode(state):
+            with timed("node", name) as span:
+                update = await fn(state)
+                span.items = _count_items(update)
+            return update
+        return anode
+
+    @wraps(fn)
+    def node(state):
+        with timed("node", name) as span:
+            update = fn(state)
+            span.items = _count_items(update)
+        return update
+    return node
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    """Nearest-rank percentile (rank ceil(q * n)) of an ascending list; 0.0 when empty."""
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[max(0, min(len(sorted_vals) - 1, math.ceil(q * len(sorted_vals)) - 1))]
+
+
+def snapshot() -> Dict[Key, Dict[str, Any]]:
+    return REGISTRY.snapshot()
+
+
+def diff(after: Dict[Key, Dict[str, Any]], before: Dict[Key, Dict[str, Any]]) -> Dict[Key, Dict[str, Any]]:
+    out = {}
+    for k, a in after.items():
+        b = before.get(k)
+        if b is None:
+            out[k] = a
+        elif a["calls"] != b["calls"]:
+            d = {f: a[f] - b[f] for f in ("calls", "wall_s", "cpu_s", "items", "mem_delta_bytes")}
+            d["wall_max_s"] = a["wall_max_s"]  # not subtractable; an upper bound for the interval
+            d["buckets"] = [x - y for x, y in zip(a["buckets"], b["buckets"])]
+            out[k] = d
+    return out
+
+
+def merge(parts: Iterable[Dict[Key, Dict[str, Any]]]) -> Dict[Key, Dict[str, Any]]:
+    out: Dict[Key, Dict[str, Any]] = {}
+    for part in parts:
+        for k, v in part.items():
+            st = out.setdefault(k, _empty())
+            for f in ("calls", "wall_s", "cpu_s", "items", "mem_delta_bytes"):
+                st[f] += v[f]
+            st["wall_max_s"] = max(st["wall_max_s"], v["wall_max_s"])
+            st["buckets"] = [x + y for x, y in zip(st["buckets"], v["buckets"])]
+    return out
+
+
+def to_json(stats: Optional[Dict[Key, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    stats = snapshot() if stats is None else stats
+    return [{"kind": k, "name": n, **v} for (k, n), v in sorted(stats.items())]
+
+
+def from_json(rows: List[Dict[str, Any]]) -> Dict[Key, Dict[str, Any]]:
+    return {(r["kind"], r["name"]): {f: v for f, v in r.items() if f not in ("kind", "name")} for r in rows}
+
+
+def to_prometheus(stats: Optional[Dict[Key, Dict[str, Any]]] = None, prefix: str = "campaign") -> str:
+    stats = snapshot() if stats is None else stats
+    lines: List[str] = []
+
+    def family(metric: str, mtype: str, help_: str, rows: Iterable[Tuple[str, Any]]):
+        lines.append(f"# HELP {prefix}_{metric} {help_}")
+        lines.append(f"# TYPE {prefix}_{metric} {mtype}")
+        lines.extend(f"{prefix}_{metric}{labels} {value}" for labels, value in rows)
+
+    def lbl(k: Key, le: Optional[str] = None) -> str:
+        extra = f',le="{le}"' if le is not None else ""
+        return f'{{kind="{k[0]}",name="{k[1]}"{extra}}}'
+
+    keys = sorted(stats)
+    family("calls_total", "counter", "Instrumented calls.", [(lbl(k), stats[k]["calls"]) for k in keys])
+    family("cpu_seconds_total", "counter", "CPU time spent in the call.",
+           [(lbl(k), round(stats[k]["cpu_s"], 6)) for k in keys])
+    family("items_total", "counter", "Items produced (days, posts, images).",
+           [(lbl(k), stats[k]["items"]) for k in keys])
+    family("memory_delta_bytes", "gauge", "Net memory growth summed over calls (RSS or tracemalloc).",
+           [(lbl(k), stats[k]["mem_delta_bytes"]) for k in keys])
+    lines.append(f"# HELP {prefix}_wall_seconds Wall time per call.")
+    lines.append(f"# TYPE {prefix}_wall_seconds histogram")
+    for k in keys:
+        st = stats[k]
+        name = prefix + "_wall_seconds"
+        for b, c in zip(BUCKETS, st["buckets"]):
+            lines.append(f"{name}_bucket{lbl(k, le=str(b))} {c}")
+        lines.append(f"{name}_bucket{lbl(k, le='+Inf')} {st['calls']}")
+        lines.append(f"{name}_sum{lbl(k)} {round(st['wall_s'], 6)}")
+        lines.append(f"{name}_count{lbl(k)} {st['calls']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: Optional[str] = None, stats: Optional[Dict[Key, Dict[str, Any]]] = None) -> Optional[Path]:
+    # Prometheus textfile-collector format (.prom) or JSON (.json), picked by extension
+    path = path or get_settings().metrics_path
+    if not path:
+        return None
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(p.suffix + ".tmp")
+    if p.suffix == ".json":
+        tmp.write_bytes(orjson.dumps(to_json(stats), option=orjson.OPT_INDENT_2))
+    else:
+        tmp.write_text(to_prometheus(stats), encoding="utf-8")
+    tmp.replace(p)
+    return p
+
+
+class _ProfileSession:
+    # spans that run on other threads (the graph's per-day branches, image pools) while profiled() is active
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.profiles: List[cProfile.Profile] = []
+
+
+_SESSION: Optional[_ProfileSession] = None
+_profiling = threading.local()  # .active: this thread already has a profiler enabled
+# from 3.12 cProfile hooks sys.monitoring, which sees every thread; before that it only sees the enabling thread
+_PER_THREAD = sys.version_info < (3, 12)
+
+
+@contextmanager
+def _thread_profiled() -> Iterator[None]:
+    # a span on a thread profiled() doesn't cover: profiled on that thread and merged into the run's dump
+    session = _SESSION
+    if session is None or getattr(_profiling, "active", False):
+        yield
+        return
+    prof = cProfile.Profile()
+    _profiling.active = True
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        _profiling.active = False
+        with session.lock:
+            session.profiles.append(prof)
+
+
+@contextmanager
+def profiled(name: str) -> Iterator[Optional[Path]]:
+    """cProfile the block into <profile_dir>/<name>-<time>.prof when PROFILE_DIR is set; no-op otherwise.
+
+    Nodes and provider calls that run on worker threads during the block are included.
+    """
+    global _SESSION
+    d = get_settings().profile_dir
+    if not d:
+        yield None
+        return
+    out = Path(d) / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    # one session per process at a time; a concurrent profiled() block only covers its own thread
+    session = _ProfileSession() if _PER_THREAD and _SESSION is None else None
+    if session is not None:
+        _SESSION = session
+    prof = cProfile.Profile()
+    _profiling.active = True
+    prof.enable()
+    try:
+        yield out
+    finally:
+        prof.disable()
+        _profiling.active = False
+        stats = pstats.Stats(prof)
+        if session is not None:
+            _SESSION = None
+            with session.lock:
+                # spans still running (a timed-out image) aren't in yet; their profiles are dropped
+                for p in session.profiles:
+                    stats.add(p)
+        stats.dump_stats(str(out))
+
+
+@lru_cache(maxsize=1)
+def start_memory_tracing() -> bool:
+    # exact Python-heap deltas instead of RSS; costs noticeable overhead, so opt-in (METRICS_TRACEMALLOC=true)
+    if get_settings().metrics_tracemalloc and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return tracemalloc.is_tracing()
+
+# Purpose: where the time goes, per graph node and per external call, in production and batch runs.
+#
+# timed(kind, name, items) — context manager recording wall time, CPU time (process for nodes, thread for
+# provider calls), item count and memory delta (RSS from /proc, or tracemalloc when METRICS_TRACEMALLOC=true)
+# into a process-wide registry; with METRICS_LOG=true each span is also a JSON line on stderr.
+#
+# instrument_node(name, fn): wraps a LangGraph node (sync or async); items = length of the list it returns.
+#
+# snapshot() / diff(after, before) / merge(parts): per-run deltas and cross-process aggregation (batch mode).
+#
+# percentile(sorted_vals, q): nearest-rank percentile behind the p50/p95 in batch, dispatcher and bench reports.
+#
+# to_prometheus(stats) / to_json(stats) / write_metrics(path): calls, CPU, items and memory counters plus a
+# wall-time histogram per (kind, name); METRICS_PATH picks the file (.prom or .json).
+#
+# profiled(name): optional cProfile dump per run into PROFILE_DIR (open with `python -m pstats` or snakeviz).
+# Before Python 3.12 cProfile only sees the thread that enabled it, so every timed() span that starts on another
+# thread during the block (per-day create_assets and draft_copy branches, image pool calls) gets its own profiler
+# on that thread, merged into the same dump.
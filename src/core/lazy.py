@@ -0,0 +1,28 @@
+from __future__ import annotations
+from functools import lru_cache
+from types import ModuleType
+from typing import Optional
+import importlib
+
+
+@lru_cache(maxsize=None)
+def optional_import(name: str) -> Optional[ModuleType]:
+    # first use pays the import; None when the package isn't installed (or fails to import)
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
+def require(name: str, package: Optional[str] = None) -> ModuleType:
+    mod = optional_import(name)
+    if mod is None:
+        raise RuntimeError(f"{package or name.split('.')[0]} package not installed")
+    return mod
+
+# Purpose: defer heavy optional SDKs (openai, pandas, pyarrow) until the code path that needs them runs.
+#
+# optional_import(name) -> module | None: cached importlib.import_module; replaces the module-level
+# `try: import X / except: X = None` blocks, so importing a feature module doesn't load its SDK.
+#
+# require(name) -> module: same, but raises RuntimeError("X package not installed") when missing.
@@ -0,0 +1,17 @@
+from .base import ImageProvider
+from .placeholder import PlaceholderProvider
+from .openai_images import OpenAIImageProvider
+from .resilience import RetryPolicy, CircuitBreaker
+from .registry import register_provider, get_provider, get_image_provider, ResilientProvider
+
+__all__ = [
+    "ImageProvider",
+    "PlaceholderProvider",
+    "OpenAIImageProvider",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "register_provider",
+    "get_provider",
+    "get_image_provider",
+    "ResilientProvider",
+]
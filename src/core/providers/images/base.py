@@ -0,0 +1,34 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import asyncio
+from core.schemas import Asset
+
+if TYPE_CHECKING:
+    from features.assets import CreateAssetInput
+
+
+class ImageProvider:
+    name: str = "base"
+    blocking: bool = True  # generate() waits on I/O; False lets callers skip the worker thread / timeout
+
+    def generate(self, inp: "CreateAssetInput") -> Asset:
+        raise NotImplementedError
+
+    async def agenerate(self, inp: "CreateAssetInput") -> Asset:
+        # providers without a native async client run on a worker thread
+        return await asyncio.to_thread(self.generate, inp)
+
+    def retryable(self, exc: Exception) -> bool:
+        # transient by default; providers narrow this down
+        return True
+
+# Purpose: the contract every image provider implements.
+#
+# ImageProvider.generate(inp) -> Asset: produce one image for a CreateAssetInput.
+#
+# ImageProvider.agenerate(inp) -> Asset: async variant; defaults to generate() on a worker thread.
+#
+# ImageProvider.blocking: whether generate() does I/O worth a timeout and a worker thread.
+#
+# ImageProvider.retryable(exc) -> bool: tells the retry policy whether an error is worth another attempt
+# (timeouts / 5xx yes, bad credentials no).
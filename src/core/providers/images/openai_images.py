@@ -0,0 +1,146 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Optional
+from contextlib import nullcontext
+from pathlib import Path
+import asyncio
+import base64
+import threading
+import weakref
+from core.lazy import optional_import, require
+from core.schemas import Asset
+from features.config import get_settings
+from features.image_cache import cache_key, get_image_cache
+from .base import ImageProvider
+
+if TYPE_CHECKING:
+    from openai import OpenAI, AsyncOpenAI
+    from features.assets import CreateAssetInput
+
+
+def _artifacts_dir() -> Path:
+    p = Path(__file__).resolve().parents[3] / ".." / "artifacts" / "images"
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+
+class OpenAIImageProvider(ImageProvider):
+    name = "openai"
+    model = "gpt-image-1"
+    size = "1024x576"
+
+    def __init__(self):
+        self._client: Optional["OpenAI"] = None
+        self._lock = threading.Lock()
+        # async clients (and their connection pools) belong to one event loop each
+        self._aclients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+        self._akey_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = weakref.WeakKeyDictionary()
+
+    def _client_kwargs(self, http_client_cls) -> dict:
+        settings = get_settings()
+        if not settings.openai_api_key:
+            raise RuntimeError("OPENAI_API_KEY not configured")
+        pool = max(settings.asset_concurrency, 1)
+        return dict(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            max_retries=0,  # RetryPolicy owns retries
+            timeout=settings.asset_timeout_s,
+            http_client=http_client_cls(
+                limits=require("httpx").Limits(max_connections=pool * 2, max_keepalive_connections=pool),
+            ),
+        )
+
+    @property
+    def client(self) -> "OpenAI":
+        # one client (and one keep-alive connection pool) per process
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    sdk = require("openai")  # the SDK is imported by the first real request, not at startup
+                    self._client = sdk.OpenAI(**self._client_kwargs(sdk.DefaultHttpxClient))
+        return self._client
+
+    @property
+    def aclient(self) -> "AsyncOpenAI":
+        loop = asyncio.get_running_loop()
+        c = self._aclients.get(loop)
+        if c is None:
+            sdk = require("openai")
+            c = self._aclients[loop] = sdk.AsyncOpenAI(**self._client_kwargs(sdk.DefaultAsyncHttpxClient))
+        return c
+
+    def _akey_lock(self, key: str) -> asyncio.Lock:
+        locks = self._akey_locks.setdefault(asyncio.get_running_loop(), {})
+        return locks.setdefault(key, asyncio.Lock())
+
+    def _request(self, inp: "CreateAssetInput") -> tuple[str, str, dict]:
+        settings = get_settings()
+        prompt = inp.prompt if not inp.style else f"{inp.prompt}. Style: {inp.style}"
+        key = cache_key(inp.prompt, inp.style, inp.seed, self.name, self.model, self.size)
+        # Use gpt-image-1; returns base64 by default
+        kwargs = dict(model=self.model, prompt=prompt, size=self.size, response_format="b64_json",
+                      timeout=settings.asset_timeout_s)
+        return prompt, key, kwargs
+
+    def _store(self, key: str, img_bytes: bytes) -> Path:
+        cache = get_image_cache() if get_settings().image_cache_enabled else None
+        if cache:
+            return cache.put(key, img_bytes)
+        out_path = _artifacts_dir() / f"asset_{key[:16]}.png"
+        out_path.write_bytes(img_bytes)
+        return out_path
+
+    def generate(self, inp: "CreateAssetInput") -> Asset:
+        prompt, key, kwargs = self._request(inp)
+        cache = get_image_cache() if get_settings().image_cache_enabled else None
+
+        # the per-key lock makes concurrent requests for the same image wait for one generation
+        with cache.lock_for(key) if cache else nullcontext():
+            out_path = cache.get(key) if cache else None
+            if out_path is None:
+                resp = self.client.images.generate(**kwargs)
+                out_path = self._store(key, base64.b64decode(resp.data[0].b64_json))
+
+        # Use file:// URI so it validates under AnyUrl
+        return Asset(id=out_path.stem, url=out_path.resolve().as_uri(), prompt=prompt)
+
+    async def agenerate(self, inp: "CreateAssetInput") -> Asset:
+        prompt, key, kwargs = self._request(inp)
+        cache = get_image_cache() if get_settings().image_cache_enabled else None
+
+        async with self._akey_lock(key):
+            out_path = await asyncio.to_thread(cache.get, key) if cache else None
+            if out_path is None:
+                resp = await self.aclient.images.generate(**kwargs)
+                img_bytes = base64.b64decode(resp.data[0].b64_json)
+                out_path = await asyncio.to_thread(self._store, key, img_bytes)
+
+        return Asset(id=out_path.stem, url=out_path.resolve().as_uri(), prompt=prompt)
+
+    def retryable(self, exc: Exception) -> bool:
+        openai = optional_import("openai")
+        if openai is None:
+            return False
+        return isinstance(exc, (
+            openai.APIConnectionError,  # includes APITimeoutError
+            openai.RateLimitError,
+            openai.InternalServerError,
+        ))
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+# Purpose: OpenAI Images (gpt-image-1) provider.
+#
+# OpenAIImageProvider.client: lazily builds a single OpenAI client per provider instance with a bounded
+# keep-alive pool (sized from asset_concurrency), SDK retries disabled and optional OPENAI_BASE_URL
+# (points at a local stub server when testing).
+#
+# aclient: same for AsyncOpenAI, one per running event loop (async pools can't be shared across loops).
+#
+# generate(inp) / agenerate(inp): checks the content-addressed image cache first; on a miss calls images.generate,
+# stores the PNG through the cache and returns a file:// Asset. Disk work in agenerate runs on a thread.
+#
+# retryable(exc): connection errors, timeouts, 429 and 5xx are retried; auth / bad request are not.
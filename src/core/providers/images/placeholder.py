@@ -0,0 +1,29 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import secrets
+import urllib.parse
+from core.schemas import Asset
+from .base import ImageProvider
+
+if TYPE_CHECKING:
+    from features.assets import CreateAssetInput
+
+
+class PlaceholderProvider(ImageProvider):
+    name = "placeholder"
+    blocking = False
+
+    def generate(self, inp: "CreateAssetInput") -> Asset:
+        aid = "asset_" + secrets.token_hex(6)
+        label = urllib.parse.quote_plus(inp.prompt[:40])
+        url = f"https://placehold.co/1200x675?text={label}"
+        return Asset(id=aid, url=url, prompt=inp.prompt)
+
+    async def agenerate(self, inp: "CreateAssetInput") -> Asset:
+        return self.generate(inp)  # no I/O, no need for a thread
+
+    def retryable(self, exc: Exception) -> bool:
+        return False
+
+# Purpose: zero-cost image provider (placehold.co URL with the prompt as label).
+# Also the failover target when the real provider's circuit breaker is open.
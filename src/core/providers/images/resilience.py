@@ -0,0 +1,104 @@
+from __future__ import annotations
+from typing import Awaitable, Callable, TypeVar
+import asyncio
+import random
+import threading
+import time
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    def __init__(self, attempts: int = 3, base_delay_s: float = 0.5, max_delay_s: float = 8.0, jitter: float = 0.2):
+        self.attempts = max(1, attempts)
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        d = min(self.max_delay_s, self.base_delay_s * (2 ** attempt))
+        return d * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def call(self, fn: Callable[[], T], retryable: Callable[[Exception], bool]) -> T:
+        for attempt in range(self.attempts):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.attempts - 1 or not retryable(e):
+                    raise
+                time.sleep(self.delay(attempt))
+        raise AssertionError("unreachable")
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], retryable: Callable[[Exception], bool]) -> T:
+        for attempt in range(self.attempts):
+            try:
+                return await fn()
+            except Exception as e:
+                if attempt == self.attempts - 1 or not retryable(e):
+                    raise
+                await asyncio.sleep(self.delay(attempt))
+        raise AssertionError("unreachable")
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 5, reset_after_s: float = 60.0):
+        self.threshold = threshold
+        self.reset_after_s = reset_after_s
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trips = 0
+        self._probing: float | None = None  # when the half-open trial call was let through
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if now - self.opened_at >= self.reset_after_s else "open"
+
+    def allow(self) -> bool:
+        # half-open lets exactly one trial call through; the rest stay on the fallback until its result closes or
+        # re-opens the breaker (a probe that never reports back, e.g. a cancelled task, expires after reset_after_s)
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state != "half_open":
+                return state == "closed"
+            if self._probing is not None and now - self._probing < self.reset_after_s:
+                return False
+            self._probing = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.failures += 1
+            if self._state(now) == "half_open" or self.failures >= self.threshold:
+                if self._state(now) != "open":
+                    self.trips += 1
+                self.opened_at = now
+            self._probing = None
+
+# Purpose: retry/backoff and circuit breaking around provider calls.
+#
+# RetryPolicy(attempts, base_delay_s, max_delay_s, jitter)
+#
+# call(fn, retryable) / acall(async_fn, retryable): runs fn, retrying retryable errors with jittered exponential backoff.
+#
+# CircuitBreaker(threshold, reset_after_s)
+#
+# Why: once a provider is clearly down, stop paying for a failed call (plus retries) on every day.
+#
+# What it does: opens after `threshold` consecutive failures; while open allow() is False; after
+# reset_after_s it goes half-open: allow() admits a single trial call (concurrent callers keep getting False and
+# fail over) and its result closes the breaker (success) or re-opens it (failure).
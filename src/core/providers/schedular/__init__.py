@@ -0,0 +1,17 @@
+from .base import PublishAdapter, PublishError
+from .dry_run import DryRunAdapter
+from .http_adapter import HttpPublishAdapter
+from .rate_limit import TokenBucket
+from .registry import PUBLISH_RATES, register_adapter, get_adapter, get_rate_limiter
+
+__all__ = [
+    "PublishAdapter",
+    "PublishError",
+    "DryRunAdapter",
+    "HttpPublishAdapter",
+    "TokenBucket",
+    "PUBLISH_RATES",
+    "register_adapter",
+    "get_adapter",
+    "get_rate_limiter",
+]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional
+from core.schemas import ScheduledPost
+
+
+class PublishError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None, retry_after_s: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after_s = retry_after_s
+
+
+class PublishAdapter:
+    name: str = "base"
+
+    def publish(self, post: ScheduledPost, post_id: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def retryable(self, exc: Exception) -> bool:
+        # transient by default; adapters narrow this down
+        return True
+
+    def open(self) -> None:
+        # connect/authenticate ahead of the first due post so it isn't late
+        pass
+
+    def close(self) -> None:
+        pass
+
+# Purpose: the contract every publishing adapter implements.
+#
+# PublishAdapter.publish(post, post_id) -> dict: send one ScheduledPost; post_id doubles as idempotency key,
+# so a retried request can't publish twice. Returns whatever the platform answered (e.g. its post id).
+#
+# PublishAdapter.retryable(exc) -> bool: whether the dispatcher's retry policy should try again.
+#
+# open() / close(): set up and tear down long-lived resources (connection pools).
+#
+# PublishError(message, status, retry_after_s): what adapters raise for rejected/failed sends.
@@ -0,0 +1,24 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+import threading
+from core.schemas import ScheduledPost
+from .base import PublishAdapter
+
+
+class DryRunAdapter(PublishAdapter):
+    name = "dry_run"
+
+    def __init__(self):
+        self.sent: List[str] = []
+        self._lock = threading.Lock()
+
+    def publish(self, post: ScheduledPost, post_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self.sent.append(post_id)
+        print(f"[dispatch] (dry run) {post.platform} {post.timestamp} {post.text[:60]!r}")
+        return {"id": post_id, "dry_run": True}
+
+    def retryable(self, exc: Exception) -> bool:
+        return False
+
+# Purpose: default adapter when no publishing endpoint is configured; logs what would be sent.
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import threading
+import time
+from core.lazy import optional_import, require
+from core.schemas import ScheduledPost
+from .base import PublishAdapter, PublishError
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is delay-seconds or an HTTP-date (RFC 9110 §10.2.3); a date already past means retry now
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None  # unparseable: the dispatcher falls back to its own backoff
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, when.timestamp() - time.time())
+
+
+class HttpPublishAdapter(PublishAdapter):
+    """POSTs a post as JSON to {base_url}/{platform}/posts (Buffer-style publishing API or a platform gateway)."""
+
+    name = "http"
+
+    def __init__(self, platform: str, base_url: str, token: Optional[str] = None, timeout_s: float = 30.0,
+                 max_connections: int = 4):
+        self.platform = platform
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout_s = timeout_s
+        self.max_connections = max_connections
+        self._client: Optional["httpx.Client"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> "httpx.Client":
+        # one keep-alive pool per adapter, created on first send
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    httpx = require("httpx")
+                    headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+                    self._client = httpx.Client(
+                        base_url=self.base_url,
+                        headers=headers,
+                        timeout=self.timeout_s,
+                        limits=httpx.Limits(max_connections=self.max_connections,
+                                            max_keepalive_connections=self.max_connections),
+                    )
+        return self._client
+
+    def publish(self, post: ScheduledPost, post_id: str) -> Dict[str, Any]:
+        r = self.client.post(
+            f"/{self.platform}/posts",
+            json={"id": post_id, "text": post.text, "mediaUrl": str(post.mediaUrl), "scheduledAt": post.timestamp,
+                  "campaign": post.campaign},
+            headers={"Idempotency-Key": post_id},
+        )
+        if r.status_code >= 400:
+            raise PublishError(f"{self.platform}: HTTP {r.status_code}", status=r.status_code,
+                               retry_after_s=_parse_retry_after(r.headers.get("Retry-After")))
+        return r.json() if r.content else {}
+
+    def retryable(self, exc: Exception) -> bool:
+        if isinstance(exc, PublishError):
+            return exc.status is None or exc.status == 429 or exc.status >= 500
+        httpx = optional_import("httpx")
+        return httpx is not None and isinstance(exc, httpx.TransportError)
+
+    def open(self) -> None:
+        self.client  # creating the client (TLS context, pool) costs a few hundred ms
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+
+# Purpose: publish over HTTP with a pooled keep-alive client per platform.
+#
+# httpx is imported on first send (core.lazy), not when the dispatcher imports the adapter registry.
+#
+# Sends an Idempotency-Key header (the store's post id). 4xx other than 429 is final; 429, 5xx and transport
+# errors are retryable, and Retry-After (seconds or an HTTP-date, clamped at 0) is passed on to the dispatcher's
+# rate limiter.
@@ -0,0 +1,40 @@
+from __future__ import annotations
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate_per_s: float, burst: int = 1):
+        self.rate_per_s = rate_per_s
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_s)
+        self.updated = now
+
+    def acquire(self) -> float:
+        # blocks until a token is available; returns the time spent waiting
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate_per_s
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, seconds: float) -> None:
+        # a 429 with Retry-After: stop handing out tokens for that long
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, -seconds * self.rate_per_s)  # concurrent 429s don't stack
+
+# Purpose: per-platform send rate limit shared by every dispatcher worker thread.
+#
+# TokenBucket(rate_per_s, burst).acquire() -> seconds waited; penalize(seconds) drains the bucket after a 429.
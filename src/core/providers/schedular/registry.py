@@ -0,0 +1,49 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+from features.config import get_settings
+from .base import PublishAdapter
+from .dry_run import DryRunAdapter
+from .http_adapter import HttpPublishAdapter
+from .rate_limit import TokenBucket
+
+_FACTORIES: Dict[str, Callable[[], PublishAdapter]] = {}
+
+# sends per second and burst, per platform; conservative defaults for the public APIs
+PUBLISH_RATES: Dict[str, Tuple[float, int]] = {
+    "x": (1.0, 5),
+    "linkedin": (0.5, 3),
+    "instagram": (0.5, 3),
+}
+
+
+def register_adapter(platform: str, factory: Callable[[], PublishAdapter]) -> None:
+    _FACTORIES[platform] = factory
+    get_adapter.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_adapter(platform: str) -> PublishAdapter:
+    if platform in _FACTORIES:
+        return _FACTORIES[platform]()
+    s = get_settings()
+    if s.publish_base_url:
+        return HttpPublishAdapter(platform, s.publish_base_url, s.publish_token, timeout_s=s.publish_timeout_s)
+    return DryRunAdapter()
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(platform: str) -> TokenBucket:
+    s = get_settings()
+    rate, burst = PUBLISH_RATES.get(platform, (s.publish_rate_per_s, s.publish_burst))
+    return TokenBucket(rate * s.publish_rate_scale, burst)
+
+# Purpose: one publishing adapter and one rate limiter per platform for the lifetime of the process.
+#
+# register_adapter(platform, factory): plug in a platform-specific adapter (or a test fake).
+#
+# get_adapter(platform): the registered adapter, else HttpPublishAdapter when PUBLISH_BASE_URL is set, else
+# DryRunAdapter.
+#
+# get_rate_limiter(platform): TokenBucket from PUBLISH_RATES (unknown platforms: publish_rate_per_s /
+# publish_burst), scaled by publish_rate_scale.
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from pydantic import BaseModel, Field, HttpUrl, field_validator,AnyUrl
+from pydantic import BaseModel, Field, HttpUrl, PrivateAttr, field_validator,AnyUrl
 from typing import List, Literal, Optional, Dict, Any, TypedDict, Annotated
 from typing_extensions import TypedDict
 import pendulum
@@ -14,7 +14,7 @@ class CampaignBrief(BaseModel):
     audience: str
     tone: Tone
     startDate: Optional[str] = Field(default=None, description="YYYY-MM-DD")
-    days: int = Field(default=7, ge=1, le=30)
+    days: int = Field(default=7, ge=1, le=730)  # always-on calendars run for quarters/years
     timezone: str = Field(default="Asia/Karachi")
 
     @field_validator("startDate")
@@ -39,6 +39,9 @@ class Asset(BaseModel):
     id: str
     url: AnyUrl
     prompt: str
+    # image provider that actually made it (set by ResilientProvider, e.g. "placeholder" after a failover);
+    # private, so never serialized or checkpointed
+    _provider: Optional[str] = PrivateAttr(default=None)
 
 class PostDraft(BaseModel):
     platform: Platform
@@ -55,15 +58,24 @@ class ScheduledPost(BaseModel):
     campaign: str
     platform: Platform
     text: str
-    mediaUrl: HttpUrl
+    mediaUrl: AnyUrl  # https:// placeholder or file:// generated image
     timestamp: str
     meta: Dict[str, object]
 
+def add_days(left: Optional[List[Dict[str, Any]]], right: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    # reducer for the per-day branches: each appends its {"day": i, "asset": ...}; None starts a fresh fan-out
+    if right is None:
+        return []
+    return (left or []) + right
+
 # Use a TypedDict for LangGraph v0.2+ state typing
+# Values are models in trusted mode, plain JSON dicts otherwise (see core/graph.py)
 class State(TypedDict, total=False):
     prompt: str
-    brief: Dict[str, Any]
-    plan: List[Dict[str, Any]]
-    assets: List[Dict[str, Any]]
-    posts: List[Dict[str, Any]]
-    schedule: List[Dict[str, Any]]
+    brief: CampaignBrief | Dict[str, Any]
+    plan: List[PlanItem | Dict[str, Any]]
+    drafts: List[PostDraft | Dict[str, Any]]
+    day_assets: Annotated[List[Dict[str, Any]], add_days]  # completion order, joined by format_posts
+    assets: List[Asset | Dict[str, Any]]
+    posts: List[FormattedPost | Dict[str, Any]]
+    schedule: List[ScheduledPost | Dict[str, Any]]
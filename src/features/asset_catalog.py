@@ -0,0 +1,201 @@
+from __future__ import annotations
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from multiprocessing import util as mp_util
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from core.schemas import Asset
+from .config import get_settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    id          TEXT PRIMARY KEY,
+    prompt_hash BLOB NOT NULL,
+    url         TEXT NOT NULL,
+    prompt      TEXT NOT NULL,
+    provider    TEXT NOT NULL,
+    created     REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS assets_prompt ON assets (prompt_hash, created);
+"""
+
+
+def prompt_hash(prompt: str) -> bytes:
+    # 16 bytes of sha256 over the whitespace-normalized prompt (same normalization as the image cache key)
+    return hashlib.sha256(" ".join(prompt.split()).encode("utf-8")).digest()[:16]
+
+
+class AssetRecord:
+    # one catalog slot; prompts repeat across days and campaigns, so they are interned
+    __slots__ = ("id", "url", "prompt", "prompt_hash", "provider", "created")
+
+    def __init__(self, id: str, url: str, prompt: str, prompt_hash: bytes, provider: str, created: float):
+        self.id = id
+        self.url = url
+        self.prompt = sys.intern(prompt)
+        self.prompt_hash = prompt_hash
+        self.provider = sys.intern(provider)
+        self.created = created
+
+    @classmethod
+    def from_asset(cls, asset: Asset, provider: str) -> "AssetRecord":
+        return cls(asset.id, str(asset.url), asset.prompt, prompt_hash(asset.prompt), provider, time.time())
+
+    def row(self) -> Tuple:
+        return self.id, self.prompt_hash, self.url, self.prompt, self.provider, self.created
+
+    def to_asset(self) -> Asset:
+        return Asset(id=self.id, url=self.url, prompt=self.prompt)
+
+
+class AssetCatalog:
+    FLUSH_EVERY = 256  # records buffered before one INSERT transaction
+
+    def __init__(self, path: Path, memory: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.memory = max(1, memory)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={64 * 1024 * 1024}")  # lookups read pages straight from the map
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._front: "OrderedDict[str, AssetRecord]" = OrderedDict()  # id → record, least recently used first
+        self._by_prompt: Dict[bytes, str] = {}  # prompt hash → newest id, for records in the front
+        self._pending: List[AssetRecord] = []
+        self.hits = 0
+        self.misses = 0
+        # buffered rows are written at interpreter exit, including pool worker processes (multiprocessing runs
+        # its finalizers there, where atexit doesn't)
+        mp_util.Finalize(self, self.flush, exitpriority=10)
+
+    # in-memory front
+    def _remember(self, rec: AssetRecord) -> None:
+        self._front[rec.id] = rec
+        self._front.move_to_end(rec.id)
+        newest = self._front.get(self._by_prompt.get(rec.prompt_hash, ""))
+        if newest is None or newest.created <= rec.created:
+            self._by_prompt[rec.prompt_hash] = rec.id
+        while len(self._front) > self.memory:
+            _, old = self._front.popitem(last=False)
+            if self._by_prompt.get(old.prompt_hash) == old.id:
+                del self._by_prompt[old.prompt_hash]
+
+    # writes
+    def add(self, asset: Asset, provider: str) -> AssetRecord:
+        return self.add_many([asset], provider)[0]
+
+    def add_many(self, assets: Iterable[Asset], provider: str) -> List[AssetRecord]:
+        recs = [AssetRecord.from_asset(a, provider) for a in assets]
+        with self._lock:
+            for r in recs:
+                self._remember(r)
+            self._pending.extend(recs)
+            if len(self._pending) >= self.FLUSH_EVERY:
+                self._flush()
+        return recs
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        with self._conn:
+            # a regenerated content-addressed image keeps its id: the row is refreshed, not duplicated
+            self._conn.executemany("INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?)",
+                                   [r.row() for r in self._pending])
+        self._pending.clear()
+
+    # lookups
+    def get(self, asset_id: str) -> Optional[Asset]:
+        with self._lock:
+            rec = self._front.get(asset_id)
+            if rec is None:
+                self._flush()
+                row = self._conn.execute("SELECT id, url, prompt, prompt_hash, provider, created FROM assets "
+                                         "WHERE id = ?", (asset_id,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                rec = AssetRecord(*row)
+            self.hits += 1
+            self._remember(rec)
+            return rec.to_asset()
+
+    def find_by_prompt(self, prompt: str) -> Optional[Asset]:
+        """The newest asset this process has seen for the prompt, else the newest one in the shared index."""
+        h = prompt_hash(prompt)
+        with self._lock:
+            rec = self._front.get(self._by_prompt.get(h, ""))
+            if rec is None:
+                self._flush()
+                row = self._conn.execute("SELECT id, url, prompt, prompt_hash, provider, created FROM assets "
+                                         "WHERE prompt_hash = ? ORDER BY created DESC LIMIT 1", (h,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                rec = AssetRecord(*row)
+            self.hits += 1
+            self._remember(rec)
+            return rec.to_asset()
+
+    def count(self) -> int:
+        with self._lock:
+            self._flush()
+            return self._conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_memory": len(self._front), "memory_limit": self.memory, "pending": len(self._pending),
+                    "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache(maxsize=1)
+def _catalog_for(pid: int) -> Optional[AssetCatalog]:
+    s = get_settings()
+    if not s.asset_catalog_enabled:
+        return None
+    return AssetCatalog(Path(s.asset_catalog_path), s.asset_catalog_memory)
+
+
+def get_asset_catalog() -> Optional[AssetCatalog]:
+    # keyed by pid: a forked worker (batch mode) opens its own connection instead of sharing the parent's
+    return _catalog_for(os.getpid())
+
+
+def record_asset(asset: Asset, provider: str) -> None:
+    catalog = get_asset_catalog()
+    if catalog is not None:
+        catalog.add(asset, provider)
+
+# Purpose: every generated asset stays findable without holding them all in memory.
+#
+# Table assets (SQLite, WAL, memory-mapped reads; settings.asset_catalog_path): one row per asset id with a
+# 16-byte prompt hash (indexed with created), URL, prompt and provider. WITHOUT ROWID keeps rows clustered on id.
+# Shared by every process on the host: batch worker processes and the job service's threads write to the same file.
+#
+# AssetRecord: a __slots__ record (no per-instance dict); prompt and provider strings are interned, since the
+# same "<brand> | <theme> | <audience>" prompt recurs across days and runs.
+#
+# AssetCatalog(path, memory):
+#
+# add(asset, provider) / add_many(...): into the in-memory front at once; rows are upserted into SQLite in
+# batches of FLUSH_EVERY (one transaction each), before any index read, and at process exit. A killed process
+# loses at most its unflushed batch; flush() forces it.
+#
+# get(asset_id) / find_by_prompt(prompt) -> Asset | None: served from a bounded LRU front (asset_catalog_memory
+# records, plus a prompt-hash → newest id map for those records); misses go to the index and are promoted.
+# Memory stays flat however many assets the catalog holds.
+#
+# get_asset_catalog() -> AssetCatalog | None: one per process (None when ASSET_CATALOG_ENABLED=false).
+# record_asset(asset, provider): what features/assets.py calls after each generated image or placeholder, with the
+# provider that actually produced it (the placeholder after a failover, not the configured provider).
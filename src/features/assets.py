@@ -1,95 +1,149 @@
 from __future__ import annotations
 from pydantic import BaseModel
-from typing import Optional
-from core.schemas import Asset
-import secrets
-import urllib.parse
-import base64
-from pathlib import Path
+from typing import Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+from core.instrumentation import timed
+from core.schemas import Asset, CampaignBrief, PlanItem
+from core.providers.images import get_image_provider, get_provider
+import asyncio
+import time
+from .asset_catalog import record_asset
 from .config import get_settings
 
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None  # type: ignore
 class CreateAssetInput(BaseModel):
     prompt: str
     style: Optional[str] = None
     seed: Optional[int] = None
 
-_ASSETS = {}
-
-def create_image(inp: CreateAssetInput) -> Asset:
-    # Mocked image creation using placeholder service
-    aid = "asset_" + secrets.token_hex(6)
-    label = urllib.parse.quote_plus(inp.prompt[:40])
-    url = f"https://placehold.co/1200x675?text={label}"
-    asset = Asset(id=aid, url=url, prompt=inp.prompt)
-    _ASSETS[aid] = asset
-    return asset
+def asset_input(brief: CampaignBrief, item: PlanItem) -> CreateAssetInput:
+    # a day's image depends on the brand, the day's theme and the audience only
+    return CreateAssetInput(prompt=f"{brief.name} | {item.theme} | {brief.audience}")
 
 def _create_image_placeholder(inp: CreateAssetInput) -> Asset:
-    aid = "asset_" + secrets.token_hex(6)
-    label = urllib.parse.quote_plus(inp.prompt[:40])
-    url = f"https://placehold.co/1200x675?text={label}"
-    asset = Asset(id=aid, url=url, prompt=inp.prompt)
-    _ASSETS[aid] = asset
+    asset = get_provider("placeholder").generate(inp)
+    record_asset(asset, "placeholder")
     return asset
 
-def _artifacts_dir() -> Path:
-    p = Path(__file__).resolve().parents[1] / ".." / "artifacts" / "images"
-    p.mkdir(parents=True, exist_ok=True)
-    return p
+def create_image(inp: CreateAssetInput) -> Asset:
+    """
+    Router: delegates to the configured provider from the registry (retries, circuit breaker
+    and placeholder failover are handled there).
+    """
+    provider = get_image_provider()
+    with timed("provider", f"image:{provider.name}", items=1):
+        asset = provider.generate(inp)
+    # after a failover that is the placeholder, not the configured provider
+    record_asset(asset, asset._provider or provider.name)
+    return asset
 
-def _create_image_openai(inp: CreateAssetInput) -> Asset:
+def create_images(
+    inputs: List[CreateAssetInput],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    create: Callable[[CreateAssetInput], Asset] = create_image,
+    on_done: Optional[Callable[[int, Asset], None]] = None,
+) -> List[Asset]:
+    """
+    Generate one asset per input on a bounded thread pool; results keep input order.
+    An image that is not back within its timeout is replaced by a placeholder.
+    on_done(index, asset) is called from the caller's thread as each asset is collected.
+    """
+    if not inputs:
+        return []
     settings = get_settings()
-    if OpenAI is None:
-        raise RuntimeError("openai package not installed")
-    if not settings.openai_api_key:
-        raise RuntimeError("OPENAI_API_KEY not configured")
+    workers = max(1, min(max_workers or settings.asset_concurrency, len(inputs)))
+    timeout = timeout if timeout is not None else settings.asset_timeout_s
+    if create is create_image and not get_image_provider().blocking:
+        # local provider: nothing to wait for, so no timeout to enforce and no pool to pay for
+        assets = []
+        for i, inp in enumerate(inputs):
+            assets.append(create(inp))
+            if on_done:
+                on_done(i, assets[-1])
+        return assets
 
-    client = OpenAI(api_key=settings.openai_api_key)
-    # Use gpt-image-1; returns base64 by default
-    prompt = inp.prompt if not inp.style else f"{inp.prompt}. Style: {inp.style}"
-    resp = client.images.generate(
-        model="gpt-image-1",
-        prompt=prompt,
-        size="1024x576",
-        response_format="b64_json"
-    )
-    b64 = resp.data[0].b64_json
-    img_bytes = base64.b64decode(b64)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+    try:
+        t0 = time.monotonic()
+        futures = [pool.submit(create, inp) for inp in inputs]
+        assets: List[Asset] = []
+        for i, (inp, fut) in enumerate(zip(inputs, futures)):
+            # input i starts after at most i // workers full waves, so that bounds its deadline
+            deadline = t0 + timeout * (i // workers + 1)
+            try:
+                assets.append(fut.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeout:
+                fut.cancel()
+                assets.append(_create_image_placeholder(inp))
+            if on_done:
+                on_done(i, assets[-1])
+        return assets
+    finally:
+        # don't block on requests that already timed out
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    aid = "asset_" + secrets.token_hex(6)
-    out_dir = _artifacts_dir()
-    out_path = out_dir / f"{aid}.png"
-    out_path.write_bytes(img_bytes)
+@lru_cache(maxsize=1)
+def _image_pool() -> ThreadPoolExecutor:
+    # shared by the graph's per-day branches; a late image keeps its worker until the provider returns
+    return ThreadPoolExecutor(max_workers=max(1, get_settings().asset_concurrency) * 2, thread_name_prefix="assets")
 
-    # Use file:// URI so it validates under AnyUrl
-    file_url = out_path.resolve().as_uri()
-    asset = Asset(id=aid, url=file_url, prompt=prompt)
-    _ASSETS[aid] = asset
+def create_image_or_placeholder(inp: CreateAssetInput, timeout: Optional[float] = None,
+                                create: Callable[[CreateAssetInput], Asset] = create_image) -> Asset:
+    """One image under create_images' rule: a placeholder replaces it if it isn't back within the timeout."""
+    if create is create_image and not get_image_provider().blocking:
+        return create(inp)  # local provider: nothing to wait for
+    timeout = timeout if timeout is not None else get_settings().asset_timeout_s
+    fut = _image_pool().submit(create, inp)
+    try:
+        return fut.result(timeout=timeout)
+    except FutureTimeout:
+        fut.cancel()
+        return _create_image_placeholder(inp)
+
+async def acreate_image(inp: CreateAssetInput) -> Asset:
+    provider = get_image_provider()
+    with timed("provider", f"image:{provider.name}", items=1):
+        asset = await provider.agenerate(inp)
+    await asyncio.to_thread(record_asset, asset, asset._provider or provider.name)
     return asset
 
-def create_image(inp: CreateAssetInput) -> Asset:
+async def acreate_image_or_placeholder(inp: CreateAssetInput, timeout: Optional[float] = None) -> Asset:
+    timeout = timeout if timeout is not None else get_settings().asset_timeout_s
+    try:
+        return await asyncio.wait_for(acreate_image(inp), timeout)
+    except asyncio.TimeoutError:
+        return _create_image_placeholder(inp)
+
+async def acreate_images(
+    inputs: List[CreateAssetInput],
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    on_done: Optional[Callable[[int, Asset], None]] = None,
+) -> List[Asset]:
     """
-    Router: picks real OpenAI image generation if configured; else placeholder.
+    Async create_images: at most max_concurrency requests in flight on the running loop,
+    each bounded by its own timeout (placeholder on expiry); results keep input order.
+    on_done(index, asset) fires as each image finishes, in completion order.
     """
-    provider = get_settings().image_provider.lower()
-    if provider == "openai":
-        try:
-            return _create_image_openai(inp)
-        except Exception as e:
-            # Fallback to placeholder on failure
-            return _create_image_placeholder(inp)
-    print("[assets] provider =", get_settings().image_provider)
-    return _create_image_placeholder(inp)
+    settings = get_settings()
+    sem = asyncio.Semaphore(max(1, max_concurrency or settings.asset_concurrency))
+    timeout = timeout if timeout is not None else settings.asset_timeout_s
+
+    async def one(i: int, inp: CreateAssetInput) -> Asset:
+        async with sem:
+            asset = await acreate_image_or_placeholder(inp, timeout)
+        if on_done:
+            on_done(i, asset)
+        return asset
+
+    return list(await asyncio.gather(*(one(i, inp) for i, inp in enumerate(inputs))))
 
 # Purpose: produce an image (real or mocked) for each day.
 #
 # Key pieces:
 #
-# CreateAssetInput: prompt, style, seed.
+# CreateAssetInput: prompt, style, seed. asset_input(brief, item) builds a day's input (name | theme | audience).
 #
 # create_image(inp: CreateAssetInput) -> Asset (router)
 #
@@ -97,15 +151,28 @@ def create_image(inp: CreateAssetInput) -> Asset:
 #
 # What it does:
 #
-# If IMAGE_PROVIDER=openai (and key is set), calls OpenAI Images to generate an image, saves it to artifacts/images/asset_*.png, and returns a file:// URL.
+# Asks core.providers.images.get_image_provider() for the process-wide provider (IMAGE_PROVIDER) and calls it.
+# With IMAGE_PROVIDER=openai that is the pooled OpenAI client behind retry/backoff and a circuit breaker:
+# images are saved to artifacts/images/asset_<hash>.png (reused on reruns) and returned as file:// URLs.
+# After repeated failures the breaker opens and days fail over to placeholder images (placehold.co).
+#
+# create_images(inputs, max_workers, timeout) -> List[Asset]
+#
+# Why: image calls are I/O bound, so a 30-day campaign shouldn't pay 30 requests back to back.
 #
-# Otherwise, returns a placeholder image URL (placehold.co).
+# What it does: fans inputs out over a ThreadPoolExecutor (settings.asset_concurrency workers), keeps plan order, and swaps in a placeholder for any image that misses its timeout.
+# A single worker still goes through the pool, so the timeout holds there too (a one-day replan); only a local
+# provider (placeholder) is called inline.
+# The optional on_done(index, asset) callback lets the graph stream each day's asset as soon as it is collected.
 #
-# Internals you may have (from earlier steps):
+# create_image_or_placeholder(inp, timeout) / acreate_image_or_placeholder: the same rule for a single image, used
+# by the graph's per-day branches (thread pool of 2 × asset_concurrency shared by the process / asyncio.wait_for).
 #
-# _create_image_openai(...): calls OpenAI, decodes base64, writes PNG to artifacts, returns Asset.
+# acreate_image / acreate_images: asyncio versions for the graph's ainvoke path (anode_assets awaits each
+# branch's days with acreate_images); one event loop can interleave the image requests of many campaigns
+# (semaphore per call, asyncio.wait_for per image).
 #
-# _create_image_placeholder(...): constructs a placeholder URL with prompt text.
+# _create_image_placeholder(...): placeholder provider directly; used when an image misses its timeout.
 #
 # Why we need it:
 # Some platforms require media; even when mocked, associating assets ensures formatting/scheduling steps work end‑to‑end. In prod you’d swap in real generation or a DAM lookup.
\ No newline at end of file
@@ -1,10 +1,58 @@
 from functools import lru_cache
+from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     image_provider: str = "openai"   # "openai" | "placeholder"
     openai_api_key: str | None = None
+    openai_base_url: str | None = None  # e.g. a local stub server
     default_tz: str = "Asia/Karachi"
+    trusted_state: bool = True       # keep models in graph state instead of re-validated dicts
+    checkpoint_enabled: bool = True
+    checkpoint_path: str = str(Path(__file__).resolve().parents[2] / "artifacts" / "checkpoints.sqlite")
+    schedule_store_enabled: bool = True
+    schedule_store_path: str = str(Path(__file__).resolve().parents[2] / "artifacts" / "schedule.sqlite")
+    asset_concurrency: int = 4       # max images generated at once
+    asset_timeout_s: float = 120.0   # per-image request timeout
+    image_cache_enabled: bool = True
+    image_cache_max_mb: int = 512
+    image_cache_max_age_days: float = 30.0
+    image_retry_attempts: int = 3
+    image_retry_base_delay_s: float = 0.5
+    image_breaker_threshold: int = 5     # consecutive failures before failing over to placeholder
+    image_breaker_reset_s: float = 60.0
+    publish_base_url: str | None = None  # unset = dry run
+    publish_token: str | None = None
+    publish_timeout_s: float = 30.0
+    publish_rate_per_s: float = 1.0      # platforms without an entry in PUBLISH_RATES
+    publish_burst: int = 3
+    publish_rate_scale: float = 1.0
+    publish_retry_attempts: int = 3
+    publish_workers: int = 4
+    dispatch_lookahead_s: float = 3600.0
+    dispatch_refresh_s: float = 30.0
+    metrics_enabled: bool = True
+    metrics_log: bool = False           # one JSON line per span on stderr
+    metrics_path: str | None = None     # write after each run: *.prom (Prometheus text) or *.json
+    metrics_tracemalloc: bool = False   # exact Python-heap deltas (slower) instead of RSS
+    profile_dir: str | None = None      # cProfile dump per run
+    copy_provider: str = "template"  # "template" | "openai"
+    copy_model: str = "gpt-4o-mini"
+    copy_batch_days: int = 7         # days of posts per chat request
+    copy_token_budget: int = 50_000  # per campaign
+    copy_timeout_s: float = 60.0
+    copy_cache_path: str = str(Path(__file__).resolve().parents[2] / "artifacts" / "copy_cache.sqlite")
+    renditions_enabled: bool = True  # needs Pillow; off (or not installed) = every platform shares the original
+    renditions_path: str = str(Path(__file__).resolve().parents[2] / "artifacts" / "renditions")
+    rendition_workers: int = 0       # encoder processes; 0 = CPU count, -1 = inline (no pool)
+    asset_catalog_enabled: bool = True
+    asset_catalog_path: str = str(Path(__file__).resolve().parents[2] / "artifacts" / "assets.sqlite")
+    asset_catalog_memory: int = 4096  # asset records kept in memory (LRU); the rest is looked up in SQLite
+    service_host: str = "127.0.0.1"
+    service_port: int = 8080
+    service_workers: int = 2         # campaigns run at once by the job service
+    service_queue_size: int = 64     # queued jobs before submissions get 429
+    service_job_history: int = 1000  # finished jobs kept for status/result lookups
 
     # pydantic-settings v2 style config
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
@@ -25,6 +73,36 @@ def get_settings() -> Settings:
 #
 # default_tz
 #
+# trusted_state: pass Pydantic models between graph nodes; validate only at the graph boundary.
+#
+# checkpoint_enabled / checkpoint_path: durable SQLite checkpointer so interrupted campaigns resume.
+#
+# schedule_store_enabled / schedule_store_path: SQLite store every run's schedule is upserted into.
+#
+# asset_concurrency / asset_timeout_s: images in flight per campaign (the graph's per-day branches) and per-image timeout.
+#
+# openai_base_url: override the API endpoint (local stub server for testing).
+#
+# image_retry_* / image_breaker_*: retry/backoff and circuit breaker for the image provider registry.
+#
+# publish_* / dispatch_*: where the dispatcher sends due posts (dry run without a base URL), rate limits,
+# retries, worker threads, how far ahead it loads from the schedule store and how often it re-reads it.
+#
+# metrics_* / profile_dir: per-node and per-provider-call timing (core/instrumentation.py), its export, and an
+# optional cProfile dump per run.
+#
+# copy_*: LLM copy provider (off by default), batch window, token budget and its response cache.
+#
+# image_cache_*: on/off switch, size cap and max age for the on-disk image cache (artifacts/images).
+#
+# renditions_*: per-platform image renditions (artifacts/renditions) and the size of their encoder process pool.
+#
+# asset_catalog_*: SQLite index of every generated asset (artifacts/assets.sqlite) and how many records each
+# process keeps in memory.
+#
+# service_*: the HTTP job service (runner/service.py): bind address, worker threads, queue bound and how many
+# finished jobs it remembers.
+#
 # model_config = SettingsConfigDict(env_file=".env") so it reads your .env.
 #
 # get_settings() -> Settings
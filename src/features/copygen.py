@@ -1,6 +1,10 @@
 from __future__ import annotations
 from pydantic import BaseModel
-from core.schemas import CampaignBrief, PostDraft, Platform
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+import re
+import string
+from core.schemas import CampaignBrief, PlanItem, PostDraft, Platform
 
 class CopyInput(BaseModel):
     brief: CampaignBrief
@@ -15,32 +19,112 @@ _DEF_HASHTAGS = {
 }
 
 
+_BASE_CTA = "Try it free today"
+
+
+class CopyTemplate(BaseModel):
+    # placeholders: {name} {goal} {audience} {tone} {tone_title} {cta} (fixed per brief), {dateISO} {theme} (per post)
+    text: str
+    hashtags: List[str] = []
+    emoji: List[str] = []
+
+
+_TEMPLATES: Dict[Tuple[str, Optional[str]], CopyTemplate] = {
+    ("x", None): CopyTemplate(
+        text="🚀 {name}: {goal}. Built for {audience}. {cta} → link in bio ({dateISO})",
+        hashtags=_DEF_HASHTAGS["x"], emoji=["🚀"]),
+    ("linkedin", None): CopyTemplate(
+        text=(
+            "✨ {name} — {goal}\n\n"
+            "For {audience}. {tone_title} tone.\n"
+            "• Draft faster\n• Keep brand voice\n• Collaborate\n\n"
+            "📈 {cta}: visit our site. ({dateISO})"
+        ),
+        hashtags=_DEF_HASHTAGS["linkedin"], emoji=["✨", "📈"]),
+    ("instagram", None): CopyTemplate(
+        text="🎨 {name} is here! {goal}.\nMade for {audience}. ⚡ {cta}. ({dateISO})",
+        hashtags=_DEF_HASHTAGS["instagram"], emoji=["🎨", "⚡"]),
+}
+# bumped on every registration so compiled templates from before are not reused
+_VERSION = 0
+
+
+def register_template(platform: str, text: str, hashtags: Optional[List[str]] = None,
+                      emoji: Optional[List[str]] = None, theme: Optional[str] = None) -> None:
+    global _VERSION
+    _TEMPLATES[(platform, theme)] = CopyTemplate(text=text, hashtags=hashtags or [], emoji=emoji or [])
+    _VERSION += 1
+
+
+_FORMATTER = string.Formatter()
+
+
+def _escape(s: str) -> str:
+    return s.replace("{", "{{").replace("}", "}}")
+
+
+def _compile(text: str, fixed: Dict[str, str]) -> Tuple[str, bool]:
+    """
+    One parse of the template: the brief's fields are formatted in (conversion and format spec included) and
+    literal text is re-escaped, so only the per-post fields are left for render's single format pass.
+    The flag says whether a remaining field still reads a brief value (a nested spec such as {name:{theme}}).
+    """
+    out: List[str] = []
+    needs_fixed = False
+    for literal, field, spec, conv in _FORMATTER.parse(text):
+        out.append(_escape(literal))
+        if field is None:
+            continue
+        root = re.match(r"[^.\[]*", field).group(0)
+        if root in fixed and "{" not in spec:
+            value = _FORMATTER.convert_field(_FORMATTER.get_field(field, (), fixed)[0], conv)
+            out.append(_escape(_FORMATTER.format_field(value, spec)))
+        else:
+            needs_fixed = needs_fixed or root in fixed or "{" in spec
+            out.append("{" + field + (f"!{conv}" if conv else "") + (f":{spec}" if spec else "") + "}")
+    return "".join(out), needs_fixed
+
+
+class CompiledTemplates:
+    def __init__(self, brief: CampaignBrief):
+        self._fixed = {
+            "name": brief.name, "goal": brief.goal, "audience": brief.audience,
+            "tone": brief.tone, "tone_title": brief.tone.capitalize(), "cta": _BASE_CTA,
+        }
+        self.name = brief.name
+        self._compiled = {key: (*_compile(t.text, self._fixed), t) for key, t in _TEMPLATES.items()}
+
+    def render(self, platform: str, theme: str, dateISO: str) -> PostDraft:
+        hit = self._compiled.get((platform, theme)) or self._compiled.get((platform, None))
+        if hit is None:
+            # Fallback (should not happen)
+            return PostDraft.model_construct(platform=platform, text=f"{self.name} — {theme} ({dateISO})",
+                                             hashtags=[], emoji=[])
+        text, needs_fixed, t = hit
+        values = {"dateISO": dateISO, "theme": theme}
+        if needs_fixed:
+            values = {**self._fixed, **values}
+        return PostDraft.model_construct(platform=platform, text=text.format_map(values),
+                                         hashtags=list(t.hashtags), emoji=list(t.emoji))
+
+
+@lru_cache(maxsize=256)
+def _compiled_for(name: str, goal: str, audience: str, tone: str, version: int) -> CompiledTemplates:
+    return CompiledTemplates(CampaignBrief.model_construct(name=name, goal=goal, audience=audience, tone=tone))
+
+
+def compile_templates(brief: CampaignBrief) -> CompiledTemplates:
+    return _compiled_for(brief.name, brief.goal, brief.audience, brief.tone, _VERSION)
+
+
+def render_posts(brief: CampaignBrief, plan: List[PlanItem]) -> List[PostDraft]:
+    # every (day, platform) draft of a campaign, in plan order
+    ct = compile_templates(brief)
+    return [ct.render(p, item.theme, item.dateISO) for item in plan for p in item.platforms]
+
+
 def generate_post(inp: CopyInput) -> PostDraft: # generate platform‑specific content for each day.
-    b = inp.brief
-    base_cta = "Try it free today"
-
-    if inp.platform == "x":
-        text = f"🚀 {b.name}: {b.goal}. Built for {b.audience}. {base_cta} → link in bio ({inp.dateISO})"
-        return PostDraft(platform="x", text=text, hashtags=_DEF_HASHTAGS["x"], emoji=["🚀"])  # type: ignore
-
-    if inp.platform == "linkedin":
-        text = (
-            f"✨ {b.name} — {b.goal}\n\n"
-            f"For {b.audience}. {b.tone.capitalize()} tone.\n"
-            f"• Draft faster\n• Keep brand voice\n• Collaborate\n\n"
-            f"📈 {base_cta}: visit our site. ({inp.dateISO})"
-        )
-        return PostDraft(platform="linkedin", text=text, hashtags=_DEF_HASHTAGS["linkedin"], emoji=["✨","📈"])  # type: ignore
-
-    if inp.platform == "instagram":
-        text = (
-            f"🎨 {b.name} is here! {b.goal}.\n"
-            f"Made for {b.audience}. ⚡ {base_cta}. ({inp.dateISO})"
-        )
-        return PostDraft(platform="instagram", text=text, hashtags=_DEF_HASHTAGS["instagram"], emoji=["🎨","⚡"])  # type: ignore
-
-    # Fallback (should not happen)
-    return PostDraft(platform=inp.platform, text=f"{b.name} — {inp.theme} ({inp.dateISO})")
+    return compile_templates(inp.brief).render(inp.platform, inp.theme, inp.dateISO)
 
 # Purpose: generate platform‑specific content for each day.
 #
@@ -56,4 +140,14 @@ def generate_post(inp: CopyInput) -> PostDraft: # generate platform‑specific c
 #
 # What it does: creates short copy with emoji and hashtags for X, a structured, professional post for LinkedIn, and a caption style for Instagram.
 #
+# Templates: each platform's copy is a CopyTemplate in _TEMPLATES, keyed by (platform, theme) with theme=None as
+# the platform default. register_template(platform, text, hashtags, emoji, theme=None) adds or overrides one.
+#
+# compile_templates(brief) -> CompiledTemplates: parses every template once (string.Formatter) and formats the
+# brief's fields in with their conversion/format spec (cached per brief + registry version); literal text,
+# escaped braces included, is re-escaped. render(platform, theme, dateISO) then fills {dateISO}/{theme} in one
+# format pass.
+#
+# render_posts(brief, plan) -> List[PostDraft]: all drafts for a campaign in one call, in plan order.
+#
 # Note: currently template‑based. If you want LLM quality, this is the place to call OpenAI Chat (keep the same PostDraft shape).
\ No newline at end of file
@@ -1,42 +1,182 @@
 from __future__ import annotations
-from typing import List
+from typing import Any, Dict, List, Optional
+from functools import lru_cache
 from pathlib import Path
+from datetime import datetime
+import csv
 import orjson
-import pandas as pd
+from core.lazy import optional_import, require
 from core.schemas import ScheduledPost
 
+# created on first write (every save_* / sink makes its parent folder), not at import
 ARTIFACTS = Path(__file__).resolve().parents[1] / ".." / "artifacts"
-ARTIFACTS.mkdir(parents=True, exist_ok=True)
+
+CSV_COLUMNS = ["campaign", "platform", "text", "mediaUrl", "timestamp", "theme", "dayIndex", "daypart"]
+COLUMNAR_FORMATS = ("parquet", "arrow")
 
 
 def save_json(schedule: List[ScheduledPost], filename: str = "schedule.json") -> str:
+    return save_json_payload([s.model_dump(mode="json") for s in schedule], filename)
+
+
+def save_json_payload(payload, filename: str) -> str:
     p = (ARTIFACTS / filename).resolve()
-    payload = [s.model_dump(mode="json") for s in schedule]
+    p.parent.mkdir(parents=True, exist_ok=True)
     p.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
     return str(p)
 
 
 def save_csv(schedule: List[ScheduledPost], filename: str = "schedule.csv") -> str:
     p = (ARTIFACTS / filename).resolve()
-    df = pd.DataFrame([s.model_dump(mode="json") for s in schedule])
-    rows = []
-    for s in schedule:
-        d = s.model_dump(mode="json")
-        meta = d.pop("meta", {}) or {}
-        d["theme"] = meta.get("theme")
-        d["dayIndex"] = meta.get("dayIndex")
-        d["daypart"] = meta.get("daypart")
-        rows.append(d)
-    df = pd.DataFrame(rows, columns=["campaign", "platform", "text", "mediaUrl", "timestamp", "theme", "dayIndex","daypart"])
+    p.parent.mkdir(parents=True, exist_ok=True)
+    pd = require("pandas")
+    # one pass over the models, no intermediate dumps
+    df = pd.DataFrame([_post_row(s) for s in schedule], columns=CSV_COLUMNS)
 
     df.to_csv(p, index=False)
     return str(p)
 
+
+def _post_row(s: ScheduledPost) -> List[Any]:
+    meta = s.meta or {}
+    return [s.campaign, s.platform, s.text, str(s.mediaUrl), s.timestamp,
+            meta.get("theme"), meta.get("dayIndex"), meta.get("daypart")]
+
+
+class NdjsonSink:
+    def __init__(self, filename: str = "schedule.ndjson"):
+        self.path = (ARTIFACTS / filename).resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("ab")
+
+    def write(self, post: ScheduledPost) -> None:
+        self._f.write(orjson.dumps(post.model_dump(mode="json")) + b"\n")
+        self._f.flush()  # readers tailing the file see each post right away
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink:
+    def __init__(self, filename: str = "schedule_stream.csv"):
+        self.path = (ARTIFACTS / filename).resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new = not self.path.exists() or self.path.stat().st_size == 0
+        self._f = self.path.open("a", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f, lineterminator="\n")
+        if new:
+            self._w.writerow(CSV_COLUMNS)
+
+    def write(self, post: ScheduledPost) -> None:
+        self._w.writerow(_post_row(post))
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+@lru_cache(maxsize=1)
+def arrow_schema():
+    pa = require("pyarrow")
+    return pa.schema([
+        ("campaign", pa.string()),
+        ("platform", pa.dictionary(pa.int8(), pa.string())),
+        ("text", pa.string()),
+        ("mediaUrl", pa.string()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("utcOffsetMinutes", pa.int16()),  # local time = timestamp + offset
+        ("theme", pa.dictionary(pa.int16(), pa.string())),
+        ("dayIndex", pa.int32()),
+        ("daypart", pa.dictionary(pa.int8(), pa.string())),
+    ])
+
+
+class ArrowSink:
+    def __init__(self, filename: str = "schedule.parquet", fmt: str = "parquet", row_group_size: int = 10_000):
+        if optional_import("pyarrow") is None:
+            raise RuntimeError("pyarrow package not installed")
+        if fmt not in ("parquet", "arrow"):
+            raise ValueError(f"Unknown Arrow format: {fmt!r} (expected 'parquet' or 'arrow')")
+        self.path = (ARTIFACTS / filename).resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self.schema = arrow_schema()
+        self._cols: List[List[Any]] = [[] for _ in self.schema]
+        if fmt == "parquet":
+            self._writer = require("pyarrow.parquet").ParquetWriter(self.path, self.schema, compression="zstd")
+        else:
+            self._writer = require("pyarrow.ipc").new_file(str(self.path), self.schema)
+
+    def write(self, post: ScheduledPost) -> None:
+        ts = datetime.fromisoformat(post.timestamp)
+        meta = post.meta or {}
+        row = (post.campaign, post.platform, post.text, str(post.mediaUrl), ts,
+               int(ts.utcoffset().total_seconds() // 60) if ts.utcoffset() else 0,
+               meta.get("theme"), meta.get("dayIndex"), meta.get("daypart"))
+        for col, v in zip(self._cols, row):
+            col.append(v)
+        if len(self._cols[0]) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._cols[0]:
+            return
+        pa = require("pyarrow")
+        batch = pa.record_batch(
+            [pa.array(col, type=f.type) for col, f in zip(self._cols, self.schema)], schema=self.schema)
+        self._writer.write_batch(batch)  # one row group / record batch
+        self._cols = [[] for _ in self.schema]
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_parquet(schedule: List[ScheduledPost], filename: str = "schedule.parquet", row_group_size: int = 10_000) -> str:
+    with ArrowSink(filename, "parquet", row_group_size) as sink:
+        for s in schedule:
+            sink.write(s)
+    return str(sink.path)
+
+
+def save_arrow(schedule: List[ScheduledPost], filename: str = "schedule.arrow", row_group_size: int = 10_000) -> str:
+    with ArrowSink(filename, "arrow", row_group_size) as sink:
+        for s in schedule:
+            sink.write(s)
+    return str(sink.path)
+
+
+def save_columnar(schedule: List[ScheduledPost], fmt: str, filename: Optional[str] = None) -> str:
+    # what the runners' --format option calls: schedule.parquet or schedule.arrow unless a filename is given
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown Arrow format: {fmt!r} (expected 'parquet' or 'arrow')")
+    save = save_parquet if fmt == "parquet" else save_arrow
+    return save(schedule, filename or f"schedule.{fmt}")
+
 # Purpose: save outputs for inspection or downstream use.
 #
 # Constants:
 #
-# ARTIFACTS: .../artifacts directory; created if missing.
+# ARTIFACTS: .../artifacts directory; created by the first write (importing this module touches no files).
+#
+# pandas and pyarrow are imported on first use (save_csv / ArrowSink), not with the module.
 #
 # Functions:
 #
@@ -44,12 +184,34 @@ def save_csv(schedule: List[ScheduledPost], filename: str = "schedule.csv") -> s
 #
 # Why: export a machine‑readable schedule you can diff, test, or feed to another system.
 #
-# What it does: serializes each ScheduledPost to JSON and pretty‑prints to the artifacts folder.
+# What it does: serializes each ScheduledPost to JSON and pretty‑prints to the artifacts folder (filename may include subfolders, e.g. batch/<id>/schedule.json).
+#
+# save_json_payload(payload, filename) -> str: same, for any JSON-serializable payload (e.g. batch summaries).
 #
 # save_csv(schedule: List[ScheduledPost], filename="schedule.csv") -> str
 #
 # Why: friendly for spreadsheets, PMs, and quick reviews.
 #
-# What it does: converts to a DataFrame and writes CSV.
+# What it does: builds rows straight from the models (no model_dump) and writes CSV.
+#
+# (Optional improvement you applied): flatten meta into separate theme, dayIndex, daypart columns for cleaner CSV.
+#
+# NdjsonSink(filename="schedule.ndjson") / CsvSink(filename="schedule_stream.csv")
+#
+# Why: streaming runs write posts as they are produced instead of holding the whole schedule first.
+#
+# What it does: opens the file in append mode (CSV header only when the file is new), writes one post per
+# write() call and flushes, so downstream readers can consume while the campaign is still running.
+#
+# ArrowSink(filename, fmt="parquet" | "arrow", row_group_size=10_000)
+#
+# Why: columnar files are cheap to scan for months of schedules; meta is flattened into typed columns.
+#
+# What it does: buffers column lists from ScheduledPost attributes and writes one row group (Parquet, zstd) or
+# record batch (Arrow IPC) every row_group_size posts; memory stays bounded by the batch. Timestamps are typed
+# (timestamp[us, UTC] + utcOffsetMinutes); platform/theme/daypart are dictionary-encoded. Needs pyarrow.
+#
+# save_parquet(schedule, ...) / save_arrow(schedule, ...) -> str: one-shot wrappers around ArrowSink.
 #
-# (Optional improvement you applied): flatten meta into separate theme, dayIndex, daypart columns for cleaner CSV.
\ No newline at end of file
+# save_columnar(schedule, fmt, filename=None) -> str: either one by name (COLUMNAR_FORMATS); behind the --format
+# option of run / replan / batch (runner/cli.py).
\ No newline at end of file
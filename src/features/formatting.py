@@ -1,38 +1,176 @@
 from __future__ import annotations
+from functools import lru_cache
+from typing import Dict, List, Optional
+import re
+import unicodedata
+from pydantic import BaseModel
 from core.schemas import PostDraft, FormattedPost, Asset
 
-_MAX_X = 280
 
-def apply_platform_rules(draft: PostDraft, asset: Asset) -> FormattedPost:
-    text = draft.text
-    tags = ("\n\n" + " ".join(draft.hashtags)) if draft.hashtags else ""
+class PlatformRules(BaseModel):
+    max_weight: Optional[int] = None  # None = no length limit
+    weighted: bool = False            # X-style weights: 2 for CJK/most non-Latin, 2 per emoji, url_weight per URL
+    url_weight: Optional[int] = None  # fixed weight of a link (t.co wrapping); None = count its characters
+    max_hashtags: Optional[int] = None
+    tag_separator: str = "\n\n"
+    max_blank_lines: Optional[int] = None  # collapse longer runs of empty lines
+    ellipsis: str = "…"
+
+
+PLATFORM_RULES: Dict[str, PlatformRules] = {
+    # twitter-text v3: 280 weighted, URLs count 23
+    "x": PlatformRules(max_weight=280, weighted=True, url_weight=23, max_hashtags=3, max_blank_lines=1),
+    "linkedin": PlatformRules(max_weight=3000, max_hashtags=5, max_blank_lines=1),
+    "instagram": PlatformRules(max_weight=2200, max_hashtags=30, max_blank_lines=1),
+}
+_DEFAULT_RULES = PlatformRules()
+
+
+def register_platform_rules(platform: str, rules: PlatformRules) -> None:
+    PLATFORM_RULES[platform] = rules
+
+
+def get_platform_rules(platform: str) -> PlatformRules:
+    return PLATFORM_RULES.get(platform, _DEFAULT_RULES)
+
+
+# Extended grapheme clusters, close enough for social copy: base + combining marks / variation selectors /
+# skin tones / tag sequences, ZWJ-joined emoji, regional-indicator flag pairs, CRLF.
+_EXTEND = (
+    "\u0300-\u036f\u0483-\u0489\u0591-\u05bd\u0610-\u061a\u064b-\u065f\u0900-\u0903\u093a-\u094f"
+    "\u0e31\u0e34-\u0e3a\u0e47-\u0e4e\u1ab0-\u1aff\u1dc0-\u1dff\u200c\u20d0-\u20ff\ufe00-\ufe0f\ufe20-\ufe2f"
+    "\U0001f3fb-\U0001f3ff\U000e0020-\U000e007f\U000e0100-\U000e01ef"
+)
+_CLUSTER = rf"[\U0001f1e6-\U0001f1ff]{{2}}|[^\r\n][{_EXTEND}]*(?:\u200d[^\r\n][{_EXTEND}]*)*"
+# printable-ASCII runs (weight = length, safe to cut anywhere) are taken whole; the run stops before a URL
+# and leaves its last character to the cluster branch if a combining mark follows it
+_ASCII_RUN = rf"(?:(?!https?://)[\x20-\x7e])+(?![{_EXTEND}\u200d])"
+_TOKEN_RE = re.compile(
+    rf"(?P<url>https?://[^\s]+)|(?P<ascii>{_ASCII_RUN})|(?P<nl>\r\n|\r|\n)|(?P<g>{_CLUSTER})", re.DOTALL)
+
+# twitter-text: code points in these ranges weigh 1, everything else 2
+_LIGHT = ((0x0000, 0x10FF), (0x2000, 0x200D), (0x2010, 0x201F), (0x2032, 0x2037))
+
+
+def _is_emoji(g: str) -> bool:
+    cp = ord(g[0])
+    return cp >= 0x1F000 or 0x2600 <= cp <= 0x27BF or "\ufe0f" in g or "\u200d" in g
+
 
-    if draft.platform == "x":
-        full = text + tags
-        if len(full) > _MAX_X:
-            full = full[: _MAX_X - 1] + "…"
-        text = full
-    elif draft.platform in ("linkedin", "instagram"):
-        text = text + tags
+@lru_cache(maxsize=4096)
+def _x_weight(g: str) -> int:
+    if _is_emoji(g):
+        return 2
+    return sum(1 if any(lo <= ord(c) <= hi for lo, hi in _LIGHT) else 2 for c in g)
 
+
+def grapheme_weight(g: str, rules: PlatformRules) -> int:
+    if not rules.weighted or (len(g) == 1 and g < "\u1100"):
+        return 1
+    return _x_weight(g)
+
+
+def _hashtags(tags: List[str], cap: Optional[int]) -> List[str]:
+    out: List[str] = []
+    seen = set()
+    for t in tags:
+        t = "".join(t.split())
+        if not t:
+            continue
+        if not t.startswith("#"):
+            t = "#" + t
+        if t.lower() in seen:
+            continue
+        seen.add(t.lower())
+        out.append(t)
+        if cap is not None and len(out) >= cap:
+            break
+    return out
+
+
+def _fits_as_is(full: str, rules: PlatformRules, max_breaks: Optional[int]) -> bool:
+    # cheap upper bounds that make the token walk unnecessary for typical posts
+    if "\r" in full or (max_breaks is not None and "\n" * (max_breaks + 1) in full):
+        return False
+    if rules.max_weight is None:
+        return True
+    if not rules.weighted:
+        return len(full) <= rules.max_weight  # code points >= grapheme clusters
+    if rules.url_weight is not None and "://" in full:
+        return False
+    return (len(full) if full.isascii() else 2 * len(full)) <= rules.max_weight
+
+
+def format_text(text: str, hashtags: List[str], rules: PlatformRules) -> str:
+    tags = _hashtags(hashtags, rules.max_hashtags)
+    full = text + rules.tag_separator + " ".join(tags) if tags else text
+    if not full.isascii():
+        # composed form, as twitter-text counts it: a decomposed "é" (e + U+0301) would weigh 2 instead of 1
+        full = unicodedata.normalize("NFC", full)
+
+    limit = rules.max_weight
+    room = None if limit is None else limit - sum(grapheme_weight(g, rules) for g in rules.ellipsis)
+    max_breaks = None if rules.max_blank_lines is None else rules.max_blank_lines + 1
+    if _fits_as_is(full, rules, max_breaks):
+        return full
+    pieces: List[str] = []
+    weight = 0
+    keep = None  # (pieces, ascii prefix) that still fit in front of an ellipsis
+    breaks = 0
+    for m in _TOKEN_RE.finditer(full):
+        kind = m.lastgroup
+        tok = m.group()
+        if kind == "nl":
+            breaks += 1
+            if max_breaks is not None and breaks > max_breaks:
+                continue
+            tok = "\n"
+            w = 1
+        else:
+            breaks = 0
+            if kind == "ascii":
+                w = len(tok)
+            elif kind == "url" and rules.url_weight is not None:
+                w = rules.url_weight
+            elif kind == "url":
+                w = sum(grapheme_weight(c, rules) for c in tok)
+            else:
+                w = grapheme_weight(tok, rules)
+        if room is not None and keep is None and weight + w > room:
+            keep = (len(pieces), tok[: room - weight] if kind == "ascii" else "")
+        weight += w
+        if limit is not None and weight > limit:
+            return "".join(pieces[: keep[0]]) + keep[1] + rules.ellipsis
+        pieces.append(tok)
+    return "".join(pieces)
+
+
+def apply_platform_rules(draft: PostDraft, asset: Asset) -> FormattedPost:
+    text = format_text(draft.text, draft.hashtags, get_platform_rules(draft.platform))
     return FormattedPost(platform=draft.platform, text=text, media=asset)  # type: ignore
 
 # Purpose: enforce platform constraints and finalize the text for publishing.
 #
-# Constants:
+# Rule table:
 #
-# _MAX_X = 280 characters.
+# PLATFORM_RULES: platform → PlatformRules (length limit, weighted counting, URL weight, hashtag cap,
+# separator before hashtags, blank-line cap, ellipsis). register_platform_rules() adds or overrides one;
+# unknown platforms get no limits.
 #
-# Function:
+# X: 280 weighted (twitter-text: ASCII/Latin 1, CJK and most other scripts 2, any emoji sequence 2, URL 23), 3 tags.
+# LinkedIn: 3000 characters, 5 tags. Instagram: 2200 characters, 30 tags (the platform maximum).
 #
-# apply_platform_rules(draft: PostDraft, asset: Asset) -> FormattedPost
+# Functions:
 #
-# Why: avoid platform rejections and keep copy tidy.
+# format_text(text, hashtags, rules) -> str
 #
 # What it does:
 #
-# X: concatenates text + hashtags; truncates to 280 with ellipsis if needed.
-#
-# LinkedIn/IG: appends hashtags; keeps multi‑paragraph copy.
+# Normalizes hashtags (leading '#', no spaces, case-insensitive de-dupe, cap), appends them, NFC-normalizes
+# non-ASCII text (so decomposed accents weigh what their composed form does, as in twitter-text), then walks the
+# result once as tokens (URL | printable-ASCII run | line break | grapheme cluster): collapses blank-line runs, adds up weights and,
+# when the limit is crossed, cuts at the last token that leaves room for the ellipsis — never inside an emoji,
+# ZWJ sequence, flag or URL. The output string is built with a single join. Posts whose length bound already
+# fits (the common case) skip the walk.
 #
-# Attaches the asset so we have a complete FormattedPost.
\ No newline at end of file
+# apply_platform_rules(draft: PostDraft, asset: Asset) -> FormattedPost: format_text + attach the asset.
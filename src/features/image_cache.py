@@ -0,0 +1,194 @@
+from __future__ import annotations
+from functools import lru_cache
+from multiprocessing import util as mp_util
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from .config import get_settings
+
+_INDEX = "index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    key      TEXT PRIMARY KEY,
+    file     TEXT NOT NULL,
+    bytes    INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS images_accessed ON images (accessed);
+"""
+
+
+def _norm(s: Optional[str]) -> str:
+    return " ".join(s.split()) if s else ""
+
+
+def cache_key(prompt: str, style: Optional[str], seed: Optional[int], provider: str, model: str, size: str) -> str:
+    raw = "\x1f".join([_norm(prompt), _norm(style), "" if seed is None else str(seed), provider, model, size])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    TOUCH_EVERY = 64  # hits whose access times are buffered before one UPDATE transaction
+
+    def __init__(self, root: Path, max_bytes: int, max_age_s: float):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._touched: Dict[str, float] = {}  # key → last hit not yet written to the index
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        # buffered access times are written at interpreter exit, pool worker processes included
+        mp_util.Finalize(self, self.flush, exitpriority=10)
+
+    # index (shared by every process using this root)
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None or self._pid != os.getpid():
+            # a forked batch worker opens its own connection instead of sharing the parent's
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.root / _INDEX), check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            self._pid = os.getpid()
+            self._touched.clear()
+        return self._db
+
+    def _flush(self) -> None:
+        if not self._touched:
+            return
+        conn = self._conn()
+        with conn:
+            conn.executemany("UPDATE images SET accessed = max(accessed, ?) WHERE key = ?",
+                             [(t, k) for k, t in self._touched.items()])
+        self._touched.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._db is not None and self._pid == os.getpid():
+                self._flush()
+
+    def lock_for(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"asset_{key[:16]}.png"
+
+    # lookups
+    def get(self, key: str) -> Optional[Path]:
+        with self._lock:
+            conn = self._conn()
+            row = conn.execute("SELECT file, created FROM images WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is not None:
+                p = self.root / row[0]
+                if now - row[1] <= self.max_age_s and p.exists():
+                    # access times only order LRU eviction: written in batches, not on every hit
+                    self._touched[key] = now
+                    if len(self._touched) >= self.TOUCH_EVERY:
+                        self._flush()
+                    self.hits += 1
+                    return p
+                with conn:
+                    self._drop(conn, [(key, row[0])])
+            self.misses += 1
+            return None
+
+    def put(self, key: str, data: bytes) -> Path:
+        with self._lock:
+            conn = self._conn()
+            p = self.path_for(key)
+            p.write_bytes(data)
+            now = time.time()
+            self._touched.pop(key, None)
+            self._flush()  # eviction below orders by access time
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?)",
+                             (key, p.name, len(data), now, now))
+                self._evict(conn, now, keep=key)
+            return p
+
+    # eviction
+    def _drop(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        conn.executemany("DELETE FROM images WHERE key = ?", [(k,) for k, _ in rows])
+        for k, file in rows:
+            self._touched.pop(k, None)
+            try:
+                (self.root / file).unlink()
+            except FileNotFoundError:
+                pass
+        self.evictions += len(rows)
+
+    def _evict(self, conn: sqlite3.Connection, now: float, keep: Optional[str] = None) -> None:
+        self._drop(conn, conn.execute("SELECT key, file FROM images WHERE created < ?",
+                                      (now - self.max_age_s,)).fetchall())
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM images").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # least recently used first
+        victims = []
+        for k, file, size in conn.execute("SELECT key, file, bytes FROM images ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            if k == keep:
+                continue
+            total -= size
+            victims.append((k, file))
+        self._drop(conn, victims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM images").fetchone()
+            return {
+                "entries": entries,
+                "bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_image_cache() -> ImageCache:
+    s = get_settings()
+    root = Path(__file__).resolve().parents[1] / ".." / "artifacts" / "images"
+    return ImageCache(root, max_bytes=s.image_cache_max_mb * 1024 * 1024, max_age_s=s.image_cache_max_age_days * 86400)
+
+# Purpose: skip image generation when the exact same image was already made.
+#
+# Functions/Classes:
+#
+# cache_key(prompt, style, seed, provider, model, size) -> str
+#
+# Why: content-addressed lookup; whitespace in prompt/style is normalized so trivial edits still hit.
+#
+# ImageCache(root, max_bytes, max_age_s)
+#
+# Index: artifacts/images/index.sqlite (WAL), one row per image with size, created and last-access time. Shared
+# by every process on the host, so batch workers see each other's images and evict by the same LRU order instead
+# of overwriting each other's index.
+#
+# lock_for(key): per-key lock so concurrent workers asking for the same image generate it once.
+#
+# get(key) -> Path | None: returns the cached PNG or counts a miss. Hits only buffer their access time; the
+# buffer is written every TOUCH_EVERY hits, before each put and at process exit.
+#
+# put(key, data) -> Path: writes artifacts/images/asset_<key>.png, records it, then (same transaction) evicts
+# entries older than max_age_s and least-recently-used entries until the total fits in max_bytes.
+#
+# stats(): entries and bytes in the index; hits, misses, evictions for this process.
+#
+# get_image_cache() -> ImageCache
+#
+# Why: one cache (and one lock) per process, sized from settings (image_cache_max_mb / image_cache_max_age_days).
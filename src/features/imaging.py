@@ -0,0 +1,83 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+import os
+from core.lazy import require
+
+# (width, height, format, quality, out_path) — plain tuples, so jobs pickle cheaply to pool workers
+Target = Tuple[int, int, str, int, str]
+
+PLACEHOLDER_BG = (221, 221, 221)
+PLACEHOLDER_FG = (150, 150, 150)
+
+
+def _cover_box(src_w: int, src_h: int, w: int, h: int) -> Tuple[float, float, float, float]:
+    # largest centered box with the target aspect ratio
+    if src_w * h > src_h * w:
+        bw = src_h * w / h
+        return ((src_w - bw) / 2, 0, (src_w + bw) / 2, src_h)
+    bh = src_w * h / w
+    return (0, (src_h - bh) / 2, src_w, (src_h + bh) / 2)
+
+
+def _fit(im, w: int, h: int):
+    Image = require("PIL.Image", "pillow")
+    box = _cover_box(im.width, im.height, w, h)
+    bw = box[2] - box[0]
+    if bw < w:  # never upscale: keep the aspect, stop at the source's resolution
+        w, h = max(1, round(bw)), max(1, round(bw * h / w))
+    return im.resize((w, h), Image.LANCZOS, box=box, reducing_gap=3.0)
+
+
+def _wrap(draw, text: str, font, max_w: float) -> str:
+    lines: List[str] = []
+    for word in text.split():
+        if lines and draw.textlength(f"{lines[-1]} {word}", font=font) <= max_w:
+            lines[-1] += f" {word}"
+        else:
+            lines.append(word)
+    return "\n".join(lines)
+
+
+def _placeholder(label: str, w: int, h: int):
+    Image = require("PIL.Image", "pillow")
+    ImageDraw = require("PIL.ImageDraw", "pillow")
+    ImageFont = require("PIL.ImageFont", "pillow")
+    im = Image.new("RGB", (w, h), PLACEHOLDER_BG)
+    draw = ImageDraw.Draw(im)
+    font = ImageFont.load_default(size=max(12, min(w, h) // 14))
+    draw.multiline_text((w / 2, h / 2), _wrap(draw, label, font, w * 0.85), fill=PLACEHOLDER_FG, font=font,
+                        anchor="mm", align="center")
+    return im
+
+
+def _save(im, fmt: str, quality: int, out: str) -> None:
+    tmp = f"{out}.{os.getpid()}.tmp"
+    if fmt == "jpeg":
+        im.save(tmp, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        im.save(tmp, "WEBP", quality=quality, method=4)
+    os.replace(tmp, out)  # readers never see a half-written file
+
+
+def render(source: Optional[str], label: Optional[str], targets: Sequence[Target]) -> List[str]:
+    """All renditions of one input: the source is decoded once (or the placeholder drawn per size) and encoded per target."""
+    Image = require("PIL.Image", "pillow")
+    Path(targets[0][4]).parent.mkdir(parents=True, exist_ok=True)
+    im = None
+    if source is not None:
+        with Image.open(source) as f:
+            im = f.convert("RGB")  # decode once
+    out = []
+    for w, h, fmt, quality, path in targets:
+        _save(_fit(im, w, h) if im is not None else _placeholder(label or "", w, h), fmt, quality, path)
+        out.append(path)
+    return out
+
+# Purpose: the CPU-bound image work behind features/renditions.py, kept free of pydantic/settings so pool workers
+# only need Pillow.
+#
+# render(source, label, targets): decodes a generated image once, then for each (w, h, format, quality, path)
+# cover-crops around the center, downsizes (LANCZOS with reducing_gap; never upscales) and encodes JPEG
+# (progressive, optimized) or WebP. With no source it draws a placeholder (grey card with the label) at each
+# size instead — the local stand-in for placehold.co. Writes go through a temp file + os.replace.
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pydantic import BaseModel
 from core.schemas import CampaignBrief
+from functools import lru_cache
 import re
 
 class ParseInput(BaseModel):
@@ -14,10 +15,26 @@ TONE_MAP = {
     "authoritative": "authoritative",
 }
 
+# compiled once at import; tone alternation is built from TONE_MAP
+_NAME_RE = re.compile(r"for (?:a|an|the)?\s*(new\s+)?(?P<name>[^.]+?)(?:\.|,|$)", re.IGNORECASE)
+_DAYS_RE = re.compile(r"(\d+)[- ]?day", re.IGNORECASE)
+_TZ_RE = re.compile(r"in\s+([A-Za-z_\/]+)")
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+# tones, audiences and "launch" can never overlap each other, so one finditer sees every occurrence
+_KEYWORDS_RE = re.compile(
+    r"\b(?P<tone>" + "|".join(map(re.escape, TONE_MAP)) + r")\b"
+    r"|(?P<creators>creators?)|(?P<marketers>marketers?)|(?P<launch>launch)",
+    re.IGNORECASE,
+)
+
 def parse_brief(inp: ParseInput) -> CampaignBrief:
-    p = inp.prompt
+    # repeated prompts (batch runs, retries) are served from the memo; copy so callers can't share state
+    return _parse_prompt(inp.prompt).model_copy()
+
+@lru_cache(maxsize=4096)
+def _parse_prompt(p: str) -> CampaignBrief:
     # naive extraction; robust NLP can replace this
-    name_match = re.search(r"for (?:a|an|the)?\s*(new\s+)?(?P<name>[^.]+?)(?:\.|,|$)", p, re.IGNORECASE)
+    name_match = _NAME_RE.search(p)
     name = None
     if name_match:
         name = name_match.group("name").strip()
@@ -25,42 +42,52 @@ def parse_brief(inp: ParseInput) -> CampaignBrief:
     if not name:
         name = "Unnamed Campaign"
 
-    # tone
-    tone = "professional"
-    for t in TONE_MAP:
-        if re.search(rf"\b{t}\b", p, re.IGNORECASE):
-            tone = TONE_MAP[t]
-            break
+    # tone / audience / goal keywords in a single scan
+    tones = set()
+    creators = marketers = launch = False
+    for m in _KEYWORDS_RE.finditer(p):
+        kind = m.lastgroup
+        if kind == "tone":
+            tones.add(m.group("tone").lower())
+        elif kind == "creators":
+            creators = True
+        elif kind == "marketers":
+            marketers = True
+        else:
+            launch = True
+
+    # tone: first TONE_MAP entry mentioned, not first by position
+    tone = next((TONE_MAP[t] for t in TONE_MAP if t in tones), "professional")
 
     # days
     days = 7
-    m = re.search(r"(\d+)[- ]?day", p, re.IGNORECASE)
+    m = _DAYS_RE.search(p)
     if m:
         days = int(m.group(1))
 
     # timezone
     tz = "Asia/Karachi"
-    m = re.search(r"in\s+([A-Za-z_\/]+)", p)
+    m = _TZ_RE.search(p)
     if m and "/" in m.group(1):
         tz = m.group(1)
 
     # start date
     start = None
-    m = re.search(r"(\d{4}-\d{2}-\d{2})", p)
+    m = _DATE_RE.search(p)
     if m:
         start = m.group(1)
 
     # audience / goal (simple heuristics)
     audience = "general audience"
-    if re.search(r"creators?", p, re.IGNORECASE) and re.search(r"marketers?", p, re.IGNORECASE):
+    if creators and marketers:
         audience = "creators & marketers"
-    elif re.search(r"creators?", p, re.IGNORECASE):
+    elif creators:
         audience = "creators"
-    elif re.search(r"marketers?", p, re.IGNORECASE):
+    elif marketers:
         audience = "marketers"
 
     goal = "campaign"
-    if re.search(r"launch", p, re.IGNORECASE):
+    if launch:
         goal = "product launch campaign"
 
     # name cleanup if we matched too much
@@ -91,6 +118,9 @@ def parse_brief(inp: ParseInput) -> CampaignBrief:
 #
 # Heuristically extracts name, tone, days, timezone, start date, audience, goal using regex patterns.
 #
+# The patterns are compiled once at import; tone, audience and "launch" keywords come from one combined scan
+# (_KEYWORDS_RE, built from TONE_MAP), and results are memoized per prompt (_parse_prompt, LRU of 4096).
+#
 # Applies sensible defaults (7 days, Asia/Karachi, professional tone) if fields are missing.
 #
 # Outputs: a valid CampaignBrief Pydantic object.
\ No newline at end of file
@@ -0,0 +1,183 @@
+from __future__ import annotations
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import hashlib
+import sqlite3
+import threading
+import orjson
+from core.instrumentation import timed
+from core.lazy import require
+from core.schemas import CampaignBrief, PlanItem, PostDraft
+from .config import get_settings
+from .copygen import compile_templates, render_posts
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+_SYSTEM = (
+    "You write social media posts for a marketing campaign. For every item return a post tuned to its platform "
+    "(x: under 240 characters; linkedin: a few short paragraphs; instagram: a caption). Do not mention dates. "
+    'Reply with JSON: {"posts": [{"id": <item id>, "text": <post>, "hashtags": [<up to 3 hashtags>]}]}'
+)
+_OUT_TOKENS_PER_POST = 160
+
+
+def copy_key(brief: CampaignBrief, theme: str, platform: str, model: str) -> str:
+    raw = "\x1f".join([brief.name, brief.goal, brief.audience, brief.tone, theme, platform, model])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class CopyCache:
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS copy (key TEXT PRIMARY KEY, draft BLOB NOT NULL)")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, PostDraft]:
+        if not keys:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, draft FROM copy WHERE key IN ({','.join('?' * len(keys))})", keys).fetchall()
+        found = {k: PostDraft.model_validate_json(d) for k, d in rows}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, PostDraft]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO copy (key, draft) VALUES (?, ?)",
+                                   [(k, d.model_dump_json()) for k, d in items.items()])
+
+
+@lru_cache(maxsize=1)
+def get_copy_cache() -> CopyCache:
+    return CopyCache(Path(get_settings().copy_cache_path))
+
+
+@lru_cache(maxsize=1)
+def _client() -> "OpenAI":
+    # one pooled client per process
+    s = get_settings()
+    sdk, httpx = require("openai"), require("httpx")
+    if not s.openai_api_key:
+        raise RuntimeError("OPENAI_API_KEY not configured")
+    return sdk.OpenAI(api_key=s.openai_api_key, base_url=s.openai_base_url, max_retries=2, timeout=s.copy_timeout_s,
+                      http_client=sdk.DefaultHttpxClient(
+                          limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)))
+
+
+class LLMCopyProvider:
+    def __init__(self, model: str, batch_days: int, token_budget: int):
+        self.model = model
+        self.batch_days = max(1, batch_days)
+        self.token_budget = token_budget  # per generate() call, i.e. per campaign
+        # lifetime totals across campaigns; one provider is shared by the job service's worker threads
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.tokens_used = 0
+
+    def _request(self, brief: CampaignBrief, items: List[Tuple[str, str, str]]) -> Tuple[Dict[str, PostDraft], int]:
+        # items: (key, theme, platform) — one chat call for the whole window; returns the drafts and tokens spent
+        ids = {str(i): key for i, (key, _, _) in enumerate(items)}
+        user = orjson.dumps({
+            "brief": brief.model_dump(include={"name", "goal", "audience", "tone"}),
+            "items": [{"id": str(i), "platform": p, "theme": t} for i, (_, t, p) in enumerate(items)],
+        }).decode()
+        with timed("provider", f"copy:{self.model}", items=len(items)):
+            resp = _client().chat.completions.create(
+                model=self.model,
+                messages=[{"role": "system", "content": _SYSTEM}, {"role": "user", "content": user}],
+                response_format={"type": "json_object"},
+                max_tokens=_OUT_TOKENS_PER_POST * len(items),
+            )
+        tokens = resp.usage.total_tokens if resp.usage else _estimate_tokens(user) + _OUT_TOKENS_PER_POST * len(items)
+        with self._lock:
+            self.requests += 1
+            self.tokens_used += tokens
+        platform_of = {key: p for key, _, p in items}
+        out: Dict[str, PostDraft] = {}
+        for post in orjson.loads(resp.choices[0].message.content or "{}").get("posts", []):
+            key = ids.get(str(post.get("id")))
+            if key and post.get("text"):
+                out[key] = PostDraft(platform=platform_of[key], text=post["text"], hashtags=post.get("hashtags") or [])
+        return out, tokens
+
+    def generate(self, brief: CampaignBrief, plan: List[PlanItem]) -> List[PostDraft]:
+        templates = compile_templates(brief)
+        cache = get_copy_cache()
+        slots = [(item, p, copy_key(brief, item.theme, p, self.model)) for item in plan for p in item.platforms]
+        drafts: Dict[str, PostDraft] = cache.get_many(sorted({k for _, _, k in slots}))
+
+        used = 0  # this campaign's spend; the budget does not carry over between calls
+        for w in range(0, len(plan), self.batch_days):
+            window = plan[w:w + self.batch_days]
+            todo: Dict[str, Tuple[str, str, str]] = {}
+            for item in window:
+                for p in item.platforms:
+                    key = copy_key(brief, item.theme, p, self.model)
+                    if key not in drafts:
+                        todo.setdefault(key, (key, item.theme, p))  # identical requests go out once
+            if not todo:
+                continue
+            cost = _estimate_tokens(_SYSTEM) + 40 * len(todo) + _OUT_TOKENS_PER_POST * len(todo)
+            if used + cost > self.token_budget:
+                break  # out of budget: the rest stays on templates
+            try:
+                fresh, tokens = self._request(brief, list(todo.values()))
+            except Exception as e:
+                print(f"[copy] LLM request failed, using templates: {type(e).__name__}: {e}")
+                break
+            used += tokens
+            cache.put_many(fresh)
+            drafts.update(fresh)
+
+        return [
+            drafts[k].model_copy(deep=True) if k in drafts else templates.render(p, item.theme, item.dateISO)
+            for item, p, k in slots
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_copy_provider() -> Optional[LLMCopyProvider]:
+    s = get_settings()
+    if s.copy_provider.lower() != "openai":
+        return None
+    return LLMCopyProvider(s.copy_model, s.copy_batch_days, s.copy_token_budget)
+
+
+def generate_campaign_copy(brief: CampaignBrief, plan: List[PlanItem]) -> List[PostDraft]:
+    provider = get_copy_provider()
+    if provider is None:
+        return render_posts(brief, plan)
+    return provider.generate(brief, plan)
+
+# Purpose: LLM-written post copy without one chat call per (day, platform).
+#
+# Key pieces:
+#
+# copy_key(brief, theme, platform, model): cache key; the date is not part of it, so a theme's copy is reused.
+#
+# CopyCache (SQLite, settings.copy_cache_path): persistent key → PostDraft store shared by processes.
+#
+# LLMCopyProvider.generate(brief, plan) -> List[PostDraft]
+#
+# What it does:
+#
+# Looks every slot up in the cache, then walks the plan in windows of copy_batch_days; each window's missing,
+# de-duplicated (theme, platform) pairs go out as ONE chat request (JSON mode) and the answers are cached.
+#
+# Stops calling the API once the estimated next request would exceed copy_token_budget (counted per call, so per
+# campaign, although the provider is a process-wide singleton), or after an error; any slot without LLM copy is
+# rendered from the compiled templates. requests / tokens_used are lifetime totals, updated under a lock.
+#
+# generate_campaign_copy(brief, plan): COPY_PROVIDER=openai → LLM provider; otherwise templates (render_posts).
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import List
+import numpy as np
 import pendulum
 from core.schemas import CampaignBrief, PlanItem, Platform, TimeOfDay
 
@@ -20,26 +21,34 @@ PLATFORM_ROTATION: List[List[Platform]] = [
     ["instagram", "x"],
 ]
 
-def generate_calendar(brief: CampaignBrief) -> List[PlanItem]:
+def _start_date(brief: CampaignBrief) -> np.datetime64:
     tz = brief.timezone
-    start = pendulum.parse(brief.startDate) if brief.startDate else pendulum.now(tz).add(days=1).start_of("day")
-    start = start.in_timezone(tz)
-    plan: List[PlanItem] = []
-    for i in range(brief.days):
-        date = start.add(days=i)
-        theme = THEMES[i % len(THEMES)]
-        platforms = PLATFORM_ROTATION[i % len(PLATFORM_ROTATION)]
-        daypart = DAYPARTS[i % len(DAYPARTS)]
-        plan.append(PlanItem(
+    if not brief.startDate:
+        return np.datetime64(pendulum.now(tz).add(days=1).date().isoformat(), "D")
+    start = pendulum.parse(brief.startDate, exact=True)
+    if isinstance(start, pendulum.DateTime):
+        # a full timestamp: take its calendar date in the campaign timezone
+        start = start.in_timezone(tz).date()
+    return np.datetime64(start.isoformat(), "D")
+
+def generate_calendar(brief: CampaignBrief) -> List[PlanItem]:
+    start = _start_date(brief)
+    # all dates for the horizon in one shot
+    dates = np.arange(start, start + brief.days).astype(str).tolist()
+    nt, npf, nd = len(THEMES), len(PLATFORM_ROTATION), len(DAYPARTS)
+    # values come from our own rotation tables, so skip per-item validation
+    return [
+        PlanItem.model_construct(
             dayIndex=i,
-            dateISO=date.format("YYYY-MM-DD"),
-            theme=theme,
-            platforms=platforms,
-            daypart=daypart,  # type: ignore
-        ))
-    return plan
+            dateISO=date,
+            theme=THEMES[i % nt],
+            platforms=PLATFORM_ROTATION[i % npf],
+            daypart=DAYPARTS[i % nd],
+        )
+        for i, date in enumerate(dates)
+    ]
 
-# Purpose: create a 7‑day content calendar.
+# Purpose: create the content calendar (7 days by default, up to two years).
 #
 # Key data:
 #
@@ -57,8 +66,10 @@ def generate_calendar(brief: CampaignBrief) -> List[PlanItem]:
 #
 # What it does:
 #
-# Computes start date (uses brief.startDate or “tomorrow” in brief.timezone).
+# Computes start date (uses brief.startDate or “tomorrow” in brief.timezone). A date-only startDate is taken
+# as that calendar day; a full timestamp is converted to brief.timezone first.
 #
-# For each day: picks a theme, platforms, and daypart from the rotations; formats the dateISO.
+# Builds every dateISO at once with a NumPy datetime64[D] range (no per-day datetime objects), then picks a
+# theme, platforms, and daypart per day from the rotations. Horizons up to CampaignBrief's max days (730) are fine.
 #
 # Outputs: a list of PlanItem (one per day).
\ No newline at end of file
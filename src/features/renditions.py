@@ -0,0 +1,176 @@
+from __future__ import annotations
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import urllib.parse
+from pydantic import BaseModel
+from core.lazy import optional_import
+from core.schemas import Asset
+from .config import get_settings
+from .imaging import Target, render
+
+
+class RenditionSpec(BaseModel):
+    width: int
+    height: int
+    format: str = "jpeg"  # "jpeg" | "webp"
+    quality: int = 85
+
+
+RENDITIONS: Dict[str, RenditionSpec] = {
+    "x": RenditionSpec(width=1600, height=900, format="webp", quality=80),   # 16:9
+    "linkedin": RenditionSpec(width=1200, height=627),                        # 1.91:1
+    "instagram": RenditionSpec(width=1080, height=1350),                      # 4:5 portrait, JPEG only
+}
+
+_PLACEHOLDER_HOST = "placehold.co"
+
+
+def register_rendition(platform: str, spec: RenditionSpec) -> None:
+    RENDITIONS[platform] = spec
+
+
+def renditions_available() -> bool:
+    s = get_settings()
+    return s.renditions_enabled and optional_import("PIL.Image") is not None
+
+
+def _source(asset: Asset) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    # (cache identity, local file to decode, placeholder label); None = nothing we can render locally
+    url = str(asset.url)
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme == "file":
+        path = urllib.parse.unquote(parsed.path)
+        return f"file:{Path(path).name}", path, None  # generated images are content-addressed already
+    if parsed.hostname == _PLACEHOLDER_HOST:
+        label = urllib.parse.parse_qs(parsed.query).get("text", [asset.prompt[:40]])[0]
+        return f"placeholder:{label}", None, label
+    return None
+
+
+def _target(identity: str, spec: RenditionSpec) -> Target:
+    raw = f"{identity}\x1f{spec.width}x{spec.height}\x1f{spec.format}\x1f{spec.quality}"
+    key = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    ext = "jpg" if spec.format == "jpeg" else spec.format
+    out = Path(get_settings().renditions_path) / f"{key[:20]}.{ext}"
+    return spec.width, spec.height, spec.format, spec.quality, str(out)
+
+
+_workers: Optional[int] = None  # set_rendition_workers(); None = settings.rendition_workers
+
+
+def set_rendition_workers(n: int) -> None:
+    """Encoder processes for this process: 0 = CPU count, -1 = encode on the calling thread, no pool."""
+    global _workers
+    _workers = n
+    _pool.cache_clear()
+
+
+def _worker_count() -> int:
+    n = get_settings().rendition_workers if _workers is None else _workers
+    return n if n != 0 else (os.cpu_count() or 1)
+
+
+@lru_cache(maxsize=1)
+def _pool() -> ProcessPoolExecutor:
+    # spawned, not forked: the pool starts from one of the graph's worker threads, and a fork there can copy a
+    # lock another thread holds; workers only import features.imaging
+    return ProcessPoolExecutor(max_workers=_worker_count(), mp_context=multiprocessing.get_context("spawn"))
+
+
+def _plan(assets: Sequence[Asset], platforms: Sequence[Sequence[str]]):
+    """Per asset {platform: target}, plus one job per distinct source holding only the files not on disk yet."""
+    wanted: List[Dict[str, Target]] = []
+    jobs: Dict[str, Tuple[Optional[str], Optional[str], Dict[str, Target]]] = {}
+    for asset, plats in zip(assets, platforms):
+        src = _source(asset)
+        per: Dict[str, Target] = {}
+        if src is not None:
+            identity, path, label = src
+            for p in plats:
+                spec = RENDITIONS.get(p)
+                if spec is None:
+                    continue
+                t = per[p] = _target(identity, spec)
+                if not os.path.exists(t[4]):
+                    jobs.setdefault(identity, (path, label, {}))[2][t[4]] = t
+        wanted.append(per)
+    return wanted, [(path, label, list(targets.values())) for path, label, targets in jobs.values()]
+
+
+def _assets(assets: Sequence[Asset], wanted: List[Dict[str, Target]]) -> List[Dict[str, Asset]]:
+    return [
+        {p: Asset(id=f"{a.id}_{p}", url=Path(t[4]).resolve().as_uri(), prompt=a.prompt) for p, t in per.items()
+         if os.path.exists(t[4])}  # a failed encode leaves the platform on the original asset
+        for a, per in zip(assets, wanted)
+    ]
+
+
+def _report(job, exc: BaseException) -> None:
+    print(f"[renditions] failed for {job[0] or job[1]}: {type(exc).__name__}: {exc}")
+
+
+def render_renditions(assets: Sequence[Asset], platforms: Sequence[Sequence[str]]) -> List[Dict[str, Asset]]:
+    """For each asset, {platform: Asset} pointing at that platform's rendition (missing platforms keep the original)."""
+    if not renditions_available():
+        return [{} for _ in assets]
+    wanted, jobs = _plan(assets, platforms)
+    if not jobs:
+        return _assets(assets, wanted)
+    if _worker_count() < 0:
+        for job in jobs:
+            try:
+                render(*job)
+            except Exception as e:
+                _report(job, e)
+        return _assets(assets, wanted)
+    # encoding holds the GIL, so even a single job goes to the pool: the graph's day branches are threads
+    futures: List[Future] = [_pool().submit(render, *job) for job in jobs]
+    for job, fut in zip(jobs, futures):
+        try:
+            fut.result()
+        except Exception as e:
+            _report(job, e)
+    return _assets(assets, wanted)
+
+
+async def arender_renditions(assets: Sequence[Asset], platforms: Sequence[Sequence[str]]) -> List[Dict[str, Asset]]:
+    if not renditions_available():
+        return [{} for _ in assets]
+    wanted, jobs = await asyncio.to_thread(_plan, assets, platforms)
+    loop = asyncio.get_running_loop()
+    pool = _pool() if jobs and _worker_count() > 0 else None  # None = the loop's default thread pool
+    results = await asyncio.gather(*(loop.run_in_executor(pool, render, *job) for job in jobs),
+                                   return_exceptions=True)
+    for job, r in zip(jobs, results):
+        if isinstance(r, Exception):
+            _report(job, r)
+    return _assets(assets, wanted)
+
+# Purpose: one image per platform instead of one 1024x576 PNG everywhere.
+#
+# Rule table:
+#
+# RENDITIONS: platform → RenditionSpec(width, height, format, quality). X 1600x900 WebP, LinkedIn 1200x627 JPEG,
+# Instagram 1080x1350 JPEG (4:5; the Graph API only takes JPEG). register_rendition() adds or overrides one.
+#
+# render_renditions(assets, platforms) -> List[{platform: Asset}]
+#
+# What it does:
+#
+# Generated images (file:// URLs) are cropped/resized from the decoded original; placehold.co placeholders are
+# drawn locally with the same label; other remote URLs are left as they are. Renditions are files under settings.renditions_path named by a hash of
+# (source, size, format, quality), so reruns and repeated themes reuse them; only missing files are rendered.
+#
+# Missing files are grouped per source (decoded once for all its platforms) and encoded on a spawn-context process
+# pool (settings.rendition_workers, 0 = CPU count), started on first use, so encoding never competes with the
+# graph's threads for the GIL. set_rendition_workers(n) overrides the size for this process; -1 encodes inline,
+# which is what batch worker processes use (they already run one per core).
+# A failed encode or a platform without a spec keeps the original asset. No-op when RENDITIONS_ENABLED=false or Pillow isn't installed.
+#
+# arender_renditions: same for the graph's ainvoke path (pool futures awaited on the loop).
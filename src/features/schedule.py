@@ -1,8 +1,14 @@
 from __future__ import annotations
-from typing import List
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from bisect import bisect_left
+import heapq
+import numpy as np
 import pendulum
+from pydantic import BaseModel
 from core.schemas import FormattedPost, ScheduledPost, PlanItem
-from collections import deque
+from collections import defaultdict, deque
 
 
 _TIME_BY_DAYPART = {
@@ -11,34 +17,268 @@ _TIME_BY_DAYPART = {
     "evening": "18:00",
 }
 
+# offsets of consecutive posts this close together (and equal at both ends) can't hide a tz transition
+_MAX_FLAT_SPAN_DAYS = 14
+
+@lru_cache(maxsize=None)
+def _zone(tz: str):
+    return pendulum.timezone(tz)
+
+@lru_cache(maxsize=None)
+def _daypart_clock(tz: str) -> Dict[str, time]:
+    zone = _zone(tz)
+    clock = {}
+    for daypart, t in _TIME_BY_DAYPART.items():
+        h, m = map(int, t.split(":"))
+        clock[daypart] = time(h, m, tzinfo=zone, fold=1)
+    return clock
+
+def _fmt_offset(minutes: int, tz: str) -> str:
+    if minutes == 0 and _zone(tz).name == "UTC":
+        return "Z"
+    sign = "+" if minutes >= 0 else "-"
+    h, m = divmod(abs(minutes), 60)
+    return f"{sign}{h:02d}:{m:02d}"
+
+def _local(date_iso: str, daypart: str, tz: str) -> Tuple[str, int]:
+    # exact wall time + UTC offset (minutes); non-existent times move forward like pendulum does
+    t = _daypart_clock(tz).get(daypart) or _daypart_clock(tz)["morning"]
+    dt = datetime.combine(date.fromisoformat(date_iso), t)
+    dt = dt.astimezone(timezone.utc).astimezone(t.tzinfo)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S"), int(dt.utcoffset().total_seconds() // 60)
+
 def _ts(date_iso: str, daypart: str, tz: str) -> str:
-    t = _TIME_BY_DAYPART.get(daypart, "09:00")
-    dt = pendulum.parse(f"{date_iso} {t}", tz=tz)
-    return dt.to_iso8601_string()
-
-
-def mock_schedule(campaign: str, plan: List[PlanItem], posts: List[FormattedPost], tz: str) -> List[ScheduledPost]:
-    scheduled: List[ScheduledPost] = []
-    # queue posts per platform in generation order
-    posts_by_platform = {
-        "x": deque([f for f in posts if f.platform == "x"]),
-        "linkedin": deque([f for f in posts if f.platform == "linkedin"]),
-        "instagram": deque([f for f in posts if f.platform == "instagram"]),
-    }
-    for item in plan:
+    wall, off = _local(date_iso, daypart, tz)
+    return wall + _fmt_offset(off, tz)
+
+def timestamps(dates: Sequence[str], dayparts: Sequence[str], tz: str) -> List[str]:
+    """
+    Bulk _ts for chronologically ordered (date, daypart) pairs. The UTC offset only changes at tz transitions,
+    so offsets are computed exactly at range ends and bisected only where they differ.
+    """
+    n = len(dates)
+    if n == 0:
+        return []
+    days = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    exact: Dict[int, Tuple[str, int]] = {}
+    offsets = [0] * n
+
+    def at(i: int) -> int:
+        if i not in exact:
+            exact[i] = _local(dates[i], dayparts[i], tz)
+        return exact[i][1]
+
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i <= 1 or (at(i) == at(j) and days[j] - days[i] <= _MAX_FLAT_SPAN_DAYS):
+            for k in range(i, j + 1):
+                offsets[k] = at(i) if k != j else at(j)
+            continue
+        mid = (i + j) // 2
+        stack.append((i, mid))
+        stack.append((mid, j))
+
+    clock = {d: t.strftime("%H:%M:%S") for d, t in _daypart_clock(tz).items()}
+    out = []
+    for k in range(n):
+        wall = exact[k][0] if k in exact else f"{dates[k]}T{clock.get(dayparts[k], clock['morning'])}"
+        out.append(wall + _fmt_offset(offsets[k], tz))
+    return out
+
+
+class SlotRules(BaseModel):
+    min_spacing_s: int = 0             # minimum gap between two posts in the same lane
+    daily_quota: Optional[int] = None  # posts per lane per local day
+
+
+SLOT_RULES: Dict[str, SlotRules] = {
+    "x": SlotRules(min_spacing_s=15 * 60, daily_quota=20),
+    "linkedin": SlotRules(min_spacing_s=60 * 60, daily_quota=5),
+    "instagram": SlotRules(min_spacing_s=60 * 60, daily_quota=25),
+}
+_DEFAULT_SLOT_RULES = SlotRules()
+
+
+def register_slot_rules(platform: str, rules: SlotRules) -> None:
+    SLOT_RULES[platform] = rules
+
+
+class SlotRequest(NamedTuple):
+    ts: str  # wanted ISO timestamp (local wall time + offset, as produced by timestamps())
+    platform: str
+    tz: str
+    account: str = "default"
+
+
+def _iso_at(epoch: float, tz: str) -> str:
+    dt = datetime.fromtimestamp(epoch, _zone(tz))
+    return dt.strftime("%Y-%m-%dT%H:%M:%S") + _fmt_offset(int(dt.utcoffset().total_seconds() // 60), tz)
+
+
+def _on_day(ts: str, day: str, tz: str) -> str:
+    # same wall-clock time as `ts` on local date `day`
+    t = datetime.fromisoformat(ts).astimezone(_zone(tz)).time().replace(fold=1)
+    return _iso_at(datetime.combine(date.fromisoformat(day), t, _zone(tz)).timestamp(), tz)
+
+
+def _day_after(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+
+class _Lane:
+    __slots__ = ("starts", "ends", "per_day", "full")
+
+    def __init__(self):
+        # interval index: maximal runs of placed posts with no free slot between them (neighbours < 2*gap apart)
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.per_day: Dict[str, int] = {}  # local YYYY-MM-DD → posts placed
+        self.full: Dict[str, str] = {}     # full day → a later day to try (path-compressed)
+
+    def open_day(self, day: str) -> str:
+        path = []
+        while day in self.full:
+            path.append(day)
+            day = self.full[day]
+        for d in path:
+            self.full[d] = day
+        return day
+
+    def free_at(self, t: float, gap: float) -> float:
+        # earliest time >= t at least `gap` from every placed post; inside a run's reach that is the run's end + gap
+        i = bisect_left(self.ends, t - gap + 1e-9)
+        if i < len(self.starts) and self.starts[i] - t < gap:
+            return self.ends[i] + gap
+        return t
+
+    def add(self, t: float, gap: float) -> None:
+        i = bisect_left(self.starts, t)
+        merge_prev = i > 0 and t - self.ends[i - 1] < 2 * gap
+        merge_next = i < len(self.starts) and self.starts[i] - t < 2 * gap
+        if merge_prev and merge_next:
+            self.ends[i - 1] = self.ends[i]
+            del self.starts[i], self.ends[i]
+        elif merge_prev:
+            self.ends[i - 1] = t
+        elif merge_next:
+            self.starts[i] = t
+        else:
+            self.starts.insert(i, t)
+            self.ends.insert(i, t)
+
+
+class Scheduler:
+    """
+    Places posts into lanes, one per (account, platform). Each lane keeps an interval index of occupied runs,
+    per-day counts and a skip list of full days, so a slot is settled with a bisect or two instead of a scan.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, SlotRules]] = None):
+        self.rules = SLOT_RULES if rules is None else rules
+        self._lanes: Dict[Tuple[str, str], _Lane] = {}
+        self.collisions = 0  # moved later for spacing / an occupied slot
+        self.deferred = 0    # moved to a later day by a daily quota
+
+    def _try(self, req: SlotRequest) -> Tuple[bool, str]:
+        rules = self.rules.get(req.platform, _DEFAULT_SLOT_RULES)
+        lane = self._lanes.get((req.account, req.platform))
+        if lane is None:
+            lane = self._lanes[(req.account, req.platform)] = _Lane()
+        day = req.ts[:10]
+        if rules.daily_quota is not None:
+            open_day = lane.open_day(day)
+            if open_day != day:
+                self.deferred += 1
+                return False, _on_day(req.ts, open_day, req.tz)
+
+        gap = max(rules.min_spacing_s, 1)
+        t = datetime.fromisoformat(req.ts).timestamp()
+        moved = lane.free_at(t, gap)
+        ts = req.ts
+        if moved != t:
+            self.collisions += 1
+            ts = _iso_at(moved, req.tz)
+            if ts[:10] != day:
+                return False, ts  # spilled into the next day: re-check its quota
+        lane.add(moved, gap)
+        n = lane.per_day[day] = lane.per_day.get(day, 0) + 1
+        if rules.daily_quota is not None and n >= rules.daily_quota:
+            lane.full[day] = _day_after(day)
+        return True, ts
+
+    def place(self, req: SlotRequest) -> str:
+        while True:
+            ok, ts = self._try(req)
+            if ok:
+                return ts
+            req = req._replace(ts=ts)
+
+    def schedule(self, reqs: Sequence[SlotRequest]) -> List[str]:
+        # earliest wanted slot first, so lanes mostly grow at the end; moved requests go back in the queue
+        heap = [(datetime.fromisoformat(r.ts).timestamp(), k, r) for k, r in enumerate(reqs)]
+        heapq.heapify(heap)
+        out: List[str] = [""] * len(reqs)
+        while heap:
+            _, k, r = heapq.heappop(heap)
+            ok, ts = self._try(r)
+            if ok:
+                out[k] = ts
+            else:
+                heapq.heappush(heap, (datetime.fromisoformat(ts).timestamp(), k, r._replace(ts=ts)))
+        return out
+
+
+def _scheduled(campaign: str, item: PlanItem, fp: FormattedPost, ts: str) -> ScheduledPost:
+    return ScheduledPost.model_construct(
+        campaign=campaign,
+        platform=fp.platform,
+        text=fp.text,
+        mediaUrl=fp.media.url,
+        timestamp=ts,
+        meta={"theme": item.theme, "dayIndex": item.dayIndex, "daypart": item.daypart},
+    )
+
+
+def _place(slots: List[Tuple[PlanItem, str, str]], tz: str, scheduler: Optional[Scheduler],
+           account: str) -> List[str]:
+    return (scheduler or Scheduler()).schedule([SlotRequest(ts, p, tz, account) for _, p, ts in slots])
+
+
+def mock_schedule(campaign: str, plan: List[PlanItem], posts: List[FormattedPost], tz: str,
+                  scheduler: Optional[Scheduler] = None, account: str = "default") -> List[ScheduledPost]:
+    # queue posts per platform in generation order, in one pass
+    posts_by_platform: Dict[str, deque] = defaultdict(deque)
+    for fp in posts:
+        posts_by_platform[fp.platform].append(fp)
+    stamps = timestamps([i.dateISO for i in plan], [i.daypart for i in plan], tz)
+    slots, paired = [], []
+    for item, ts in zip(plan, stamps):
         for p in item.platforms:
-            fp = posts_by_platform[p].popleft() if posts_by_platform[p] else None
-            if not fp:
-                continue
-            scheduled.append(ScheduledPost(
-                campaign=campaign,
-                platform=p,
-                text=fp.text,
-                mediaUrl=str(fp.media.url),
-                timestamp=_ts(item.dateISO, item.daypart, tz),
-                meta={"theme": item.theme, "dayIndex": item.dayIndex, "daypart": item.daypart},
-            ))
-    return scheduled
+            q = posts_by_platform.get(p)
+            if q:
+                slots.append((item, p, ts))
+                paired.append(q.popleft())
+    placed = _place(slots, tz, scheduler, account)
+    return [_scheduled(campaign, item, fp, ts) for (item, _, _), fp, ts in zip(slots, paired, placed)]
+
+
+def schedule_slots(plan: List[PlanItem], tz: str, scheduler: Optional[Scheduler] = None,
+                   account: str = "default") -> List[Dict[str, str]]:
+    """Per day {platform: timestamp}: where mock_schedule puts a campaign that has a post for every slot."""
+    stamps = timestamps([i.dateISO for i in plan], [i.daypart for i in plan], tz)
+    slots = [(item, p, ts) for item, ts in zip(plan, stamps) for p in item.platforms]
+    out: List[Dict[str, str]] = [{} for _ in plan]
+    by_day = (day for day, item in enumerate(plan) for _ in item.platforms)
+    for day, (_, p, _), ts in zip(by_day, slots, _place(slots, tz, scheduler, account)):
+        out[day][p] = ts
+    return out
+
+
+def schedule_day(campaign: str, item: PlanItem, posts: List[FormattedPost],
+                 slots: Dict[str, str]) -> List[ScheduledPost]:
+    # one day's posts at the slots schedule_slots() placed for it; used by streaming runs
+    return [_scheduled(campaign, item, fp, slots[fp.platform]) for fp in posts]
 
 # Purpose: turn formatted posts + plan into scheduled items with timestamps.
 #
@@ -51,20 +291,49 @@ def mock_schedule(campaign: str, plan: List[PlanItem], posts: List[FormattedPost
 # Why: build a timezone‑aware ISO timestamp.
 #
 # What it does: combines YYYY‑MM‑DD with the chosen time and converts to ISO8601 in the given timezone.
+# Same strings as pendulum.parse(...).to_iso8601_string(), via zoneinfo; zones and the daypart → clock-time
+# mapping are cached per timezone (_zone / _daypart_clock).
+#
+# timestamps(dates, dayparts, tz) -> List[str]
+#
+# Why: year-long calendars shouldn't pay a timezone computation per post.
+#
+# What it does: treats the UTC offset as piecewise constant; computes it exactly at the ends of a range and
+# bisects only ranges whose ends differ (or span more than two weeks), i.e. around DST transitions.
+#
+# Scheduler engine:
+#
+# SLOT_RULES: platform → SlotRules (min spacing between posts, daily quota); register_slot_rules() for more
+# platforms. Unknown platforms only get collision checks.
+#
+# Scheduler(rules).schedule(requests) -> List[str] / .place(request) -> str
+#
+# Why: thousands of posts across many campaigns without scanning every placed post per slot.
+#
+# What it does: one lane per (account, platform) holding a sorted index of placed times and per-day counts.
+# schedule() pops requests from a heap by wanted time; an occupied or too-close slot moves to the next free time
+# (bisect + walk over the neighbours it conflicts with), a full day moves the request to the same wall time on
+# the next day and back into the heap. Timestamps that don't move come back unchanged.
 #
 # Function:
 #
-# mock_schedule(campaign: str, plan: List[PlanItem], posts: List[FormattedPost], tz: str) -> List[ScheduledPost]
+# mock_schedule(campaign, plan, posts, tz, scheduler=None, account="default") -> List[ScheduledPost]
 #
 # Why: simulate scheduling without hitting real APIs.
 #
 # What it does:
 #
-# Iterates the plan in order.
+# Buckets posts per platform in one pass (any platform name), computes all plan timestamps in one timestamps()
+# call, pairs each day's platforms with the next post of that platform, and runs the slots through a Scheduler
+# (pass a shared one to schedule several campaigns into the same accounts).
+#
+# Produces ScheduledPost with timestamp, mediaUrl, and meta (built without re-validation; inputs are models).
 #
-# For each platform on that day, pops the next FormattedPost for that platform (use the deque fix so dates don’t repeat).
+# schedule_slots(plan, tz) -> List[{platform: timestamp}] / schedule_day(campaign, item, posts, slots)
 #
-# Produces ScheduledPost with timestamp, mediaUrl, and meta.
+# The same placement as mock_schedule (same requests through the same Scheduler.schedule pass), computed from the
+# plan alone, so the streaming runner can emit a day as soon as its image and copy are in and still match the
+# graph's schedule node post for post.
 #
 # Where to go “live”:
 # Add schedule_real.py (or extend this file) to hit Buffer or direct platform APIs. Keep ScheduledPost as the input so the interface stays stable.
\ No newline at end of file
@@ -0,0 +1,236 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+import hashlib
+import sqlite3
+import threading
+import time
+import orjson
+from pydantic import AnyUrl, BaseModel
+from core.schemas import ScheduledPost
+from .config import get_settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id          TEXT PRIMARY KEY,
+    campaign_id TEXT NOT NULL DEFAULT '',
+    campaign    TEXT NOT NULL,
+    platform    TEXT NOT NULL,
+    ts_utc      INTEGER NOT NULL,
+    timestamp   TEXT NOT NULL,
+    text        TEXT NOT NULL,
+    media_url   TEXT NOT NULL,
+    meta        TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'scheduled',
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_ts ON posts (ts_utc, id);
+CREATE INDEX IF NOT EXISTS posts_platform_ts ON posts (platform, ts_utc, id);
+CREATE INDEX IF NOT EXISTS posts_campaign_ts ON posts (campaign, ts_utc, id);
+CREATE INDEX IF NOT EXISTS posts_status_ts ON posts (status, ts_utc, id);
+CREATE INDEX IF NOT EXISTS posts_campaign_id ON posts (campaign_id);
+"""
+
+_COLUMNS = "id, campaign, platform, ts_utc, timestamp, text, media_url, meta, status"
+
+When = Union[str, datetime, int, float]
+
+
+class StoredPost(BaseModel):
+    id: str
+    status: str
+    post: ScheduledPost
+
+
+class SchedulePage(BaseModel):
+    items: List[StoredPost]
+    next_cursor: Optional[str] = None  # pass back as `after` for the next page; None = last page
+
+
+def post_id(sp: ScheduledPost, campaign_id: Optional[str] = None) -> str:
+    # stable across re-runs and edits of the same campaign (its thread id, not the display name, which a replan can
+    # change and which unnamed prompts share), so writing it again updates instead of duplicating
+    slot = sp.meta.get("dayIndex", sp.timestamp)
+    key = campaign_id or sp.campaign
+    return hashlib.sha256(f"{key}\x1f{sp.platform}\x1f{slot}".encode("utf-8")).hexdigest()[:24]
+
+
+def _epoch(when: When) -> int:
+    if isinstance(when, (int, float)):
+        return int(when)
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return int(when.timestamp())
+
+
+def _row(r: Tuple) -> StoredPost:
+    pid, campaign, platform, _, ts, text, media_url, meta, status = r
+    post = ScheduledPost.model_construct(campaign=campaign, platform=platform, text=text,
+                                         mediaUrl=AnyUrl(media_url), timestamp=ts, meta=orjson.loads(meta))
+    return StoredPost.model_construct(id=pid, status=status, post=post)
+
+
+class ScheduleStore:
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = {r[1] for r in self._conn.execute("PRAGMA table_info(posts)")}
+        if columns and "campaign_id" not in columns:
+            # stores written before rows were keyed by campaign id: their ids hash the display name, and the thread id
+            # the rows belong to can't be recovered from it, so no replace_campaign would ever match them. They are
+            # dropped; the next run of each campaign writes its rows again under the new key.
+            with self._conn:
+                self._conn.execute("ALTER TABLE posts ADD COLUMN campaign_id TEXT NOT NULL DEFAULT ''")
+                self._conn.execute("DELETE FROM posts WHERE campaign_id = ''")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _upsert(self, campaign_id: str, posts: Iterable[ScheduledPost]) -> List[str]:
+        now = time.time()
+        rows = [
+            (post_id(sp, campaign_id), campaign_id, sp.campaign, sp.platform, _epoch(sp.timestamp), sp.timestamp,
+             sp.text, str(sp.mediaUrl), orjson.dumps(sp.meta).decode(), now)
+            for sp in posts
+        ]
+        # content, name and time are replaced; status is kept so a re-run doesn't resend what was already published
+        self._conn.executemany(
+            "INSERT INTO posts (id, campaign_id, campaign, platform, ts_utc, timestamp, text, media_url, meta, "
+            "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET campaign=excluded.campaign, ts_utc=excluded.ts_utc, "
+            "timestamp=excluded.timestamp, text=excluded.text, media_url=excluded.media_url, meta=excluded.meta, "
+            "updated_at=excluded.updated_at",
+            rows,
+        )
+        return [r[0] for r in rows]
+
+    def upsert(self, campaign_id: str, posts: Iterable[ScheduledPost]) -> int:
+        """Adds or updates posts of one campaign, leaving its other rows alone (e.g. one streamed day)."""
+        with self._lock, self._conn:
+            return len(self._upsert(campaign_id, posts))
+
+    def replace_campaign(self, campaign_id: str, posts: Iterable[ScheduledPost]) -> int:
+        """Makes `posts` the campaign's whole schedule; rows for slots it no longer has are deleted."""
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (id TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM keep")
+            ids = self._upsert(campaign_id, posts)
+            self._conn.executemany("INSERT OR IGNORE INTO keep VALUES (?)", [(i,) for i in ids])
+            self._conn.execute("DELETE FROM posts WHERE campaign_id = ? AND id NOT IN (SELECT id FROM keep)",
+                               (campaign_id,))
+        return len(ids)
+
+    def query(
+        self,
+        start: Optional[When] = None,
+        end: Optional[When] = None,
+        platform: Union[str, Sequence[str], None] = None,
+        campaign: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        after: Optional[str] = None,
+        campaign_id: Optional[str] = None,
+    ) -> SchedulePage:
+        """Posts with start <= time < end, oldest first; keyset-paginated via `after` (an opaque cursor)."""
+        where, args = [], []
+        if start is not None:
+            where.append("ts_utc >= ?")
+            args.append(_epoch(start))
+        if end is not None:
+            where.append("ts_utc < ?")
+            args.append(_epoch(end))
+        if isinstance(platform, str):
+            where.append("platform = ?")
+            args.append(platform)
+        elif platform:
+            where.append(f"platform IN ({','.join('?' * len(platform))})")
+            args.extend(platform)
+        if campaign is not None:
+            where.append("campaign = ?")
+            args.append(campaign)
+        if campaign_id is not None:
+            where.append("campaign_id = ?")
+            args.append(campaign_id)
+        if status is not None:
+            where.append("status = ?")
+            args.append(status)
+        if after:
+            ts, pid = after.split(":", 1)
+            where.append("(ts_utc, id) > (?, ?)")
+            args += [int(ts), pid]
+        sql = f"SELECT {_COLUMNS} FROM posts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts_utc, id LIMIT ?"
+        args.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        nxt = f"{rows[limit - 1][3]}:{rows[limit - 1][0]}" if len(rows) > limit else None
+        return SchedulePage(items=[_row(r) for r in rows[:limit]], next_cursor=nxt)
+
+    def due(self, now: Optional[When] = None, limit: int = 100,
+            platform: Union[str, Sequence[str], None] = None) -> List[StoredPost]:
+        # what a dispatcher should send next: still 'scheduled' and not in the future
+        return self.query(end=_epoch(now if now is not None else time.time()) + 1, platform=platform,
+                          status="scheduled", limit=limit).items
+
+    def mark(self, ids: Sequence[str], status: str) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE posts SET status = ?, updated_at = ? WHERE id = ?",
+                                   [(status, time.time(), i) for i in ids])
+
+    def delete_campaign(self, campaign_id: str) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM posts WHERE campaign_id = ?", (campaign_id,)).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+
+@lru_cache(maxsize=1)
+def get_schedule_store() -> Optional[ScheduleStore]:
+    s = get_settings()
+    if not s.schedule_store_enabled:
+        return None
+    return ScheduleStore(Path(s.schedule_store_path))
+
+
+def store_schedule(schedule: List[ScheduledPost], campaign_id: str) -> None:
+    # a run's schedule is the campaign's schedule: a re-run or replan with fewer days drops the rest
+    store = get_schedule_store()
+    if store is not None:
+        store.replace_campaign(campaign_id, schedule)
+
+# Purpose: one persistent schedule for every campaign, instead of a schedule.json overwritten per run.
+#
+# Table posts (SQLite, WAL; settings.schedule_store_path): one row per scheduled post with the UTC epoch next to
+# the original ISO timestamp, plus a status. Opening a store from before campaign_id existed adds the column and
+# deletes the old name-keyed rows (re-running a campaign recreates them). Indexed on (ts_utc), (platform, ts_utc), (campaign, ts_utc) and
+# (status, ts_utc), each with id as tie-breaker so range scans and keyset pages stay on the index.
+#
+# post_id(post, campaign_id): sha256(campaign_id, platform, dayIndex) — campaign_id is the run's checkpoint thread
+# id (core.checkpoint.campaign_thread_id), stable across re-runs and replans, so they update rows in place.
+#
+# ScheduleStore:
+#
+# upsert(campaign_id, posts) -> int: insert or update content/time, keeping status.
+#
+# replace_campaign(campaign_id, posts) -> int: upsert plus delete the campaign's rows whose id is not among posts,
+# in one transaction — a replan with fewer days or a new name leaves no stale 'scheduled' rows behind.
+#
+# query(start, end, platform, campaign, status, limit, after, campaign_id) -> SchedulePage: time window [start, end)
+# across campaigns, filters, ordered by time; next_cursor feeds `after` for the following page.
+#
+# due(now, limit, platform): scheduled posts at or before now — what a dispatcher polls.
+#
+# mark(ids, status), delete_campaign(campaign_id), count().
+#
+# get_schedule_store() / store_schedule(schedule, campaign_id): process-wide store (None when
+# SCHEDULE_STORE_ENABLED=false); store_schedule replaces the campaign's rows.
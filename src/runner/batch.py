@@ -0,0 +1,153 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+import hashlib
+import os
+import re
+import time
+import orjson
+import typer
+
+_GRAPH = None
+
+
+def read_jobs(path: Path, limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    # jobs without an id are named after their file and line: the id is also the campaign's thread and store key,
+    # so line 1 of two different files must not share (and replace) one campaign
+    source = f"{path.stem}-{hashlib.sha256(str(path.resolve()).encode('utf-8')).hexdigest()[:8]}"
+    with path.open("rb") as f:
+        n = 0
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            rec = orjson.loads(line)
+            prompt = rec.get("prompt") or rec.get("body")
+            if not prompt:
+                raise ValueError(f"{path}:{lineno}: expected a 'prompt' (or 'body') field")
+            cid = str(rec.get("id") or rec.get("campaign_id") or rec.get("request_id") or f"{source}-line-{lineno}")
+            yield {"id": re.sub(r"[^A-Za-z0-9_.-]+", "_", cid), "prompt": prompt}
+            n += 1
+            if limit and n >= limit:
+                return
+
+
+def _init_worker() -> None:
+    global _GRAPH
+    from core.graph import get_graph
+    from features.renditions import set_rendition_workers
+    set_rendition_workers(-1)  # one worker per core already: a rendition pool each would oversubscribe the CPUs
+    _GRAPH = get_graph()
+
+
+def _run_one(job: Dict[str, str], out_dir: str, export_csv: bool, columnar: Optional[str] = None) -> Dict[str, Any]:
+    from core.graph import discard_thread, invoke_campaign, to_schedule
+    from core.instrumentation import diff, profiled, snapshot, to_json
+    from features.export import save_columnar, save_json, save_csv
+    from features.schedule_store import store_schedule
+
+    t0 = time.perf_counter()
+    before = snapshot()
+    thread_id = f"batch-{job['id']}"
+    try:
+        with profiled(thread_id):
+            final_state = invoke_campaign(_GRAPH, job["prompt"], thread_id=thread_id)
+        schedule = to_schedule(final_state)
+        store_schedule(schedule, thread_id)
+        # finished: nothing left to resume; a failed campaign keeps its thread, so rerunning the batch resumes it
+        discard_thread(_GRAPH, thread_id)
+        outputs = [save_json(schedule, f"{out_dir}/{job['id']}/schedule.json")]
+        if export_csv:
+            outputs.append(save_csv(schedule, f"{out_dir}/{job['id']}/schedule.csv"))
+        if columnar:
+            outputs.append(save_columnar(schedule, columnar, f"{out_dir}/{job['id']}/schedule.{columnar}"))
+        return {"id": job["id"], "ok": True, "posts": len(schedule), "outputs": outputs,
+                "latency_s": time.perf_counter() - t0, "metrics": to_json(diff(snapshot(), before))}
+    except Exception as e:
+        return {"id": job["id"], "ok": False, "error": f"{type(e).__name__}: {e}",
+                "latency_s": time.perf_counter() - t0}
+
+
+def run_batch(
+    jobs_path: Path,
+    out_dir: str = "batch",
+    workers: Optional[int] = None,
+    export_csv: bool = False,
+    limit: Optional[int] = None,
+    columnar: Optional[str] = None,
+) -> Dict[str, Any]:
+    from core.instrumentation import from_json, merge, percentile, to_json, write_metrics
+    from features.export import ARTIFACTS, save_json_payload
+
+    jobs = list(read_jobs(jobs_path, limit))
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        results = list(pool.map(_run_one, jobs, [out_dir] * len(jobs), [export_csv] * len(jobs),
+                                [columnar] * len(jobs), chunksize=chunksize))
+    wall = time.perf_counter() - t0
+    # per-campaign timings from every worker process, summed
+    metrics = merge(from_json(r.pop("metrics")) for r in results if "metrics" in r)
+
+    lat = sorted(r["latency_s"] for r in results)
+    ok = sum(1 for r in results if r["ok"])
+    summary = {
+        "input": str(jobs_path),
+        "campaigns": len(results),
+        "ok": ok,
+        "failed": len(results) - ok,
+        "workers": workers,
+        "wall_s": round(wall, 3),
+        "campaigns_per_s": round(len(results) / wall, 2) if wall else 0.0,
+        "latency_p50_s": round(percentile(lat, 0.50), 4),
+        "latency_p95_s": round(percentile(lat, 0.95), 4),
+        "metrics": to_json(metrics),
+        "results": results,
+    }
+    summary["path"] = save_json_payload(summary, f"{out_dir}/summary.json")
+    write_metrics(str(ARTIFACTS / out_dir / "metrics.prom"), metrics)
+    return summary
+
+
+def main(
+    jobs: Path = typer.Argument(..., help="JSONL file, one {'prompt': ...} (or {'body': ...}) per line"),
+    out: str = typer.Option("batch", help="output folder under artifacts/"),
+    workers: Optional[int] = typer.Option(None, help="worker processes (default: CPU count)"),
+    csv: bool = typer.Option(False, help="also write schedule.csv per campaign"),
+    limit: Optional[int] = typer.Option(None, help="only run the first N prompts"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="also write schedule.parquet or schedule.arrow per campaign"),
+):
+    s = run_batch(jobs, out, workers, csv, limit, fmt)
+    print(f"✅ {s['ok']}/{s['campaigns']} campaigns in {s['wall_s']}s "
+          f"({s['campaigns_per_s']}/s, p50 {s['latency_p50_s']}s, p95 {s['latency_p95_s']}s)")
+    print(f"✅ Summary saved to: {s['path']}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: plan many campaigns in one go.
+#
+# Functions:
+#
+# read_jobs(path, limit) -> Iterator[{"id", "prompt"}]
+#
+# What it does: reads JSONL; the prompt comes from "prompt" (or "body", so requests.jsonl-style files work),
+# the id from "id" / "campaign_id" / "request_id", else <file stem>-<hash of the file's path>-line-<n>, so
+# unnamed jobs from different files never share a thread or a campaign in the schedule store.
+#
+# run_batch(jobs_path, out_dir, workers, export_csv, limit, columnar) -> summary dict
+#
+# Why: one process can only use one core for the CPU-bound parts of the pipeline.
+#
+# What it does:
+#
+# Fans prompts out over a ProcessPoolExecutor; each worker compiles the graph once (_init_worker → get_graph())
+# and encodes renditions inline instead of starting its own encoder pool.
+#
+# Writes artifacts/<out_dir>/<id>/schedule.json (+ .csv, + .parquet / .arrow with --format) per campaign,
+# upserts it into the schedule store, and writes artifacts/<out_dir>/summary.json with throughput (campaigns/sec), p50/p95 per-campaign latency and
+# per-campaign status/errors, plus per-node/per-call timings merged across workers (also as
+# artifacts/<out_dir>/metrics.prom). PROFILE_DIR adds a cProfile dump per campaign.
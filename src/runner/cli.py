@@ -0,0 +1,154 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import List, Optional
+import typer
+
+# Only typer is imported up front: each command imports the pipeline (pydantic, langgraph, SDKs) when it runs,
+# so `--help`, argument errors and light commands start in a fraction of the full import time.
+app = typer.Typer(add_completion=False, no_args_is_help=True, help="Plan, export and publish social campaigns.")
+
+FORMAT_HELP = "also write artifacts/schedule.parquet or schedule.arrow (needs pyarrow)"
+
+
+def _columnar(fmt: Optional[str]) -> Optional[str]:
+    # checked before the campaign runs, not when the file is written at the end
+    if fmt is not None and fmt not in ("parquet", "arrow"):
+        raise typer.BadParameter(f"expected 'parquet' or 'arrow', got {fmt!r}", param_hint="--format")
+    return fmt
+
+
+EXAMPLE_PROMPT = ("Run a 7-day product launch campaign for a new AI writing tool focused on creators and marketers. "
+                  "Tone inspiring. Start 2025-08-11 in Asia/Karachi.")
+
+
+@app.command()
+def run(
+    prompt: str = typer.Argument(EXAMPLE_PROMPT, help="campaign brief in plain language"),
+    csv: bool = typer.Option(False, help="also write artifacts/schedule.csv"),
+    fmt: Optional[str] = typer.Option(None, "--format", help=FORMAT_HELP),
+    thread_id: Optional[str] = typer.Option(None, help="checkpoint thread (resume an interrupted run)"),
+    use_async: bool = typer.Option(False, "--async", help="run the graph on an event loop"),
+):
+    """Plan one campaign and write artifacts/schedule.json."""
+    fmt = _columnar(fmt)
+    from runner.main import arun_campaign, run_campaign
+    if use_async:
+        import asyncio
+        schedule = asyncio.run(arun_campaign(prompt, csv, thread_id, fmt))
+    else:
+        schedule = run_campaign(prompt, csv, thread_id, fmt)
+    print(f"✅ {len(schedule)} posts scheduled")
+
+
+@app.command()
+def replan(
+    prompt: str = typer.Argument(EXAMPLE_PROMPT, help="the prompt of the finished campaign to edit"),
+    set_: List[str] = typer.Option(..., "--set", help="brief field to change, e.g. tone=playful (repeatable)"),
+    csv: bool = typer.Option(False, help="also write artifacts/schedule.csv"),
+    fmt: Optional[str] = typer.Option(None, "--format", help=FORMAT_HELP),
+    thread_id: Optional[str] = typer.Option(None, help="checkpoint thread of the campaign"),
+):
+    """Edit a finished campaign's brief and rebuild only what the edit invalidates."""
+    fmt = _columnar(fmt)
+    changes = {}
+    for pair in set_:
+        field, sep, value = pair.partition("=")
+        if not sep:
+            raise typer.BadParameter(f"expected FIELD=VALUE, got {pair!r}", param_hint="--set")
+        changes[field.strip()] = value.strip()
+    from runner.main import replan_campaign
+    schedule, report = replan_campaign(prompt, changes, csv, thread_id, fmt)
+    print(f"✅ {len(schedule)} posts; changed {', '.join(report['changed']) or 'nothing'}: plan {report['plan']}, "
+          f"images {report['assets_reused']} reused / {report['assets_created']} new, "
+          f"copy {report['copy_reused']} reused / {report['copy_regenerated']} new")
+
+
+@app.command()
+def stream(
+    prompt: str = typer.Argument(EXAMPLE_PROMPT, help="campaign brief in plain language"),
+    ndjson: str = typer.Option("schedule.ndjson", help="NDJSON file under artifacts/"),
+    csv_name: str = typer.Option("schedule_stream.csv", "--csv", help="CSV file under artifacts/"),
+    fmt: Optional[str] = typer.Option(None, "--format",
+                                      help="also write artifacts/schedule_stream.parquet or .arrow as posts arrive"),
+    thread_id: Optional[str] = typer.Option(None, help="checkpoint thread (resume an interrupted run)"),
+):
+    """Plan one campaign, printing and appending each day's posts as soon as they are ready."""
+    fmt = _columnar(fmt)
+    from runner.main import stream_campaign
+    n = 0
+    for sp in stream_campaign(prompt, ndjson, csv_name, thread_id, fmt):
+        n += 1
+        print(f"{sp.timestamp}  {sp.platform:<9}  {sp.text.splitlines()[0][:60]}")
+    print(f"✅ {n} posts streamed")
+
+
+@app.command()
+def batch(
+    jobs: Path = typer.Argument(..., help="JSONL file, one {'prompt': ...} (or {'body': ...}) per line"),
+    out: str = typer.Option("batch", help="output folder under artifacts/"),
+    workers: Optional[int] = typer.Option(None, help="worker processes (default: CPU count)"),
+    csv: bool = typer.Option(False, help="also write schedule.csv per campaign"),
+    limit: Optional[int] = typer.Option(None, help="only run the first N prompts"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="also write schedule.parquet or schedule.arrow per campaign"),
+):
+    """Plan many campaigns from a JSONL file over a process pool."""
+    fmt = _columnar(fmt)
+    from runner.batch import main as batch_main
+    batch_main(jobs, out, workers, csv, limit, fmt)
+
+
+@app.command()
+def dispatch(
+    until_idle: bool = typer.Option(False, help="exit once nothing is queued within the lookahead"),
+    duration: Optional[float] = typer.Option(None, help="stop after this many seconds"),
+):
+    """Publish due posts from the schedule store."""
+    from runner.dispatch import main as dispatch_main
+    dispatch_main(until_idle, duration)
+
+
+@app.command()
+def serve(
+    host: Optional[str] = typer.Option(None, help="bind address (default: SERVICE_HOST)"),
+    port: Optional[int] = typer.Option(None, help="port (default: SERVICE_PORT)"),
+    workers: Optional[int] = typer.Option(None, help="campaigns run at once (default: SERVICE_WORKERS)"),
+    queue_size: Optional[int] = typer.Option(None, help="queued jobs before 429 (default: SERVICE_QUEUE_SIZE)"),
+):
+    """Serve the HTTP job API: queue prompts, poll status and results, scrape /metrics."""
+    from runner.service import main as service_main
+    service_main(host, port, workers, queue_size)
+
+
+@app.command("import-time")
+def import_time(
+    module: Optional[List[str]] = typer.Option(None, help="module to measure (repeatable; default: every budgeted one)"),
+    budget_ms: Optional[float] = typer.Option(None, help="budget for --module"),
+    repeat: int = typer.Option(5, help="fresh interpreters per module"),
+    top: int = typer.Option(8, help="heaviest imports to list"),
+):
+    """Measure cold import time of the entry points against their budgets (exit 1 when over)."""
+    from bench.startup import main as startup_main
+    startup_main(module, budget_ms, repeat, top)
+
+
+if __name__ == "__main__":
+    app()
+
+# Purpose: one command-line entry point with a cheap startup.
+#
+# Usage: PYTHONPATH=src:. python -m runner.cli <command> [options]   (--help on any command)
+#
+#   run [PROMPT] [--csv] [--thread-id ID] [--async]    plan one campaign → artifacts/schedule.json (+ .csv)
+#   replan [PROMPT] --set FIELD=VALUE ...               edit a finished campaign's brief, rebuild only what changed
+#   stream [PROMPT] [--ndjson F] [--csv F]             print/append each day's posts as they are produced
+#   batch JOBS.jsonl [--workers N] [--csv] [--limit N] many campaigns over a process pool
+#
+#   run / replan / stream / batch also take --format parquet|arrow: a columnar copy of the schedule
+#   (features.export.save_columnar, or an ArrowSink fed as posts stream in).
+#   dispatch [--until-idle] [--duration S]             publish due posts from the schedule store
+#   serve [--port P] [--workers N] [--queue-size N]    HTTP job service (queue, 429 backpressure, /metrics)
+#   import-time [--module M] [--budget-ms MS]          cold-start import time vs budget (bench.startup)
+#
+# Startup: this module imports typer only; commands import their pipeline modules inside the function body.
+# Pipeline modules keep optional SDKs lazy too (core.lazy: openai, pandas, pyarrow load on first use) and
+# importing them touches no files (the artifacts folder is created by the first write).
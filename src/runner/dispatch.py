@@ -0,0 +1,228 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import itertools
+import threading
+import time
+import typer
+from core.instrumentation import percentile, timed
+from core.providers.images.resilience import RetryPolicy
+from core.providers.schedular import PublishError, get_adapter, get_rate_limiter
+from core.schemas import ScheduledPost
+from features.config import get_settings
+from features.schedule_store import ScheduleStore, StoredPost, get_schedule_store, post_id
+
+
+def _due(item: StoredPost) -> float:
+    return datetime.fromisoformat(item.post.timestamp).timestamp()
+
+
+class Dispatcher:
+    LAG_WINDOW = 10_000  # most recent sends the lag percentiles are taken over
+
+    def __init__(
+        self,
+        store: Optional[ScheduleStore] = None,
+        workers: Optional[int] = None,
+        lookahead_s: Optional[float] = None,
+        refresh_s: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        s = get_settings()
+        self.store = store
+        self.lookahead_s = s.dispatch_lookahead_s if lookahead_s is None else lookahead_s
+        self.refresh_s = s.dispatch_refresh_s if refresh_s is None else refresh_s
+        self.retry = retry or RetryPolicy(attempts=s.publish_retry_attempts, base_delay_s=0.5)
+        self._pool = ThreadPoolExecutor(max_workers=workers or s.publish_workers, thread_name_prefix="dispatch")
+        self._heap: List[Tuple[float, int, StoredPost]] = []
+        self._seq = itertools.count()
+        self._known: Set[str] = set()  # queued or in flight
+        self._opened: Set[str] = set()  # platforms whose adapter is warmed up
+        self._inflight = 0
+        self._cv = threading.Condition()
+        self._stopped = False
+        self._next_refresh = 0.0
+        # metrics
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.lags: Deque[float] = deque(maxlen=self.LAG_WINDOW)
+        self.lag_max = 0.0
+        self.by_platform: Dict[str, int] = {}
+
+    def submit(self, posts: Iterable[ScheduledPost | StoredPost], campaign_id: Optional[str] = None) -> int:
+        """Queues posts; plain ScheduledPosts get the id the store gives them under `campaign_id` (the run's thread id)."""
+        n = 0
+        platforms = set()
+        with self._cv:
+            for p in posts:
+                item = p if isinstance(p, StoredPost) else StoredPost(id=post_id(p, campaign_id), status="scheduled",
+                                                                      post=p)
+                if item.id in self._known:
+                    continue
+                self._known.add(item.id)
+                heapq.heappush(self._heap, (_due(item), next(self._seq), item))
+                platforms.add(item.post.platform)
+                n += 1
+            self._cv.notify()
+        for platform in platforms - self._opened:
+            try:
+                get_adapter(platform).open()
+            except Exception as e:  # only a warm-up: the send itself reports the failure and marks the post
+                print(f"[dispatch] could not open {platform}: {type(e).__name__}: {e}")
+            self._opened.add(platform)
+        return n
+
+    def _refresh(self, now: float) -> None:
+        # everything still 'scheduled' up to the lookahead horizon, overdue posts included
+        after = None
+        while True:
+            page = self.store.query(end=now + self.lookahead_s, status="scheduled", limit=500, after=after)
+            self.submit(page.items)
+            if not page.next_cursor:
+                break
+            after = page.next_cursor
+
+    def _publish(self, item: StoredPost) -> bool:
+        post = item.post
+        adapter = get_adapter(post.platform)
+        bucket = get_rate_limiter(post.platform)
+        for attempt in range(self.retry.attempts):
+            bucket.acquire()
+            try:
+                with timed("provider", f"publish:{post.platform}", items=1):
+                    adapter.publish(post, item.id)
+                return True
+            except Exception as e:
+                if attempt == self.retry.attempts - 1 or not adapter.retryable(e):
+                    print(f"[dispatch] failed {post.platform} {item.id}: {type(e).__name__}: {e}")
+                    return False
+                if isinstance(e, PublishError) and e.retry_after_s:
+                    bucket.penalize(e.retry_after_s)
+                else:
+                    time.sleep(self.retry.delay(attempt))
+                with self._cv:
+                    self.retries += 1
+        return False
+
+    def _send(self, due: float, item: StoredPost) -> None:
+        post = item.post
+        ok = False
+        sent_at = 0.0
+        try:
+            try:
+                ok = self._publish(item)
+            except Exception as e:
+                # adapter lookup, rate limiter or request building: still a failed post, not one left 'scheduled'
+                # for the next refresh to queue again
+                print(f"[dispatch] failed {post.platform} {item.id}: {type(e).__name__}: {e}")
+            sent_at = time.time()
+            if self.store is not None:
+                self.store.mark([item.id], "sent" if ok else "failed")
+        finally:
+            with self._cv:
+                if ok:
+                    self.sent += 1
+                    lag = max(0.0, sent_at - due)
+                    self.lags.append(lag)
+                    self.lag_max = max(self.lag_max, lag)
+                    self.by_platform[post.platform] = self.by_platform.get(post.platform, 0) + 1
+                else:
+                    self.failed += 1
+                self._inflight -= 1
+                self._known.discard(item.id)
+                self._cv.notify()
+
+    def run(self, until_idle: bool = False, duration_s: Optional[float] = None) -> Dict[str, Any]:
+        """Sleeps until the earliest due post (or the next store refresh), sends everything due, repeats."""
+        deadline = None if duration_s is None else time.time() + duration_s
+        while True:
+            now = time.time()
+            if self.store is not None and now >= self._next_refresh:
+                self._refresh(now)
+                self._next_refresh = now + self.refresh_s
+            with self._cv:
+                while self._heap and self._heap[0][0] <= now:
+                    due, _, item = heapq.heappop(self._heap)
+                    self._inflight += 1
+                    self._pool.submit(self._send, due, item)
+                if self._stopped or (deadline is not None and now >= deadline):
+                    break
+                if until_idle and not self._heap and not self._inflight:
+                    break
+                wake = [deadline] if deadline is not None else []
+                if self._heap:
+                    wake.append(self._heap[0][0])
+                if self.store is not None:
+                    wake.append(self._next_refresh)
+                if until_idle and not self._heap:
+                    wake = wake or [now + 1.0]  # only waiting for in-flight sends, which notify
+                self._cv.wait(timeout=max(0.0, min(wake) - time.time()) if wake else None)
+        self._pool.shutdown(wait=True)
+        return self.metrics()
+
+    def stop(self) -> None:
+        with self._cv:
+            self._stopped = True
+            self._cv.notify()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cv:
+            lags = sorted(self.lags)
+            return {
+                "sent": self.sent,
+                "failed": self.failed,
+                "retries": self.retries,
+                "queued": len(self._heap),
+                "in_flight": self._inflight,
+                "sent_by_platform": dict(self.by_platform),
+                "lag_p50_s": round(percentile(lags, 0.50), 4),
+                "lag_p95_s": round(percentile(lags, 0.95), 4),
+                "lag_max_s": round(self.lag_max, 4),
+            }
+
+
+def main(until_idle: bool = typer.Option(False, help="exit once nothing is queued within the lookahead"),
+         duration: Optional[float] = typer.Option(None, help="stop after this many seconds")):
+    store = get_schedule_store()
+    if store is None:
+        raise typer.BadParameter("schedule store is disabled (SCHEDULE_STORE_ENABLED=false)")
+    d = Dispatcher(store)
+    try:
+        m = d.run(until_idle=until_idle, duration_s=duration)
+    except KeyboardInterrupt:
+        d.stop()
+        m = d.metrics()
+    print(f"[dispatch] sent={m['sent']} failed={m['failed']} retries={m['retries']} "
+          f"lag p50={m['lag_p50_s']}s p95={m['lag_p95_s']}s max={m['lag_max_s']}s")
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: long-running publisher for the schedule store.
+#
+# Dispatcher(store, workers, lookahead_s, refresh_s, retry)
+#
+# What it does:
+#
+# submit(posts, campaign_id) warms up each new platform's adapter (connection pool) before its first post is due.
+# Plain ScheduledPosts are keyed post_id(post, campaign_id), the same id store_schedule(schedule, campaign_id) gives
+# their rows, so marking them 'sent' / 'failed' updates those rows.
+#
+# Keeps due posts in a min-heap keyed by their UTC time and sleeps on a condition variable until the earliest
+# one is due (or the next store refresh) — no per-post polling. Posts come from the schedule store (status
+# 'scheduled', up to dispatch_lookahead_s ahead, re-read every dispatch_refresh_s) and/or submit(posts).
+#
+# Due posts go to a thread pool; each send takes a token from its platform's TokenBucket, publishes through the
+# platform adapter (pooled HTTP session), retries transient errors (honouring Retry-After) and marks the row
+# 'sent' / 'failed'. Assumes one dispatcher per store.
+#
+# metrics(): sent/failed/retries, queue depth, per-platform counts and lag between scheduled and actual send
+# time: p50/p95 over the last LAG_WINDOW sends (a bounded deque, so a long-running dispatcher stays flat), max
+# over all of them.
+#
+# Usage: PYTHONPATH=src python -m runner.dispatch [--until-idle] [--duration 60]
@@ -1,19 +1,31 @@
-from core.graph import build_graph
-from src.features.export import save_json, save_csv
-from core.schemas import ScheduledPost
+import asyncio
+import itertools
+from contextlib import nullcontext
+from typing import Any, Dict, Iterator, Optional, Tuple
+from core.graph import get_graph, to_schedule, as_model, as_models, invoke_campaign, ainvoke_campaign, campaign_input
+from core.checkpoint import campaign_config, campaign_thread_id
+from core.incremental import replan_thread
+from core.instrumentation import profiled, write_metrics
+from core.schemas import Asset, CampaignBrief, PlanItem, PostDraft, ScheduledPost
+from features.export import save_json, save_csv, save_columnar, ArrowSink, NdjsonSink, CsvSink
+from features.formatting import apply_platform_rules
+from features.schedule import schedule_day, schedule_slots
+from features.schedule_store import get_schedule_store, store_schedule
 
-def run_campaign(prompt: str, export_csv: bool = False):
-    # Build the graph
-    g = build_graph()
+def run_campaign(prompt: str, export_csv: bool = False, thread_id: Optional[str] = None,
+                 columnar: Optional[str] = None):
+    # Compiled once per process
+    g = get_graph()
 
-    # Initial pipeline state
-    state = {"prompt": prompt}
+    # Fresh run, or resume of an interrupted one on the same thread (cProfile'd when PROFILE_DIR is set)
+    with profiled("campaign"):
+        final_state = invoke_campaign(g, prompt, thread_id)
 
-    final_state = g.invoke(state)
+    # Graph output boundary: ScheduledPost models (validated only if the graph ran untrusted)
+    schedule = to_schedule(final_state)
 
-    # Convert dicts back into ScheduledPost models
-    schedule_dicts = final_state["schedule"]
-    schedule = [ScheduledPost.model_validate(s) for s in schedule_dicts]
+    # Replace this campaign's rows in the multi-campaign schedule store
+    store_schedule(schedule, campaign_thread_id(prompt, thread_id))
 
     # Save JSON
     json_path = save_json(schedule)
@@ -24,6 +36,118 @@ def run_campaign(prompt: str, export_csv: bool = False):
         csv_path = save_csv(schedule)
         print(f"✅ CSV saved to: {csv_path}")
 
+    # Parquet / Arrow IPC if requested
+    if columnar:
+        columnar_path = save_columnar(schedule, columnar)
+        print(f"✅ {columnar.title()} saved to: {columnar_path}")
+
+    # Per-node / per-call timings (METRICS_PATH)
+    write_metrics()
+
+    return schedule
+
+async def arun_campaign(prompt: str, export_csv: bool = False, thread_id: Optional[str] = None,
+                        columnar: Optional[str] = None):
+    # Same pipeline on the running event loop; many campaigns can be awaited concurrently
+    g = get_graph()
+    final_state = await ainvoke_campaign(g, prompt, thread_id)
+    schedule = to_schedule(final_state)
+
+    # file writes go to a thread so the loop keeps serving other campaigns
+    await asyncio.to_thread(store_schedule, schedule, campaign_thread_id(prompt, thread_id))
+    json_path = await asyncio.to_thread(save_json, schedule)
+    print(f"✅ JSON saved to: {json_path}")
+    if export_csv:
+        csv_path = await asyncio.to_thread(save_csv, schedule)
+        print(f"✅ CSV saved to: {csv_path}")
+    if columnar:
+        columnar_path = await asyncio.to_thread(save_columnar, schedule, columnar)
+        print(f"✅ {columnar.title()} saved to: {columnar_path}")
+    await asyncio.to_thread(write_metrics)
+
+    return schedule
+
+def replan_campaign(prompt: str, changes: Dict[str, Any], export_csv: bool = False, thread_id: Optional[str] = None,
+                    columnar: Optional[str] = None):
+    # Edit the brief of a finished run; only what the edit invalidates is rebuilt (core/incremental.py)
+    g = get_graph()
+    with profiled("replan"):
+        final_state, report = replan_thread(g, prompt, changes, thread_id)
+    schedule = to_schedule(final_state)
+    # same thread id as the run it edits: its rows are updated and slots the edit dropped are deleted
+    store_schedule(schedule, campaign_thread_id(prompt, thread_id))
+    json_path = save_json(schedule)
+    print(f"✅ JSON saved to: {json_path}")
+    if export_csv:
+        csv_path = save_csv(schedule)
+        print(f"✅ CSV saved to: {csv_path}")
+    if columnar:
+        columnar_path = save_columnar(schedule, columnar)
+        print(f"✅ {columnar.title()} saved to: {columnar_path}")
+    write_metrics()
+    return schedule, report
+
+def stream_campaign(prompt: str, ndjson_name: str = "schedule.ndjson",
+                    csv_name: str = "schedule_stream.csv", thread_id: Optional[str] = None,
+                    columnar: Optional[str] = None) -> Iterator[ScheduledPost]:
+    # Yields (and appends to NDJSON/CSV) each day's posts as soon as that day's image and the graph's copy are in;
+    # with columnar="parquet"/"arrow" they also go to artifacts/schedule_stream.<fmt> in row-group batches
+    g = get_graph()
+    config = campaign_config(prompt, thread_id)
+    campaign_id = config["configurable"]["thread_id"]
+    store = get_schedule_store()
+    inp = campaign_input(g, prompt, config)
+    brief = plan = slots = drafts = schedule = None
+    pending = []
+    if inp is None:
+        # resuming: brief/plan (and maybe copy and assets) were checkpointed before the interruption;
+        # already-finished days are emitted again up front (at-least-once); that includes branches that
+        # finished inside the interrupted fan-out (LangGraph folds their writes into the state and won't rerun them)
+        values = g.get_state(config).values
+        pending = [("updates", {"resume": {k: values[k] for k in ("brief", "plan", "drafts") if values.get(k)}})]
+        pending += [("custom", d) for d in values.get("day_assets") or []]
+    ready: Dict[int, Tuple[Asset, Dict[str, Asset]]] = {}  # days whose image is in, waiting for the copy
+    streamed = []
+    arrow = ArrowSink(f"schedule_stream.{columnar}", columnar) if columnar else nullcontext()
+    with NdjsonSink(ndjson_name) as nd, CsvSink(csv_name) as cs, arrow as ar:
+        for mode, chunk in itertools.chain(pending, g.stream(inp, config, stream_mode=["updates", "custom"])):
+            if mode == "updates":
+                for update in chunk.values():
+                    if not update:
+                        continue
+                    if "brief" in update:
+                        brief = as_model(CampaignBrief, update["brief"])
+                    if "plan" in update:
+                        plan = as_models(PlanItem, update["plan"])
+                        # the schedule node's placement, known from the plan alone
+                        slots = schedule_slots(plan, brief.timezone)
+                    if "drafts" in update:
+                        # draft_copy's output, split per day (drafts are in plan order, one per platform)
+                        it = iter(as_models(PostDraft, update["drafts"]))
+                        drafts = [[next(it) for _ in item.platforms] for item in plan]
+                    if "schedule" in update:
+                        schedule = to_schedule(update)
+            elif mode == "custom" and "asset" in chunk:
+                renditions = {p: as_model(Asset, r) for p, r in (chunk.get("renditions") or {}).items()}
+                ready[chunk["day"]] = (as_model(Asset, chunk["asset"]), renditions)
+            if drafts is None:
+                continue
+            for day in sorted(ready):
+                asset, renditions = ready.pop(day)
+                posts = [apply_platform_rules(d, renditions.get(d.platform, asset)) for d in drafts[day]]
+                posts = schedule_day(brief.name, plan[day], posts, slots[day])
+                if store is not None:
+                    store.upsert(campaign_id, posts)
+                streamed.extend(posts)
+                for sp in posts:
+                    nd.write(sp)
+                    cs.write(sp)
+                    if ar is not None:
+                        ar.write(sp)
+                    yield sp
+    # the full run is in: the schedule node's output replaces the campaign's rows (dropping earlier runs' extras)
+    store_schedule(schedule if schedule is not None else streamed, campaign_id)
+
 if __name__ == "__main__":
     run_campaign(
         prompt="Run a 7-day product launch campaign for a new AI writing tool focused on creators and marketers. Tone inspiring. Start 2025-08-11 in Asia/Karachi.",
@@ -0,0 +1,361 @@
+from __future__ import annotations
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import heapq
+import itertools
+import math
+import re
+import threading
+import time
+import uuid
+import orjson
+import typer
+from core.instrumentation import timed, to_prometheus
+from features.config import get_settings
+
+_JOB_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+class QueueFull(Exception):
+    def __init__(self, retry_after_s: int):
+        super().__init__(f"queue full, retry in {retry_after_s}s")
+        self.retry_after_s = retry_after_s
+
+
+class Job:
+    __slots__ = ("id", "prompt", "priority", "status", "submitted_at", "started_at", "finished_at", "result",
+                 "error")
+
+    def __init__(self, id: str, prompt: str, priority: int):
+        self.id = id
+        self.prompt = prompt
+        self.priority = priority
+        self.status = "queued"  # queued | running | done | failed
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[List[Dict[str, Any]]] = None
+        self.error: Optional[str] = None
+
+    def info(self) -> Dict[str, Any]:
+        out = {"id": self.id, "status": self.status, "priority": self.priority, "submitted_at": self.submitted_at,
+               "started_at": self.started_at, "finished_at": self.finished_at}
+        if self.result is not None:
+            out["posts"] = len(self.result)
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+class JobService:
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 history: Optional[int] = None):
+        s = get_settings()
+        self.workers = workers or s.service_workers
+        self.queue_size = queue_size or s.service_queue_size
+        self.history = history or s.service_job_history
+        self._heap: List[Tuple[int, int, Job]] = []
+        self._seq = itertools.count()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()  # insertion order = eviction order for finished jobs
+        self._cv = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+        self._graph = None
+        # metrics
+        self.started_at = time.time()
+        self.busy = 0
+        self.busy_s = 0.0
+        self.accepted = 0
+        self.rejected = 0
+        self.done = 0
+        self.failed = 0
+        self._recent_s: List[float] = []  # last job durations, for Retry-After
+
+    def start(self) -> "JobService":
+        from core.graph import get_graph
+        self._graph = get_graph()  # compiled once, shared by every worker thread
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        with self._cv:
+            self._stopped = True
+            self._cv.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def submit(self, prompt: str, priority: int = 0, job_id: Optional[str] = None) -> Tuple[Job, bool]:
+        """Queues a campaign (higher priority first, FIFO within one); (job, created). Raises QueueFull when full.
+
+        Resubmitting a known id returns that job, unless it failed: then it is queued again and resumes.
+        """
+        with self._cv:
+            old = self._jobs.get(job_id) if job_id else None
+            if old is not None and old.status != "failed":
+                return old, False  # idempotent resubmit
+            if len(self._heap) >= self.queue_size:
+                self.rejected += 1
+                raise QueueFull(self._retry_after())
+            if old is not None:
+                # a failed job runs again on its checkpoint thread, resuming after its last finished node; the
+                # original prompt is kept, since that's what the thread holds
+                job = Job(old.id, old.prompt, priority)
+                del self._jobs[old.id]
+            else:
+                job = Job(job_id or uuid.uuid4().hex[:12], prompt, priority)
+            heapq.heappush(self._heap, (-priority, next(self._seq), job))
+            self._jobs[job.id] = job
+            self.accepted += 1
+            self._evict()
+            self._cv.notify()
+            return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cv:
+            return self._jobs.get(job_id)
+
+    def position(self, job: Job) -> Optional[int]:
+        # 0-based place in the run order, None once it left the queue
+        with self._cv:
+            if job.status != "queued":
+                return None
+            key = (-job.priority, next(k for p, k, j in self._heap if j is job))
+            return sum(1 for p, k, _ in self._heap if (p, k) < key)
+
+    def _retry_after(self) -> int:
+        # time for the workers to drain the current queue at the recent per-job latency
+        per_job = sum(self._recent_s) / len(self._recent_s) if self._recent_s else 1.0
+        return max(1, math.ceil(len(self._heap) * per_job / self.workers))
+
+    def _evict(self) -> None:
+        # bounded history: drop the oldest finished jobs; queued/running ones always stay
+        extra = len(self._jobs) - self.history - len(self._heap) - self.busy
+        if extra <= 0:
+            return
+        for jid in [jid for jid, j in self._jobs.items() if j.status in ("done", "failed")][:extra]:
+            del self._jobs[jid]
+
+    def _work(self) -> None:
+        from core.graph import discard_thread, invoke_campaign, to_schedule
+        from features.schedule_store import store_schedule
+        while True:
+            with self._cv:
+                while not self._heap and not self._stopped:
+                    self._cv.wait()
+                if self._stopped:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                job.status = "running"
+                job.started_at = time.time()
+                self.busy += 1
+            try:
+                with timed("job", "campaign", items=None) as span:
+                    # one checkpoint thread per job: identical prompts in flight must not share one
+                    thread_id = f"job-{job.id}"
+                    schedule = to_schedule(invoke_campaign(self._graph, job.prompt, thread_id=thread_id))
+                    store_schedule(schedule, thread_id)
+                    span.items = len(schedule)
+                # kept only while a resubmit of the id could resume it: a failed job's thread stays
+                discard_thread(self._graph, thread_id)
+                job.result = [sp.model_dump(mode="json") for sp in schedule]
+                job.status = "done"
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = "failed"
+            finally:
+                with self._cv:
+                    job.finished_at = time.time()
+                    took = job.finished_at - job.started_at
+                    self.busy -= 1
+                    self.busy_s += took
+                    self._recent_s = (self._recent_s + [took])[-50:]
+                    if job.status == "done":
+                        self.done += 1
+                    else:
+                        self.failed += 1
+                    self._evict()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cv:
+            uptime = max(1e-9, time.time() - self.started_at)
+            running = sum(time.time() - j.started_at for j in self._jobs.values() if j.status == "running")
+            return {
+                "queue_depth": len(self._heap),
+                "queue_capacity": self.queue_size,
+                "workers": self.workers,
+                "workers_busy": self.busy,
+                "worker_utilization": round(min(1.0, (self.busy_s + running) / (uptime * self.workers)), 4),
+                "jobs_accepted": self.accepted,
+                "jobs_rejected": self.rejected,
+                "jobs_done": self.done,
+                "jobs_failed": self.failed,
+            }
+
+    def prometheus(self) -> str:
+        m = self.metrics()
+        lines = []
+        for name, mtype, help_ in (
+            ("queue_depth", "gauge", "Jobs waiting for a worker."),
+            ("queue_capacity", "gauge", "Queue bound; submissions past it get 429."),
+            ("workers", "gauge", "Worker threads."),
+            ("workers_busy", "gauge", "Workers running a campaign right now."),
+            ("worker_utilization", "gauge", "Busy worker-seconds / available worker-seconds since start."),
+            ("jobs_accepted", "counter", "Jobs queued."),
+            ("jobs_rejected", "counter", "Submissions refused with 429."),
+            ("jobs_done", "counter", "Jobs finished."),
+            ("jobs_failed", "counter", "Jobs that raised."),
+        ):
+            metric = f"campaign_service_{name}" + ("_total" if mtype == "counter" else "")
+            lines += [f"# HELP {metric} {help_}", f"# TYPE {metric} {mtype}", f"{metric} {m[name]}"]
+        # per-node / per-provider timings plus the per-job histogram (kind="job")
+        return "\n".join(lines) + "\n" + to_prometheus()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "ServiceServer"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None,
+              content_type: str = "application/json") -> None:
+        body = payload.encode("utf-8") if isinstance(payload, str) else orjson.dumps(payload)
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, {"error": message}, headers)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            return self._error(404, f"no route for POST {self.path}")
+        try:
+            req = orjson.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            prompt = req["prompt"]
+            priority = int(req.get("priority", 0))
+            job_id = req.get("id")
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            return self._error(400, "expected JSON {'prompt': str, 'priority'?: int, 'id'?: str}")
+        if not isinstance(prompt, str) or not prompt.strip():
+            return self._error(400, "'prompt' must be a non-empty string")
+        if job_id is not None and not (isinstance(job_id, str) and _JOB_ID.match(job_id)):
+            return self._error(400, "'id' must match [A-Za-z0-9_.-]{1,64}")
+        svc = self.server.service
+        try:
+            job, created = svc.submit(prompt, priority, job_id)
+        except QueueFull as e:
+            return self._error(429, str(e), {"Retry-After": str(e.retry_after_s)})
+        self._send(202 if created else 200, {**job.info(), "position": svc.position(job)},
+                   {"Location": f"/jobs/{job.id}"})
+
+    def do_GET(self):
+        svc = self.server.service
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/healthz":
+            return self._send(200, {"ok": True})
+        if path == "/metrics":
+            return self._send(200, svc.prometheus(), content_type="text/plain; version=0.0.4")
+        parts = path.strip("/").split("/")
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = svc.get(parts[1])
+            if job is None:
+                return self._error(404, f"unknown job {parts[1]}")
+            if len(parts) == 2:
+                return self._send(200, {**job.info(), "position": svc.position(job)})
+            if parts[2] == "result":
+                if job.status == "done":
+                    return self._send(200, job.result)
+                if job.status == "failed":
+                    return self._error(500, job.error or "failed")
+                return self._error(409, f"job is {job.status}", {"Retry-After": "1"})
+        self._error(404, f"no route for GET {self.path}")
+
+
+class ServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, service: JobService, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.service = service
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+
+@contextmanager
+def running_service(service: Optional[JobService] = None, host: str = "127.0.0.1",
+                    port: int = 0) -> Iterator[ServiceServer]:
+    svc = (service or JobService()).start()
+    srv = ServiceServer(svc, host, port)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        svc.stop()
+
+
+def main(host: Optional[str] = typer.Option(None, help="bind address (default: SERVICE_HOST)"),
+         port: Optional[int] = typer.Option(None, help="port (default: SERVICE_PORT)"),
+         workers: Optional[int] = typer.Option(None, help="campaigns run at once (default: SERVICE_WORKERS)"),
+         queue_size: Optional[int] = typer.Option(None, help="queued jobs before 429 (default: SERVICE_QUEUE_SIZE)")):
+    s = get_settings()
+    svc = JobService(workers, queue_size)
+    with running_service(svc, host or s.service_host, s.service_port if port is None else port) as srv:
+        print(f"[service] campaign jobs on {srv.base_url} ({svc.workers} workers, queue {svc.queue_size}; "
+              f"Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    typer.run(main)
+
+# Purpose: run the agent behind an internal HTTP API that gets bursts of requests.
+#
+# JobService(workers, queue_size, history)
+#
+# What it does:
+#
+# submit() puts a campaign prompt on a bounded priority queue (a heap: higher priority first, FIFO within a
+# priority). When the queue holds service_queue_size jobs it raises QueueFull with a Retry-After estimate (queued
+# jobs × recent per-job latency / workers) instead of growing. A client-supplied id makes resubmits idempotent,
+# except for a failed job: resubmitting its id queues it again on the same thread, which resumes the run.
+#
+# A fixed set of worker threads (service_workers) share one compiled graph (get_graph()); each job runs on its
+# own checkpoint thread ("job-<id>"), deleted once the job is done (a failed job's thread stays, so resubmitting
+# its id resumes it), replaces its rows in the schedule store and keeps its posts in memory. Only the last
+# service_job_history finished jobs are kept; queued and running jobs are never evicted.
+#
+# metrics(): queue depth/capacity, busy workers, utilization (busy worker-seconds / available since start),
+# accepted/rejected/done/failed counts. prometheus() adds them to core.instrumentation's export, where each job
+# is also timed as kind="job" (wall-time histogram, posts as items).
+#
+# HTTP (ServiceServer, stdlib ThreadingHTTPServer, JSON bodies):
+#
+#   POST /jobs {"prompt", "priority"?, "id"?}  202 + Location (200 if the id exists and hasn't failed); 429 +
+#                                               Retry-After when full
+#   GET  /jobs/<id>                             status, timestamps, queue position, post count or error
+#   GET  /jobs/<id>/result                      the ScheduledPost list; 409 while queued/running, 500 if it failed
+#   GET  /metrics                               Prometheus text
+#   GET  /healthz
+#
+# Usage: PYTHONPATH=src:. python -m runner.service --port 8080 --workers 2